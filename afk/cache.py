@@ -0,0 +1,207 @@
+"""
+MIT License
+
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Final, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from redbot.core import Config
+
+log: logging.Logger = logging.getLogger("red.seina.afk.cache")
+
+CLEANUP_INTERVAL: Final[float] = 5.0
+
+
+class AFKState(NamedTuple):
+    message: str
+    time: int
+    custom_message: str
+    blocked: FrozenSet[int]
+
+    @classmethod
+    def from_config(cls, data: Dict) -> "AFKState":
+        return cls(
+            message=data["afk_message"],
+            time=data["afk_time"],
+            custom_message=data["custom_message"],
+            blocked=frozenset(data["blocked"]),
+        )
+
+
+class AFKRegistry:
+    """
+    In-memory mirror of the AFK members and per guild settings that `on_message` needs.
+
+    Only members that are currently AFK are tracked, so a message whose author and mentions
+    are all absent from the registry can be dismissed without touching config.
+    """
+
+    __slots__ = ("_members", "_ignored", "delete_after", "lookups", "hits", "misses")
+
+    def __init__(self) -> None:
+        self._members: Dict[int, Dict[int, AFKState]] = {}
+        self._ignored: Dict[int, FrozenSet[int]] = {}
+        self.delete_after: Optional[int] = None
+        self.lookups: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self._members.values())
+
+    async def load(self, config: Config, all_members: Dict[int, Dict[int, Dict]]) -> None:
+        self._members.clear()
+        self._ignored.clear()
+        for guild_id, members in all_members.items():
+            for member_id, data in members.items():
+                if data["afk_status"]:
+                    self.set(guild_id, member_id, AFKState.from_config(data))
+        for guild_id, data in (await config.all_guilds()).items():
+            self.set_ignored(guild_id, data["ignored_channels"])
+        self.delete_after = await config.delete_after()
+
+    def get(self, guild_id: int, member_id: int) -> Optional[AFKState]:
+        self.lookups += 1
+        state: Optional[AFKState] = self._members.get(guild_id, {}).get(member_id)
+        if state is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return state
+
+    def set(self, guild_id: int, member_id: int, state: AFKState) -> None:
+        self._members.setdefault(guild_id, {})[member_id] = state
+
+    def update(self, guild_id: int, member_id: int, **fields) -> None:
+        members: Dict[int, AFKState] = self._members.get(guild_id, {})
+        if (state := members.get(member_id)) is not None:
+            members[member_id] = state._replace(**fields)
+
+    def discard(self, guild_id: int, member_id: int) -> None:
+        members: Optional[Dict[int, AFKState]] = self._members.get(guild_id)
+        if members is None:
+            return
+        members.pop(member_id, None)
+        if not members:
+            del self._members[guild_id]
+
+    def members(self, guild_id: int) -> Iterator[Tuple[int, AFKState]]:
+        return iter(list(self._members.get(guild_id, {}).items()))
+
+    def has_members(self, guild_id: int) -> bool:
+        return guild_id in self._members
+
+    def is_ignored(self, guild_id: int, channel_id: int) -> bool:
+        return channel_id in self._ignored.get(guild_id, ())
+
+    def set_ignored(self, guild_id: int, channels: List[int]) -> None:
+        if channels:
+            self._ignored[guild_id] = frozenset(channels)
+        else:
+            self._ignored.pop(guild_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "members": len(self),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class MemberCleanup:
+    """
+    Clears the stored data of members that left, in batches.
+
+    Keeps an index of the members that have a config record so leave events for everyone
+    else are ignored, and coalesces the rest into one config write per guild every
+    `CLEANUP_INTERVAL` seconds.
+    """
+
+    __slots__ = ("config", "_stored", "_pending", "_task", "queued", "cleared", "flushes")
+
+    def __init__(self, config: Config) -> None:
+        self.config: Config = config
+        self._stored: Dict[int, Set[int]] = {}
+        self._pending: Dict[int, Set[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.queued: int = 0
+        self.cleared: int = 0
+        self.flushes: int = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(len(members) for members in self._pending.values())
+
+    def load(self, all_members: Dict[int, Dict[int, Dict]]) -> None:
+        self._stored = {
+            guild_id: set(members) for guild_id, members in all_members.items() if members
+        }
+
+    def track(self, guild_id: int, member_id: int) -> None:
+        self._stored.setdefault(guild_id, set()).add(member_id)
+        if (pending := self._pending.get(guild_id)) is not None:
+            pending.discard(member_id)
+
+    def untrack(self, guild_id: int, member_id: int) -> None:
+        if (stored := self._stored.get(guild_id)) is not None:
+            stored.discard(member_id)
+
+    def remove(self, guild_id: int, member_id: int) -> bool:
+        stored: Optional[Set[int]] = self._stored.get(guild_id)
+        if stored is None or member_id not in stored:
+            return False
+        stored.discard(member_id)
+        self._pending.setdefault(guild_id, set()).add(member_id)
+        self.queued += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._delayed_flush())
+        return True
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        await self.flush()
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for guild_id, member_ids in pending.items():
+            if not member_ids:
+                continue
+            group = self.config._get_base_group(Config.MEMBER, str(guild_id))
+            try:
+                async with group() as members:
+                    for member_id in member_ids:
+                        members.pop(str(member_id), None)
+            except Exception:
+                log.exception("Failed to clear %s members of guild %s.", len(member_ids), guild_id)
+                self._pending.setdefault(guild_id, set()).update(member_ids)
+                continue
+            self.cleared += len(member_ids)
+        self.flushes += 1
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        await self.flush()
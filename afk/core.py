@@ -24,7 +24,7 @@ SOFTWARE.
 
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Final, List, Literal, Optional, Union
+from typing import Dict, Final, List, Literal, Optional, Tuple, Union
 
 import discord
 import TagScriptEngine as tse
@@ -40,6 +40,7 @@ from ._tagscript import (
     _process_tagscript,
     custom_message,
 )
+from .cache import AFKRegistry, AFKState, MemberCleanup
 from .views import AFKPaginator, AFKView
 
 log: logging.Logger = logging.getLogger("red.seina.afk")
@@ -75,6 +76,17 @@ class AFK(commands.Cog):
         self.config.register_guild(**default_guild)
         self.config.register_global(**default_global)
 
+        self.registry: AFKRegistry = AFKRegistry()
+        self.cleanup: MemberCleanup = MemberCleanup(self.config)
+
+    async def cog_load(self) -> None:
+        all_members: Dict[int, Dict[int, Dict]] = await self.config.all_members()
+        await self.registry.load(self.config, all_members)
+        self.cleanup.load(all_members)
+
+    async def cog_unload(self) -> None:
+        await self.cleanup.stop()
+
     def format_help_for_context(self, ctx: commands.Context) -> str:
         pre_processed = super().format_help_for_context(ctx)
         n = "\n" if "\n\n" not in pre_processed else ""
@@ -119,9 +131,10 @@ class AFK(commands.Cog):
         ctx = await self.bot.get_context(interaction.message)
         await AFKPaginator(ctx, embeds, interaction, 60, use_select=True).start()
 
-    async def _pinged_user(self, message: discord.Message, member: discord.Member) -> None:
-        data = await self.config.member(member).all()  # type: ignore
-        if message.author.id in data["blocked"]:
+    async def _pinged_user(
+        self, message: discord.Message, member: discord.Member, state: AFKState
+    ) -> None:
+        if message.author.id in state.blocked:
             return
         async with self.config.member(member).pings() as pings:
             pings.append(self._make_message(message))
@@ -155,10 +168,17 @@ class AFK(commands.Cog):
             return
         if not message.guild:
             return
-        if (
-            message.author.bot
-            or message.channel.id in await self.config.guild(message.guild).ignored_channels()
-        ):
+        if message.author.bot or self.registry.is_ignored(message.guild.id, message.channel.id):
+            return
+        if not self.registry.has_members(message.guild.id):
+            return
+        author_state: Optional[AFKState] = self.registry.get(message.guild.id, message.author.id)
+        mentioned: List[Tuple[discord.Member, AFKState]] = []
+        for member in message.mentions:
+            state: Optional[AFKState] = self.registry.get(message.guild.id, member.id)
+            if state is not None:
+                mentioned.append((member, state))  # type: ignore
+        if author_state is None and not mentioned:
             return
         if not message.channel.permissions_for(message.guild.me).send_messages:
             return
@@ -169,13 +189,12 @@ class AFK(commands.Cog):
         if not await self.bot.allowed_by_whitelist_blacklist(message.author):
             return
 
-        member_config = self.config.member(message.author)  # type: ignore
-        afk_status = await member_config.afk_status()
-        if afk_status:
-            afk_time = await member_config.afk_time()
-            data = await self.config.member(message.author)()  # type: ignore
-            time_difference = datetime.now().timestamp() - afk_time
+        if author_state is not None:
+            time_difference = datetime.now().timestamp() - author_state.time
             if time_difference > 10:
+                member_config = self.config.member(message.author)  # type: ignore
+                data = await member_config()
+                self.registry.discard(message.guild.id, message.author.id)
                 await self._update_nickname(message.author)  # type: ignore
                 await member_config.afk_status.clear()
                 await member_config.afk_message.clear()
@@ -194,49 +213,43 @@ class AFK(commands.Cog):
                 )
                 return
 
-        for member in message.mentions:
-            afk_status = await self.config.member(member).afk_status()  # type: ignore
-            if afk_status:
-                if message.channel.permissions_for(member).view_channel is False:  # type: ignore
-                    return
-                afk_delete_after = await self.config.delete_after()
-                afk_time = await self.config.member(member).afk_time()  # type: ignore
-                afk_message = await self.config.member(member).afk_message()  # type: ignore
-                afk_custom_message = await self.config.member(member).custom_message()  # type: ignore
-                time = f"<t:{afk_time}:R>"
-                await self._pinged_user(message, member)  # type: ignore
+        for member, state in mentioned:
+            if message.channel.permissions_for(member).view_channel is False:  # type: ignore
+                return
+            time = f"<t:{state.time}:R>"
+            await self._pinged_user(message, member, state)
+            kwargs = _process_tagscript(
+                state.custom_message,
+                {
+                    "server": tse.GuildAdapter(member.guild),  # type: ignore
+                    "author": tse.MemberAdapter(member),  # type: ignore
+                    "time": tse.StringAdapter(time),
+                    "reason": tse.StringAdapter(state.message),
+                    "color": tse.StringAdapter(str(member.color)),
+                },
+            )
+            if not kwargs:
+                await self.config.member(member).custom_message.clear()  # type: ignore
+                self.registry.update(member.guild.id, member.id, custom_message=custom_message)
                 kwargs = _process_tagscript(
-                    afk_custom_message,
+                    custom_message,
                     {
                         "server": tse.GuildAdapter(member.guild),  # type: ignore
                         "author": tse.MemberAdapter(member),  # type: ignore
                         "time": tse.StringAdapter(time),
-                        "reason": tse.StringAdapter(afk_message),
+                        "reason": tse.StringAdapter(state.message),
                         "color": tse.StringAdapter(str(member.color)),
                     },
                 )
-                if not kwargs:
-                    await self.config.member(member).custom_message.clear()  # type: ignore
-                    kwargs = _process_tagscript(
-                        custom_message,
-                        {
-                            "server": tse.GuildAdapter(member.guild),  # type: ignore
-                            "author": tse.MemberAdapter(member),  # type: ignore
-                            "time": tse.StringAdapter(time),
-                            "reason": tse.StringAdapter(afk_message),
-                            "color": tse.StringAdapter(str(member.color)),
-                        },
-                    )
-                kwargs["allowed_mentions"] = discord.AllowedMentions.none()
-                kwargs["delete_after"] = afk_delete_after
-                kwargs["reference"] = message.to_reference(fail_if_not_exists=False)
-                await message.channel.send(**kwargs)
+            kwargs["allowed_mentions"] = discord.AllowedMentions.none()
+            kwargs["delete_after"] = self.registry.delete_after
+            kwargs["reference"] = message.to_reference(fail_if_not_exists=False)
+            await message.channel.send(**kwargs)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
-        data = await self.config.all_members(guild=member.guild)
-        if member.id in data:
-            await self.config.member_from_ids(member.guild.id, member.id).clear()
+        self.registry.discard(member.guild.id, member.id)
+        self.cleanup.remove(member.guild.id, member.id)
 
     @commands.guild_only()
     @commands.group(name="afk", invoke_without_command=True)
@@ -254,6 +267,9 @@ class AFK(commands.Cog):
                     message = "AFK"
                 await self._update_nickname(ctx.author, force=True)  # type: ignore
                 await member_config.afk_message.set(message)
+                state: AFKState = AFKState.from_config(await member_config.all())
+                self.registry.set(ctx.guild.id, ctx.author.id, state)  # type: ignore
+                self.cleanup.track(ctx.guild.id, ctx.author.id)  # type: ignore
                 await ctx.send(
                     embed=discord.Embed(
                         title="You're now AFK!",
@@ -276,6 +292,7 @@ class AFK(commands.Cog):
         [Admin/Mod] Reset member's custom afk message.
         """
         await self.config.member(member).custom_message.clear()
+        self.registry.update(ctx.guild.id, member.id, custom_message=custom_message)  # type: ignore
         await ctx.tick()
 
     @_afk.command(name="custom")
@@ -313,6 +330,8 @@ class AFK(commands.Cog):
         """
         if message:
             await self.config.member(ctx.author).custom_message.set(message)  # type: ignore
+            self.registry.update(ctx.guild.id, ctx.author.id, custom_message=message)  # type: ignore
+            self.cleanup.track(ctx.guild.id, ctx.author.id)  # type: ignore
             await ctx.send(
                 "Sucessfully changed your afk message!",
                 reference=ctx.message.to_reference(fail_if_not_exists=False),
@@ -320,6 +339,9 @@ class AFK(commands.Cog):
             )
         else:
             await self.config.member(ctx.author).custom_message.clear()  # type: ignore
+            self.registry.update(
+                ctx.guild.id, ctx.author.id, custom_message=custom_message  # type: ignore
+            )
             await ctx.send(
                 "Reset your custom afk message.",
                 reference=ctx.message.to_reference(fail_if_not_exists=False),
@@ -401,6 +423,8 @@ class AFK(commands.Cog):
                 else:
                     await ctx.send("Invalid option. (`add` or `remove`)")
                     return
+            self.registry.update(ctx.guild.id, ctx.author.id, blocked=frozenset(blocked))  # type: ignore
+        self.cleanup.track(ctx.guild.id, ctx.author.id)  # type: ignore
 
         ids = len(list(users))
         await ctx.send(
@@ -419,6 +443,8 @@ class AFK(commands.Cog):
         afk_status = await self.config.member(member).afk_status()
         if afk_status:
             await self.config.member(member).clear()
+            self.registry.discard(ctx.guild.id, member.id)  # type: ignore
+            self.cleanup.untrack(ctx.guild.id, member.id)  # type: ignore
         else:
             await ctx.send(
                 f"{member.name} is not AFK!",
@@ -457,6 +483,7 @@ class AFK(commands.Cog):
                 elif add_or_remove.lower() == "remove":
                     if channel.id in c:
                         c.remove(channel.id)
+            self.registry.set_ignored(ctx.guild.id, c)  # type: ignore
 
         ids = len(list(channels))
 
@@ -473,13 +500,10 @@ class AFK(commands.Cog):
         """
         if ctx.invoked_subcommand is None:
             afk_members = []
-            for member in ctx.guild.members:  # type: ignore
-                member_config = self.config.member(member)
-                afk_status = await member_config.afk_status()
-                if afk_status:
-                    afk_time = await member_config.afk_time()
-                    afk_message = await member_config.afk_message()
-                    afk_members.append((member, afk_time, afk_message))
+            for member_id, state in self.registry.members(ctx.guild.id):  # type: ignore
+                member = ctx.guild.get_member(member_id)  # type: ignore
+                if member is not None:
+                    afk_members.append((member, state.time, state.message))
 
             if not afk_members:
                 await ctx.send("There are no AFK users in this server.")
@@ -566,9 +590,11 @@ class AFK(commands.Cog):
         """
         if amount == 0:
             await self.config.delete_after.set(None)
+            self.registry.delete_after = None
             await ctx.send(f"Disabled `delete_after`.")
             return
         await self.config.delete_after.set(amount)
+        self.registry.delete_after = amount
         await ctx.send(
             f"Changed `delete_after` to {amount}.",
             reference=ctx.message.to_reference(fail_if_not_exists=False),
@@ -594,10 +620,16 @@ class AFK(commands.Cog):
             ignored_channels = "None"
         else:
             ignored_channels = humanize_list(ignored_channels)
+        stats: Dict[str, int] = self.registry.stats()
         msg = (
             f"**Nickname:** {nickname}\n"
             f"**Toggle Nickname:** {toggle_nickname}\n"
-            f"**Ignored Channels:** {ignored_channels}"
+            f"**Ignored Channels:** {ignored_channels}\n"
+            f"**Cached AFK Members:** {stats['members']}\n"
+            f"**Registry Lookups:** {stats['lookups']} "
+            f"({stats['hits']} hits, {stats['misses']} misses)\n"
+            f"**Pending Cleanups:** {self.cleanup.pending} "
+            f"({self.cleanup.cleared} cleared in {self.cleanup.flushes} batches)"
         )
         embed: discord.Embed = discord.Embed(
             title="AFK Settings",
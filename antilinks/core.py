@@ -25,11 +25,14 @@ SOFTWARE.
 
 import re
 from typing import (
+    Any,
     Dict,
     Final,
+    FrozenSet,
     List,
     Literal,
     Match,
+    NamedTuple,
     Optional,
     Pattern,
     Union,
@@ -49,6 +52,76 @@ RequestType = Literal["discord_deleted_user", "owner", "user", "user_strict"]
 LINKS: Pattern[str] = re.compile(
     r"(\|\|)?(([\w]+:)?\/\/)?(([\d\w]|%[a-fA-f\d]{2,2})+(:([\d\w]|%[a-fA-f\d]{2,2})+)?@)?([\d\w]?[-\d\w]{0,253}[\d\w]\.)+[\w]{2,63}(:[\d]+)?(\/([-+_~.\d\w]|%[a-fA-f\d]{2,2})*)*(\?(&?([-+_~.\d\w]|%[a-fA-f\d]{2,2})=?)*)?(#([-+_~.\d\w]|%[a-fA-f\d]{2,2})*)?(\|\|)?"  # type: ignore
 )
+TOKEN: Pattern[str] = re.compile(r"\S*\.\S*")
+
+
+def _host(link: str) -> str:
+    link = link.strip("|")
+    if "//" in link:
+        link = link.split("//", 1)[1]
+    link = link.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0]
+    return link.rsplit("@", 1)[-1].split(":", 1)[0].lower()
+
+
+class DomainTrie:
+    """
+    Domain rules stored by reversed labels, so `cdn.example.com` is looked up as
+    `com -> example -> cdn` and a rule for `example.com` covers every subdomain.
+    The most specific rule wins.
+    """
+
+    __slots__ = ("verdict", "children")
+
+    def __init__(self) -> None:
+        self.verdict: Optional[bool] = None
+        self.children: Dict[str, "DomainTrie"] = {}
+
+    def __bool__(self) -> bool:
+        return self.verdict is not None or bool(self.children)
+
+    @staticmethod
+    def labels(domain: str) -> List[str]:
+        return [label for label in reversed(domain.strip(".").lower().split(".")) if label]
+
+    def add(self, domain: str, verdict: bool) -> None:
+        node: DomainTrie = self
+        for label in self.labels(domain):
+            node = node.children.setdefault(label, DomainTrie())
+        node.verdict = verdict
+
+    def lookup(self, host: str) -> Optional[bool]:
+        node: Optional[DomainTrie] = self
+        verdict: Optional[bool] = self.verdict
+        for label in self.labels(host):
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.verdict is not None:
+                verdict = node.verdict
+        return verdict
+
+
+class GuildSettings(NamedTuple):
+    report_channel: Optional[int]
+    roles: FrozenSet[int]
+    users: FrozenSet[int]
+    watching: FrozenSet[int]
+    domains: DomainTrie
+
+    @classmethod
+    def from_config(cls, data: Dict[str, Any]) -> "GuildSettings":
+        domains: DomainTrie = DomainTrie()
+        for domain in data["allowed_domains"]:
+            domains.add(domain, True)
+        for domain in data["denied_domains"]:
+            domains.add(domain, False)
+        return cls(
+            report_channel=data["report_channel"],
+            roles=frozenset(data["role"]),
+            users=frozenset(data["user"]),
+            watching=frozenset(data["watching"]),
+            domains=domains,
+        )
 
 
 class AntiLinks(commands.Cog):
@@ -68,9 +141,13 @@ class AntiLinks(commands.Cog):
             "role": [],
             "user": [],
             "watching": [],
+            "allowed_domains": [],
+            "denied_domains": [],
         }
         self.config.register_guild(**default_guild)
 
+        self.settings: Dict[int, GuildSettings] = {}
+
     def format_help_for_context(self, ctx: commands.Context) -> str:
         pre_processed = super().format_help_for_context(ctx)
         n = "\n" if "\n\n" not in pre_processed else ""
@@ -81,6 +158,19 @@ class AntiLinks(commands.Cog):
         ]
         return "\n".join(text)
 
+    async def cog_load(self) -> None:
+        for guild_id, data in (await self.config.all_guilds()).items():
+            settings: GuildSettings = GuildSettings.from_config(data)
+            if settings.watching:
+                self.settings[guild_id] = settings
+
+    async def refresh_settings(self, guild: discord.Guild) -> None:
+        settings: GuildSettings = GuildSettings.from_config(await self.config.guild(guild).all())
+        if settings.watching:
+            self.settings[guild.id] = settings
+        else:
+            self.settings.pop(guild.id, None)
+
     @commands.guild_only()
     @commands.mod_or_permissions(administrator=True)
     @commands.bot_has_permissions(manage_messages=True)
@@ -106,9 +196,11 @@ class AntiLinks(commands.Cog):
         """
         if not channel:
             await self.config.guild(ctx.guild).report_channel.clear()
+            await self.refresh_settings(ctx.guild)
             await ctx.send("Message transfer channel turned off.")
             return
         await self.config.guild(ctx.guild).report_channel.set(channel.id)
+        await self.refresh_settings(ctx.guild)
         await ctx.send(f"Message transfer channel set to: {channel.mention}.")
 
     @_anti.group(name="whitelist")
@@ -140,6 +232,7 @@ class AntiLinks(commands.Cog):
                     elif add_or_remove.lower() == "remove":
                         if role.id in role_list:
                             role_list.remove(role.id)
+            await self.refresh_settings(ctx.guild)
 
             ids = len(list(roles))
             await ctx.send(
@@ -199,6 +292,7 @@ class AntiLinks(commands.Cog):
                     elif add_or_remove.lower() == "remove":
                         if member.id in user_list:
                             user_list.remove(member.id)
+            await self.refresh_settings(ctx.guild)
 
             ids = len(list(members))
             await ctx.send(
@@ -259,6 +353,7 @@ class AntiLinks(commands.Cog):
                     elif add_or_remove.lower() == "remove":
                         if channel.id in watching:
                             watching.remove(channel.id)
+            await self.refresh_settings(ctx.guild)
 
             ids = len(list(channels))
             await ctx.send(
@@ -267,6 +362,71 @@ class AntiLinks(commands.Cog):
                 "the channel watch list."
             )
 
+    @_anti.group(name="domain", aliases=["domains"], invoke_without_command=True)
+    async def _domain(
+        self,
+        ctx: commands.Context,
+        allow_or_deny: Literal["allow", "deny"],
+        add_or_remove: Literal["add", "remove"],
+        *domains: str,
+    ) -> None:
+        """
+        Add/remove/list allowed or denied domains.
+
+        - Links to allowed domains and their subdomains are not removed.
+        - Denied domains override a less specific allowed domain, e.g. allow `example.com` but deny `cdn.example.com`.
+        """
+        if ctx.invoked_subcommand is None:
+            if not domains:
+                await ctx.send("`Domains` is a required argument.")
+                return
+
+            key = "allowed_domains" if allow_or_deny.lower() == "allow" else "denied_domains"
+            async with self.config.guild(ctx.guild).get_attr(key)() as domain_list:
+                for domain in domains:
+                    domain = ".".join(DomainTrie.labels(_host(domain))[::-1])
+                    if not domain:
+                        continue
+                    if add_or_remove.lower() == "add":
+                        if domain not in domain_list:
+                            domain_list.append(domain)
+                    elif add_or_remove.lower() == "remove":
+                        if domain in domain_list:
+                            domain_list.remove(domain)
+            await self.refresh_settings(ctx.guild)
+
+            ids = len(domains)
+            await ctx.send(
+                f"Successfully {'added' if add_or_remove.lower() == 'add' else 'removed'} "
+                f"{ids} {'domain' if ids == 1 else 'domains'} {'to' if add_or_remove.lower() == 'add' else 'from'} "
+                f"the {allow_or_deny.lower()} list."
+            )
+
+    @commands.bot_has_permissions(embed_links=True)
+    @_domain.command(name="list")
+    async def _domain_list(self, ctx: commands.Context) -> None:
+        """
+        List the allowed and denied domains.
+        """
+        data = await self.config.guild(ctx.guild).all()
+        if not data["allowed_domains"] and not data["denied_domains"]:
+            await ctx.send("There are no domain rules in this server.")
+            return
+
+        entries = [f"+ {domain}" for domain in sorted(data["allowed_domains"])] + [
+            f"- {domain}" for domain in sorted(data["denied_domains"])
+        ]
+        pages = []
+        for index in range(0, len(entries), 20):
+            embed: discord.Embed = discord.Embed(
+                title="AntiLinks Domain Rules",
+                description=box("\n".join(entries[index : index + 20]), lang="diff"),
+                color=await ctx.embed_color(),
+            )
+            pages.append(embed)
+
+        await SimpleMenu(pages).start(ctx)
+
     @commands.bot_has_permissions(embed_links=True)
     @_watch.command(name="list")
     async def _watch_list(self, ctx: commands.Context) -> None:
@@ -312,47 +472,53 @@ class AntiLinks(commands.Cog):
         if message.author.bot:
             return
 
-        data = await self.config.guild(message.guild).all()
+        settings: Optional[GuildSettings] = self.settings.get(message.guild.id)
+        if settings is None:
+            return
 
-        watch_channel_list = data["watching"]
-        if not watch_channel_list:
+        if message.channel.id not in settings.watching:
             return
 
-        if message.channel.id not in watch_channel_list:
+        if message.author.id in settings.users:
             return
 
-        if message.author.id in data["user"]:
+        allowed_roles: bool = not settings.roles.isdisjoint(getattr(message.author, "_roles", ()))
+
+        if allowed_roles:
             return
 
-        allowed_roles = []
-
-        for role in data["role"]:
-            whitelist_role = discord.utils.get(message.author.roles, id=role)
-            if whitelist_role:
-                allowed_roles.append(whitelist_role)
-
-        message_channel = self.bot.get_channel(data["report_channel"])
-
-        if not allowed_roles:
-            try:
-                sentence = message.content.split()
-                for word in sentence:
-                    if self._match_url(word):
-                        msg = "**Message Removed in** {} ({})\n".format(
-                            message.channel.mention,
-                            message.channel.id,
-                        )
-                        msg += "**Message sent by**: {} ({})\n".format(
-                            message.author.name, message.author.id
-                        )
-                        msg += "**Message content**:\n- {}".format(message.content)
-                        if message_channel:
-                            await message_channel.send(box(msg, lang="py"))
-                        await message.delete()
-            except Exception as e:
-                if message_channel:
-                    await message_channel.send(box(str(e), lang="py"))
+        if self._find_link(message.content, settings.domains) is None:
+            return
+
+        message_channel = self.bot.get_channel(settings.report_channel)
+
+        try:
+            msg = "**Message Removed in** {} ({})\n".format(
+                message.channel.mention,
+                message.channel.id,
+            )
+            msg += "**Message sent by**: {} ({})\n".format(message.author.name, message.author.id)
+            msg += "**Message content**:\n- {}".format(message.content)
+            if message_channel:
+                await message_channel.send(box(msg, lang="py"))
+            await message.delete()
+        except Exception as e:
+            if message_channel:
+                await message_channel.send(box(str(e), lang="py"))
 
     @staticmethod
-    def _match_url(url: str) -> Optional[Match[str]]:
-        return LINKS.match(url)
+    def _find_link(content: str, domains: DomainTrie) -> Optional[Match[str]]:
+        """
+        Return the first link in `content` that isn't allowed by the domain rules.
+
+        Only whitespace separated tokens containing a dot can be links,
+        so those are the only ones checked against the full link pattern.
+        """
+        if "." not in content:
+            return None
+        for token in TOKEN.finditer(content):
+            if (match := LINKS.match(token.group())) is None:
+                continue
+            if not domains or domains.lookup(_host(match.group())) is not True:
+                return match
+        return None
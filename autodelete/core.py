@@ -23,20 +23,25 @@ SOFTWARE.
 """
 
 import datetime
-import io
 import logging
+import time
 from typing import Dict, Final, List, Literal, Optional, Union
 
 import discord
-from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_list
 
-from .models import Transcript
+from .models import TranscriptPart, TranscriptWriter
+from .scheduler import RETRY_INTERVAL, SweepScheduler
 
 log: logging.Logger = logging.getLogger("red.seina.autodelete")
 
+MINIMUM_SWEEP_INTERVAL: Final[float] = 5 * 60
+# Messages behind a watermark that became deletable since, e.g. after a role change, are only
+# picked up by a full sweep.
+FULL_SWEEP_INTERVAL: Final[float] = 24 * 60 * 60
+
 
 class AutoDelete(commands.Cog):
     """
@@ -53,10 +58,14 @@ class AutoDelete(commands.Cog):
             "channels": {},
             "log_channel": None,
             "ignore": [],
+            "watermarks": {},
+            "compress_logs": False,
         }
         self.config.register_guild(**default_guild)
 
-        self._auto_deleter.start()
+        self.scheduler: SweepScheduler = SweepScheduler(self._sweep_guild)
+        # channel id -> time of its last sweep that ignored the watermark.
+        self._full_sweeps: Dict[int, float] = {}
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         pre_processed: str = super().format_help_for_context(ctx)
@@ -68,93 +77,165 @@ class AutoDelete(commands.Cog):
         ]
         return "\n".join(text)
 
-    @staticmethod
-    async def _transcript(
-        channel: discord.TextChannel, messages: List[discord.Message]
-    ) -> Optional[str]:
-        transcript: str = (
-            await Transcript(
-                channel=channel,
-                messages=messages,
-                pytz_timezone="UTC",
-                military_time=True,
-                fancy_times=True,
-            ).export()
-        ).html
-        if not transcript:
-            return
-        return transcript
+    async def cog_load(self) -> None:
+        config: Dict[int, Dict[str, Union[Dict[str, int], Optional[int], List[int]]]] = (
+            await self.config.all_guilds()
+        )
+        for guild_id, guild_data in config.items():
+            for channel_id in guild_data["channels"]:  # type: ignore
+                self.scheduler.schedule(guild_id, int(channel_id))
+        self.scheduler.start()
 
     async def cog_unload(self) -> None:
-        self._auto_deleter.cancel()
+        self.scheduler.stop()
 
     async def _log_messages(
         self,
         channel: discord.TextChannel,
         messages: List[discord.Message],
     ) -> None:
+        guild_config = self.config.guild(channel.guild)
         log_channel: Optional[discord.TextChannel] = channel.guild.get_channel(
-            await self.config.guild(channel.guild).log_channel()
+            await guild_config.log_channel()
         )  # type: ignore
         if not log_channel:
             return
-        file: Optional[str] = await self._transcript(channel, messages)
-        if not file:
-            return
         date: datetime.date = datetime.date.today()
-        await log_channel.send(
-            f"Deleted **{len(messages)}** messages from {channel.mention}",
-            file=discord.File(
-                io.BytesIO(file.encode()),
-                filename=f"{channel.name}-{date}.html",
-            ),
-        )
+        try:
+            parts: List[TranscriptPart] = await TranscriptWriter(
+                channel=channel,
+                messages=messages,
+                pytz_timezone="UTC",
+                military_time=True,
+                fancy_times=True,
+                part_size=log_channel.guild.filesize_limit,
+                compress=await guild_config.compress_logs(),
+            ).write(f"{channel.name}-{date}")
+        except Exception as error:
+            log.exception(f"Failed to build the transcript for {channel.mention}.", exc_info=error)
+            return
+        content: str = f"Deleted **{len(messages)}** messages from {channel.mention}"
+        try:
+            for index, part in enumerate(parts, 1):
+                try:
+                    await log_channel.send(
+                        (
+                            content
+                            if len(parts) == 1
+                            else f"{content} (part {index}/{len(parts)}, {part.messages} messages)"
+                        ),
+                        file=discord.File(part.file, filename=part.filename),  # type: ignore
+                    )
+                except discord.HTTPException as error:
+                    log.exception(
+                        f"Failed to send part {index} of the transcript for {channel.mention}.",
+                        exc_info=error,
+                    )
+        finally:
+            for part in parts:
+                part.file.close()
 
-    @tasks.loop(minutes=60)
-    async def _auto_deleter(self) -> None:
+    async def _next_due(self, channel: discord.TextChannel, cutoff: int, days: int) -> float:
+        """
+        The time at which the oldest message still kept in the channel expires.
+        """
+        now: float = time.time()
+        due: float = now + datetime.timedelta(days=days).total_seconds()
+        async for message in channel.history(
+            limit=1, after=discord.Object(id=cutoff), oldest_first=True
+        ):
+            due = min(due, (message.created_at + datetime.timedelta(days=days)).timestamp())
+        return max(due, now + MINIMUM_SWEEP_INTERVAL)
+
+    async def _sweep_guild(self, guild_id: int, channel_ids: List[int]) -> Dict[int, float]:
+        """
+        Delete the expired messages of the given channels.
+
+        Every channel keeps the snowflake it was last swept up to as a watermark, only the
+        window between that watermark and the new cutoff is paged, everything before it was
+        already deleted or intentionally kept. Once every `FULL_SWEEP_INTERVAL` a channel is
+        swept from the start, so messages kept back then that are deletable now go as well.
+        """
         await self.bot.wait_until_red_ready()
-        config: Dict[int, Dict[str, Union[Dict[str, int], Optional[int], List[int]]]] = (
-            await self.config.all_guilds()
+        guild: Optional[discord.Guild] = self.bot.get_guild(guild_id)
+        if not guild:
+            return {channel_id: time.time() + RETRY_INTERVAL for channel_id in channel_ids}
+        guild_data: Dict[str, Union[Dict[str, int], Optional[int], List[int]]] = (
+            await self.config.guild(guild).all()
         )
-        for guild_id, guild_data in config.items():
-            guild: Optional[discord.Guild] = self.bot.get_guild(int(guild_id))
-            if not guild:
-                continue
-            if not guild.me.guild_permissions.manage_messages:
-                log.debug(
-                    f"Cannot delete messages in {guild.name} ({guild.id}) because of missing permissions."
-                )
-                continue
-            ignored_roles: List[int] = guild_data["ignore"]  # type: ignore
+        channels: Dict[str, int] = guild_data["channels"]  # type: ignore
+        channel_ids = [channel_id for channel_id in channel_ids if str(channel_id) in channels]
+        if not guild.me.guild_permissions.manage_messages:
+            log.debug(
+                f"Cannot delete messages in {guild.name} ({guild.id}) because of missing permissions."
+            )
+            return {channel_id: time.time() + RETRY_INTERVAL for channel_id in channel_ids}
+        ignored_roles: List[int] = guild_data["ignore"]  # type: ignore
+        watermarks: Dict[str, int] = guild_data["watermarks"]  # type: ignore
 
-            def _ignored_role_check(message: discord.Message) -> bool:
-                return not (
-                    message.pinned
-                    or (
-                        isinstance(message.author, discord.Member)
-                        and set(role.id for role in message.author.roles).intersection(
-                            ignored_roles
-                        )
-                    )
+        def _ignored_role_check(message: discord.Message) -> bool:
+            return not (
+                message.pinned
+                or (
+                    isinstance(message.author, discord.Member)
+                    and set(role.id for role in message.author.roles).intersection(ignored_roles)
                 )
+            )
 
-            channels: Dict[str, int] = guild_data["channels"]  # type: ignore
-            for channel_id, days in channels.items():
-                channel: Optional[discord.TextChannel] = guild.get_channel(int(channel_id))  # type: ignore
-                if not channel:
-                    continue
-                try:
-                    messages: List[discord.Message] = await channel.purge(
-                        limit=None,
-                        check=_ignored_role_check,
-                        before=datetime.datetime.utcnow() - datetime.timedelta(days=days),
-                    )
-                except discord.HTTPException as error:
-                    log.exception(
-                        f"Failed to delete messages from {channel.mention}.", exc_info=error
-                    )
-                    continue
+        next_due: Dict[int, float] = {}
+        swept: Dict[str, int] = {}
+        for channel_id in channel_ids:
+            channel: Optional[discord.TextChannel] = guild.get_channel(channel_id)  # type: ignore
+            if not channel:
+                continue
+            days: int = channels[str(channel_id)]
+            cutoff: int = discord.utils.time_snowflake(
+                discord.utils.utcnow() - datetime.timedelta(days=days)
+            )
+            full: bool = (
+                time.time() - self._full_sweeps.get(channel_id, 0.0) >= FULL_SWEEP_INTERVAL
+            )
+            watermark: Optional[int] = None if full else watermarks.get(str(channel_id))
+            try:
+                messages: List[discord.Message] = await channel.purge(
+                    limit=None,
+                    check=_ignored_role_check,
+                    before=discord.Object(id=cutoff),
+                    after=discord.Object(id=watermark) if watermark else None,
+                )
+            except discord.HTTPException as error:
+                log.exception(f"Failed to delete messages from {channel.mention}.", exc_info=error)
+                next_due[channel_id] = time.time() + RETRY_INTERVAL
+                continue
+            swept[str(channel_id)] = cutoff
+            if full:
+                self._full_sweeps[channel_id] = time.time()
+            if messages:
                 await self._log_messages(channel, messages)
+            try:
+                next_due[channel_id] = await self._next_due(channel, cutoff, days)
+            except discord.HTTPException:
+                next_due[channel_id] = time.time() + MINIMUM_SWEEP_INTERVAL
+            next_due[channel_id] = min(
+                next_due[channel_id], self._full_sweeps[channel_id] + FULL_SWEEP_INTERVAL
+            )
+        if swept:
+            async with self.config.guild(guild).watermarks() as stored:
+                stored.update(swept)
+        return next_due
+
+    @commands.Cog.listener()
+    async def on_guild_channel_pins_update(
+        self, channel: discord.abc.GuildChannel, _last_pin: Optional[datetime.datetime]
+    ) -> None:
+        if str(channel.id) not in await self.config.guild(channel.guild).channels():
+            return
+        # An unpinned message may be behind the watermark already, rescan the channel soon.
+        await self.config.guild(channel.guild).watermarks.clear_raw(str(channel.id))
+        due: float = time.time() + MINIMUM_SWEEP_INTERVAL
+        self.scheduler.schedule(
+            channel.guild.id, channel.id, min(self.scheduler.next_due(channel.id) or due, due)
+        )
 
     @commands.guild_only()
     @commands.admin_or_permissions(manage_guild=True)
@@ -188,6 +269,7 @@ class AutoDelete(commands.Cog):
                 )
             channels[str(channel.id)] = days
             await self.config.guild(ctx.guild).channels.set(channels)
+            self.scheduler.schedule(ctx.guild.id, channel.id)
             await ctx.send(
                 f"Added autodelete rule to delete messages older than {days} days from {channel.mention}.",
                 reference=ctx.message.to_reference(fail_if_not_exists=False),
@@ -200,6 +282,8 @@ class AutoDelete(commands.Cog):
                 )
             del channels[str(channel.id)]
             await self.config.guild(ctx.guild).channels.set(channels)
+            await self.config.guild(ctx.guild).watermarks.clear_raw(str(channel.id))
+            self.scheduler.cancel(channel.id)
             await ctx.send(
                 f"Removed auto delete rule from {channel.mention}.",
                 reference=ctx.message.to_reference(fail_if_not_exists=False),
@@ -257,8 +341,22 @@ class AutoDelete(commands.Cog):
                 elif add_or_remove.lower() == "remove":
                     if channel.id in i:
                         i.remove(channel.id)
+        # Messages kept behind the watermarks may no longer be ignored, rescan them.
+        await self.config.guild(ctx.guild).watermarks.clear()
         await ctx.send(
             f"Successfully {'added' if add_or_remove.lower() == 'add' else 'removed'} {len(channels)} channels.",
             reference=ctx.message.to_reference(fail_if_not_exists=False),
             allowed_mentions=discord.AllowedMentions(replied_user=False),
         )
+
+    @_deleter.command(name="compress", aliases=["gzip"])  # type: ignore
+    async def _compress(self, ctx: commands.GuildContext, true_or_false: bool):
+        """
+        Toggle whether log transcripts are gzip compressed.
+        """
+        await self.config.guild(ctx.guild).compress_logs.set(true_or_false)
+        await ctx.send(
+            f"Log transcripts will {'now' if true_or_false else 'no longer'} be compressed.",
+            reference=ctx.message.to_reference(fail_if_not_exists=False),
+            allowed_mentions=discord.AllowedMentions(replied_user=False),
+        )
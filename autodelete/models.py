@@ -23,10 +23,13 @@ SOFTWARE.
 """
 
 import datetime
+import gzip
 import html
 import re
+import shutil
+import tempfile
 import traceback
-from typing import List, Protocol, Self, Union
+from typing import IO, Any, Dict, Final, List, NamedTuple, Optional, Protocol, Self, Tuple, Union
 
 import discord
 import pytz
@@ -44,6 +47,12 @@ from chat_exporter.ext.html_generator import (
     total,
 )
 
+MESSAGE_CHUNK_SIZE: Final[int] = 250
+SPOOL_MEMORY_LIMIT: Final[int] = 1024 * 1024
+# Room kept in every part for the footer and the participant list.
+TAIL_RESERVE: Final[int] = 256 * 1024
+MESSAGES_PLACEHOLDER: Final[str] = "<!-- TRANSCRIPT MESSAGES -->"
+
 
 class DAOProtocol(Protocol):
     html: str
@@ -204,3 +213,152 @@ class Transcript(TranscriptDAO):
             self.html: str = "Whoops! Something went wrong..."
             traceback.print_exc()
             return self
+
+
+class TranscriptPart(NamedTuple):
+    file: IO[bytes]
+    filename: str
+    messages: int
+
+
+class TranscriptWriter(TranscriptDAO):
+    """
+    Streams a transcript to disk instead of building it as one string.
+
+    Messages are rendered `chunk_size` at a time into a spooled temporary file. Once a part
+    would grow past `part_size` it is closed off as a complete document and a new one is
+    started, so memory stays bounded by the chunk size and every part fits an upload.
+    """
+
+    def __init__(
+        self,
+        channel: discord.TextChannel,
+        messages: List[discord.Message],
+        pytz_timezone: str,
+        military_time: bool,
+        fancy_times: bool,
+        *,
+        part_size: int,
+        compress: bool = False,
+        chunk_size: int = MESSAGE_CHUNK_SIZE,
+    ) -> None:
+        super().__init__(channel, messages, pytz_timezone, military_time, fancy_times)
+        self.part_size: int = max(part_size - TAIL_RESERVE, TAIL_RESERVE)
+        self.compress: bool = compress
+        self.chunk_size: int = chunk_size
+
+    async def _document(
+        self, messages: List[discord.Message], meta_data: Dict[int, List[Any]]
+    ) -> Tuple[str, str]:
+        # The message count of the document is taken from `self.messages`, point it at the part.
+        everything: List[discord.Message] = self.messages
+        self.messages = messages
+        try:
+            await self.export_transcript(MESSAGES_PLACEHOLDER, meta_data)  # type: ignore
+        finally:
+            self.messages = everything
+        head, _, tail = self.html.partition(MESSAGES_PLACEHOLDER)
+        self.html = ""
+        return head, tail
+
+    @staticmethod
+    def _merge_meta_data(merged: Dict[int, List[Any]], meta_data: Dict[int, List[Any]]) -> None:
+        for user_id, data in meta_data.items():
+            if user_id in merged:
+                # Index 4 holds the number of messages of the participant.
+                merged[user_id][4] += data[4]
+            else:
+                merged[user_id] = list(data)
+
+    async def _render(
+        self, chunk: List[discord.Message], limit: int
+    ) -> List[Tuple[int, bytes, Dict[int, List[Any]]]]:
+        """
+        Render a chunk of messages, halving it until every piece fits in `limit` bytes.
+        """
+        message_html, meta_data = await gather_messages(
+            chunk,
+            self.channel.guild,
+            self.pytz_timezone,
+            self.military_time,
+        )
+        data: bytes = message_html.encode()
+        if len(data) <= limit or len(chunk) == 1:
+            return [(len(chunk), data, meta_data)]
+        middle: int = len(chunk) // 2
+        return await self._render(chunk[:middle], limit) + await self._render(
+            chunk[middle:], limit
+        )
+
+    async def _finish_part(
+        self, body: IO[bytes], messages: List[discord.Message], meta_data: Dict[int, List[Any]]
+    ) -> IO[bytes]:
+        head, tail = await self._document(messages, meta_data)
+        spool: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT)  # type: ignore
+        try:
+            stream: IO[bytes] = (
+                gzip.GzipFile(fileobj=spool, mode="wb") if self.compress else spool  # type: ignore
+            )
+            stream.write(head.encode())
+            body.seek(0)
+            shutil.copyfileobj(body, stream)
+            stream.write(tail.encode())
+            if stream is not spool:
+                stream.close()
+        except Exception:
+            spool.close()
+            raise
+        finally:
+            body.close()
+        spool.seek(0)
+        return spool
+
+    async def write(self, basename: str) -> List[TranscriptPart]:
+        finished: List[Tuple[IO[bytes], int]] = []
+        # The head of every part is rendered with that part's count once it is complete, an
+        # empty one is good enough to know how much room it takes.
+        head, _ = await self._document([], {})
+        limit: int = max(self.part_size - len(head.encode()), 1)
+        body: Optional[IO[bytes]] = None
+        meta_data: Dict[int, List[Any]] = {}
+        start: int = 0
+        count: int = 0
+        written: int = 0
+        try:
+            for index in range(0, len(self.messages), self.chunk_size):
+                chunk: List[discord.Message] = self.messages[index : index + self.chunk_size]
+                for size, data, chunk_meta_data in await self._render(chunk, limit):
+                    if body is not None and written + len(data) > limit:
+                        part: List[discord.Message] = self.messages[start : start + count]
+                        finished.append((await self._finish_part(body, part, meta_data), count))
+                        body = None
+                    if body is None:
+                        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT)  # type: ignore
+                        meta_data = {}
+                        start += count
+                        count = 0
+                        written = 0
+                    body.write(data)  # type: ignore
+                    written += len(data)
+                    count += size
+                    self._merge_meta_data(meta_data, chunk_meta_data)
+            if body is not None:
+                part = self.messages[start : start + count]
+                finished.append((await self._finish_part(body, part, meta_data), count))
+                body = None
+        except Exception:
+            for file, _ in finished:
+                file.close()
+            if body is not None:
+                body.close()
+            raise
+        finally:
+            clear_cache()
+            Component.menu_div_id = 0
+        extension: str = "html.gz" if self.compress else "html"
+        if len(finished) == 1:
+            return [TranscriptPart(finished[0][0], f"{basename}.{extension}", finished[0][1])]
+        return [
+            TranscriptPart(file, f"{basename}-part{index}.{extension}", count)
+            for index, (file, count) in enumerate(finished, 1)
+        ]
@@ -0,0 +1,140 @@
+"""
+MIT License
+
+Copyright (c) 2024-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, DefaultDict, Dict, Final, List, Optional, Set, Tuple
+
+log: logging.Logger = logging.getLogger("red.seina.autodelete.scheduler")
+
+MAXIMUM_CONCURRENT_SWEEPS: Final[int] = 4
+RETRY_INTERVAL: Final[float] = 60 * 60
+
+SweepCallback = Callable[[int, List[int]], Awaitable[Dict[int, float]]]
+
+
+class SweepScheduler:
+    """
+    Due-time priority queue of channels waiting for their next sweep.
+
+    Due channels are grouped by guild and every guild is swept in its own task, at most
+    `MAXIMUM_CONCURRENT_SWEEPS` at a time. The sweep callback returns the next due time of
+    each channel it swept, channels left out of that mapping are no longer scheduled.
+    """
+
+    def __init__(
+        self, sweep: SweepCallback, *, concurrency: int = MAXIMUM_CONCURRENT_SWEEPS
+    ) -> None:
+        self._sweep: SweepCallback = sweep
+        self._heap: List[Tuple[float, int, int]] = []
+        # channel id -> due time of its live heap entry, anything else in the heap is stale.
+        self._due: Dict[int, float] = {}
+        # Channels being swept right now, and those of them whose rule was removed meanwhile.
+        self._sweeping: Set[int] = set()
+        self._cancelled: Set[int] = set()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self._sweeps: Set[asyncio.Task[None]] = set()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="autodelete:scheduler")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._sweeps:
+            task.cancel()
+        self._sweeps.clear()
+
+    def schedule(self, guild_id: int, channel_id: int, due: Optional[float] = None) -> None:
+        due = time.time() if due is None else due
+        self._due[channel_id] = due
+        self._cancelled.discard(channel_id)
+        heapq.heappush(self._heap, (due, guild_id, channel_id))
+        self._wakeup.set()
+
+    def cancel(self, channel_id: int) -> None:
+        self._due.pop(channel_id, None)
+        if channel_id in self._sweeping:
+            self._cancelled.add(channel_id)
+
+    def next_due(self, channel_id: int) -> Optional[float]:
+        return self._due.get(channel_id)
+
+    def _pop_due(self, now: float) -> DefaultDict[int, List[int]]:
+        due: DefaultDict[int, List[int]] = defaultdict(list)
+        while self._heap and self._heap[0][0] <= now:
+            when, guild_id, channel_id = heapq.heappop(self._heap)
+            if self._due.get(channel_id) != when:
+                continue
+            del self._due[channel_id]
+            due[guild_id].append(channel_id)
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            now: float = time.time()
+            for guild_id, channel_ids in self._pop_due(now).items():
+                task: asyncio.Task[None] = asyncio.create_task(
+                    self._sweep_guild(guild_id, channel_ids)
+                )
+                self._sweeps.add(task)
+                task.add_done_callback(self._sweeps.discard)
+            # Drop stale entries so the sleep below targets a live due time.
+            while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            timeout: Optional[float] = max(0, self._heap[0][0] - now) if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _sweep_guild(self, guild_id: int, channel_ids: List[int]) -> None:
+        self._sweeping.update(channel_ids)
+        try:
+            async with self._semaphore:
+                try:
+                    next_due: Dict[int, float] = await self._sweep(guild_id, channel_ids)
+                except Exception:
+                    log.exception("Failed to sweep the channels of guild %s.", guild_id)
+                    next_due = {
+                        channel_id: time.time() + RETRY_INTERVAL for channel_id in channel_ids
+                    }
+        finally:
+            self._sweeping.difference_update(channel_ids)
+        for channel_id, when in next_due.items():
+            # A rule edited mid-sweep has already been rescheduled, a removed one stays removed.
+            if channel_id not in self._due and channel_id not in self._cancelled:
+                self.schedule(guild_id, channel_id, when)
+        self._cancelled.difference_update(channel_ids)
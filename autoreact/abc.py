@@ -29,6 +29,7 @@ import discord
 from redbot.core import Config, commands
 
 from .cache import Cache
+from .dispatcher import ReactionDispatcher
 
 from redbot.core.bot import Red  # isort: skip
 
@@ -41,6 +42,7 @@ class MixinMeta(ABC, metaclass=CompositeMetaClass):
     bot: Red
     config: Config
     cache: Cache
+    dispatcher: ReactionDispatcher
 
     def __init__(self, *_args: Any) -> None:
         super().__init__(*_args)
@@ -24,6 +24,8 @@ SOFTWARE.
 
 from typing import TYPE_CHECKING, Dict, List, Protocol
 
+from .matcher import TriggerMatcher
+
 if TYPE_CHECKING:
     from .core import AutoReact
 
@@ -33,15 +35,29 @@ class CacheProtocol(Protocol):
 
     async def initialize(self) -> None: ...
 
+    def rebuild_matcher(self, guild_id: int) -> None: ...
+
 
 class Cache(CacheProtocol):
     def __init__(self, cog: "AutoReact") -> None:
         self.cog: "AutoReact" = cog
         self.autoreact: Dict[int, Dict[str, List[str]]] = {}
         self.event: Dict[int, Dict[str, List[str]]] = {}
+        self.matchers: Dict[int, TriggerMatcher] = {}
 
     async def initialize(self) -> None:
         config: Dict[int, Dict[str, Dict[str, List[str]]]] = await self.cog.config.all_guilds()
         for _id, data in config.items():
             self.autoreact[_id] = data["reaction"]
             self.event[_id] = data["event"]
+            self.rebuild_matcher(_id)
+
+    def rebuild_matcher(self, guild_id: int) -> None:
+        triggers: Dict[str, List[str]] = self.autoreact.get(guild_id, {})
+        matcher: TriggerMatcher = TriggerMatcher(
+            trigger for trigger, reactions in triggers.items() if reactions
+        )
+        if matcher:
+            self.matchers[guild_id] = matcher
+        else:
+            self.matchers.pop(guild_id, None)
@@ -85,6 +85,7 @@ class Commands(MixinMeta, metaclass=CompositeMetaClass):
         if trigger not in self.cache.autoreact[ctx.guild.id]:
             self.cache.autoreact[ctx.guild.id][trigger] = []
         self.cache.autoreact[ctx.guild.id][trigger].append(str(reaction))
+        self.cache.rebuild_matcher(ctx.guild.id)
         await ctx.send("Successfully added {} as a reaction for `{}`".format(reaction, trigger))
 
     @_autoreact_add.command(name="images")
@@ -196,6 +197,7 @@ class Commands(MixinMeta, metaclass=CompositeMetaClass):
         reactions[trigger].remove(str(reaction))
         await self.config.guild(ctx.guild).reaction.set(reactions)
         self.cache.autoreact[ctx.guild.id][trigger].remove(str(reaction))
+        self.cache.rebuild_matcher(ctx.guild.id)
         await ctx.send("Successfully removed that auto reaction.")
 
     @_autoreact_remove.command(name="images")
@@ -283,6 +285,7 @@ class Commands(MixinMeta, metaclass=CompositeMetaClass):
         if ctx.guild.id in self.cache.autoreact:
             await self.config.guild(ctx.guild).reaction.clear()
             del self.cache.autoreact[ctx.guild.id]
+            self.cache.rebuild_matcher(ctx.guild.id)
         if ctx.guild.id in self.cache.event:
             await self.config.guild(ctx.guild).event.clear()
             del self.cache.event[ctx.guild.id]
@@ -298,8 +301,23 @@ class Commands(MixinMeta, metaclass=CompositeMetaClass):
         del reaction[trigger]
         await self.config.guild(ctx.guild).reaction.set(reaction)
         del self.cache.autoreact[ctx.guild.id][trigger]
+        self.cache.rebuild_matcher(ctx.guild.id)
         await ctx.send("Successfully cleared every auto reaction for that trigger.")
 
+    @commands.is_owner()
+    @_autoreact.command(name="stats")
+    async def _autoreact_stats(self, ctx: commands.GuildContext):
+        """View the reaction dispatch queue statistics."""
+        stats: Dict[str, int] = self.dispatcher.stats()
+        embed: discord.Embed = discord.Embed(
+            color=await ctx.embed_color(),
+            title="Auto Reaction Dispatcher",
+            description="\n".join(
+                "**{}:** {}".format(name.title(), value) for name, value in stats.items()
+            ),
+        )
+        await ctx.send(embed=embed)
+
     @_autoreact.command(name="list", aliases=["view", "all"])
     async def _autoreact_list(self, ctx: commands.GuildContext, events: bool = False):
         """View every auto reacton trigger."""
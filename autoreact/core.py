@@ -23,8 +23,7 @@ SOFTWARE.
 """
 
 import asyncio
-import contextlib
-from typing import Dict, Final, List, Literal, Pattern
+from typing import Dict, Final, List, Literal, Optional
 
 import discord
 from redbot.core import Config, commands
@@ -33,17 +32,13 @@ from redbot.core.utils.chat_formatting import humanize_list
 from .abc import CompositeMetaClass
 from .cache import Cache
 from .commands import Commands
+from .dispatcher import ReactionDispatcher
 from .events import EventMixin
+from .matcher import TriggerMatcher
 
 from redbot.core.bot import Red  # isort: skip
 
 
-try:
-    import regex as re  # pyright: ignore[reportMissingModuleSource]
-except (ImportError, ModuleNotFoundError):
-    import re
-
-
 class AutoReact(
     Commands,
     EventMixin,
@@ -59,6 +54,7 @@ class AutoReact(
         super().__init__()
         self.bot: Red = bot
         self.cache: Cache = Cache(self)
+        self.dispatcher: ReactionDispatcher = ReactionDispatcher(self)
 
         self.config: Config = Config.get_conf(
             self,
@@ -89,8 +85,10 @@ class AutoReact(
     async def cog_load(self) -> None:
         if self._task is discord.utils.MISSING:
             self.task: asyncio.Task[None] = asyncio.create_task(self.initialize())
+        self.dispatcher.start()
 
     async def cog_unload(self) -> None:
+        self.dispatcher.stop()
         if self._task is not discord.utils.MISSING:
             if not self._task.cancelled():
                 self._task.cancel()
@@ -105,19 +103,19 @@ class AutoReact(
     async def do_autoreact(self, message: discord.Message) -> None:
         if message.guild is None:
             return
-        for keyword, reactions in self.cache.autoreact[message.guild.id].items():
-            pattern: Pattern[str] = re.compile(keyword)
-            if pattern.search(message.content):
-                with contextlib.suppress(discord.HTTPException, TypeError):
-                    _: asyncio.futures.Future[List[None]] = asyncio.gather(
-                        *(message.add_reaction(reaction) for reaction in reactions)
-                    )
-                await asyncio.sleep(0.001)  # TODO: remove this
+        matcher: Optional[TriggerMatcher] = self.cache.matchers.get(message.guild.id)
+        if matcher is None:
+            return
+        triggers: Dict[str, List[str]] = self.cache.autoreact[message.guild.id]
+        reactions: List[str] = [
+            reaction
+            for keyword in matcher.matches(message.content)
+            for reaction in triggers[keyword]
+        ]
+        self.dispatcher.submit(message, reactions)
 
     async def do_autoreact_event(self, message: discord.Message, type: str) -> None:
         if message.guild is None:
             return
-        reactions: List[str] = self.cache.event[message.guild.id][type]
-        _: asyncio.futures.Future[List[None]] = asyncio.gather(
-            *(message.add_reaction(reaction) for reaction in reactions)
-        )
+        reactions: List[str] = self.cache.event[message.guild.id].get(type, [])
+        self.dispatcher.submit(message, reactions)
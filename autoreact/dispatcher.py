@@ -0,0 +1,218 @@
+"""
+MIT License
+
+Copyright (c) 2024-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Final, List, NamedTuple, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from .core import AutoReact
+
+
+log: logging.Logger = logging.getLogger("red.seina.autoreact.dispatcher")
+
+MAXIMUM_QUEUE_SIZE: Final[int] = 1000
+MAXIMUM_JOB_AGE: Final[float] = 30.0
+CHANNEL_REACTION_INTERVAL: Final[float] = 0.25
+WORKER_COUNT: Final[int] = 4
+MAXIMUM_TRACKED_CHANNELS: Final[int] = 1000
+
+
+class ReactionJob(NamedTuple):
+    message: discord.Message
+    created_at: float
+    # Set when a channel timer already reserved the channel's next reaction slot for the job.
+    slotted: bool = False
+
+
+class ReactionDispatcher:
+    """
+    Bounded queue that fans reactions out to a small pool of workers.
+
+    Reactions for the same message are merged and deduplicated while the message waits in the
+    queue, every channel is paced to one reaction per `CHANNEL_REACTION_INTERVAL` and jobs
+    that waited longer than `MAXIMUM_JOB_AGE` are dropped instead of being sent late.
+
+    A worker sends at most one reaction per job and never sleeps. Jobs for a channel that is
+    cooling down wait in that channel's FIFO, and one timer per channel hands the head job back
+    to the queue once the next slot opens, so a hot channel never holds up the others.
+    """
+
+    def __init__(
+        self,
+        cog: "AutoReact",
+        *,
+        maxsize: int = MAXIMUM_QUEUE_SIZE,
+        max_age: float = MAXIMUM_JOB_AGE,
+        workers: int = WORKER_COUNT,
+    ) -> None:
+        self.cog: "AutoReact" = cog
+        self.max_age: float = max_age
+        self.worker_count: int = workers
+        self.maxsize: int = maxsize
+        # Bounded through `pending` in `submit`, so timers can always hand jobs back.
+        self.queue: asyncio.Queue[ReactionJob] = asyncio.Queue()
+        self.pending: Dict[int, List[str]] = {}
+        self.channel_waiting: Dict[int, Deque[ReactionJob]] = {}
+        self.channel_timers: Dict[int, asyncio.TimerHandle] = {}
+        self.channel_ready_at: Dict[int, float] = {}
+        self.workers: List[asyncio.Task[None]] = []
+        self.sent: int = 0
+        self.failed: int = 0
+        self.dropped: int = 0
+        self.expired: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            "<ReactionDispatcher depth={0.depth} sent={0.sent} failed={0.failed} "
+            "dropped={0.dropped} expired={0.expired}>".format(self)
+        )
+
+    @property
+    def depth(self) -> int:
+        return len(self.pending)
+
+    def start(self) -> None:
+        if self.workers:
+            return
+        self.workers = [
+            asyncio.create_task(self._worker(), name="red.seina.autoreact.dispatcher.{}".format(i))
+            for i in range(self.worker_count)
+        ]
+
+    def stop(self) -> None:
+        for worker in self.workers:
+            worker.cancel()
+        for timer in self.channel_timers.values():
+            timer.cancel()
+        self.workers.clear()
+        self.pending.clear()
+        self.channel_waiting.clear()
+        self.channel_timers.clear()
+        self.channel_ready_at.clear()
+
+    def submit(self, message: discord.Message, reactions: List[str]) -> bool:
+        if not reactions:
+            return True
+        if (queued := self.pending.get(message.id)) is not None:
+            queued.extend(reaction for reaction in reactions if reaction not in queued)
+            return True
+        if len(self.pending) >= self.maxsize:
+            self.dropped += 1
+            return False
+        self.queue.put_nowait(ReactionJob(message, time.monotonic()))
+        self.pending[message.id] = list(dict.fromkeys(reactions))
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            job: ReactionJob = await self.queue.get()
+            try:
+                await self._process(job)
+            except Exception as error:
+                log.exception(
+                    "Failed to process reactions for %s.", job.message.id, exc_info=error
+                )
+            finally:
+                self.queue.task_done()
+
+    async def _process(self, job: ReactionJob) -> None:
+        message_id: int = job.message.id
+        reactions: Optional[List[str]] = self.pending.get(message_id)
+        if not reactions or time.monotonic() - job.created_at > self.max_age:
+            if reactions:
+                self.expired += 1
+            self.pending.pop(message_id, None)
+            return
+        channel_id: int = job.message.channel.id
+        if not job.slotted and not self._reserve(channel_id):
+            self._wait_for_channel(channel_id, job)
+            return
+        reaction: str = reactions.pop(0)
+        try:
+            await job.message.add_reaction(reaction)
+        except discord.NotFound:
+            self.pending.pop(message_id, None)
+            return
+        except (discord.HTTPException, TypeError):
+            self.failed += 1
+        else:
+            self.sent += 1
+        if reactions:
+            self._wait_for_channel(channel_id, job)
+        else:
+            self.pending.pop(message_id, None)
+
+    def _reserve(self, channel_id: int) -> bool:
+        if channel_id in self.channel_waiting:
+            return False
+        now: float = time.monotonic()
+        if self.channel_ready_at.get(channel_id, now) > now:
+            return False
+        if len(self.channel_ready_at) >= MAXIMUM_TRACKED_CHANNELS:
+            self.channel_ready_at = {
+                key: ready_at for key, ready_at in self.channel_ready_at.items() if ready_at > now
+            }
+        self.channel_ready_at[channel_id] = now + CHANNEL_REACTION_INTERVAL
+        return True
+
+    def _wait_for_channel(self, channel_id: int, job: ReactionJob) -> None:
+        waiting: Optional[Deque[ReactionJob]] = self.channel_waiting.get(channel_id)
+        if waiting is None:
+            waiting = self.channel_waiting[channel_id] = deque()
+        waiting.append(job)
+        if channel_id not in self.channel_timers:
+            self._arm(channel_id)
+
+    def _arm(self, channel_id: int) -> None:
+        now: float = time.monotonic()
+        delay: float = max(0.0, self.channel_ready_at.get(channel_id, now) - now)
+        self.channel_timers[channel_id] = asyncio.get_running_loop().call_later(
+            delay, self._release, channel_id
+        )
+
+    def _release(self, channel_id: int) -> None:
+        del self.channel_timers[channel_id]
+        waiting: Deque[ReactionJob] = self.channel_waiting[channel_id]
+        job: ReactionJob = waiting.popleft()
+        # Reserve the slot handed to `job` so newcomers can't take it before a worker does.
+        self.channel_ready_at[channel_id] = time.monotonic() + CHANNEL_REACTION_INTERVAL
+        if waiting:
+            self._arm(channel_id)
+        else:
+            del self.channel_waiting[channel_id]
+        self.queue.put_nowait(job._replace(slotted=True))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "expired": self.expired,
+        }
@@ -22,13 +22,11 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import asyncio
-
 import discord
 from redbot.core import commands
 
 from .abc import CompositeMetaClass, MixinMeta
-from .utils import search_for_emojis
+from .utils import scan_content
 
 
 class EventMixin(MixinMeta, metaclass=CompositeMetaClass):
@@ -48,17 +46,17 @@ class EventMixin(MixinMeta, metaclass=CompositeMetaClass):
             return
         await self.wait_until_cog_ready()
         if message.guild.id in self.cache.autoreact:
-            asyncio.ensure_future(self.do_autoreact(message))
+            await self.do_autoreact(message)
         if message.guild.id in self.cache.event:
-            if "images" in self.cache.event[message.guild.id] and message.attachments:
-                asyncio.ensure_future(self.do_autoreact_event(message, "event"))
-            if "spoilers" in self.cache.event[message.guild.id] and (
-                message.content.count("||") > 2
-            ):
-                asyncio.ensure_future(self.do_autoreact_event(message, "spoilers"))
-            if "emojis" in self.cache.event[message.guild.id] and search_for_emojis(
-                message.content
-            ):
-                asyncio.ensure_future(self.do_autoreact_event(message, "emojis"))
-            if "stickers" in self.cache.event[message.guild.id] and message.stickers:
-                asyncio.ensure_future(self.do_autoreact_event(message, "stickers"))
+            events = self.cache.event[message.guild.id]
+            if "images" in events and message.attachments:
+                await self.do_autoreact_event(message, "images")
+            emojis, spoilers = scan_content(
+                message.content, emojis="emojis" in events, spoilers="spoilers" in events
+            )
+            if spoilers:
+                await self.do_autoreact_event(message, "spoilers")
+            if emojis:
+                await self.do_autoreact_event(message, "emojis")
+            if "stickers" in events and message.stickers:
+                await self.do_autoreact_event(message, "stickers")
@@ -0,0 +1,153 @@
+"""
+MIT License
+
+Copyright (c) 2024-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from typing import Dict, Final, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple
+
+try:
+    import regex as re  # pyright: ignore[reportMissingModuleSource]
+except (ImportError, ModuleNotFoundError):
+    import re
+
+
+REGEX_METACHARACTERS: Final[FrozenSet[str]] = frozenset("()[]{}?*+|^$\\.")
+# Backreferences, named groups, conditionals and inline flags change meaning (or stop
+# compiling) once a pattern is wrapped into a larger alternation.
+UNMERGEABLE_RE: Final[Pattern[str]] = re.compile(
+    r"\\(?:[1-9]|g<)|\(\?(?:P|<(?![=!])|\(|[aiLmsuxV0-9-])"
+)
+
+
+def is_literal(trigger: str) -> bool:
+    return not REGEX_METACHARACTERS.intersection(trigger)
+
+
+def is_mergeable(trigger: str) -> bool:
+    return UNMERGEABLE_RE.search(trigger) is None
+
+
+class _Automaton:
+    """Aho-Corasick automaton over the literal triggers of a guild."""
+
+    __slots__: Tuple[str, ...] = ("goto", "fail", "output")
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Tuple[str, ...]] = [()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] += (keyword,)
+        queue: List[int] = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def search(self, text: str) -> Set[str]:
+        goto, fail, output = self.goto, self.fail, self.output
+        found: Set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class TriggerMatcher:
+    """
+    Compiled matcher for every auto reaction trigger of a guild.
+
+    Literal triggers are matched together by an Aho-Corasick automaton in a single pass over
+    the content. Regex triggers are precompiled and gated behind one combined alternation,
+    so a message that matches none of them costs a single search. Patterns that cannot be
+    merged safely, see `is_mergeable`, are searched on their own.
+    """
+
+    __slots__: Tuple[str, ...] = ("_automaton", "_combined", "_patterns", "_standalone", "_order")
+
+    def __init__(self, triggers: Iterable[str]) -> None:
+        self._order: Dict[str, int] = {}
+        literals: List[str] = []
+        self._patterns: List[Tuple[str, Pattern[str]]] = []
+        self._standalone: List[Tuple[str, Pattern[str]]] = []
+        for trigger in triggers:
+            if trigger in self._order:
+                continue
+            try:
+                pattern: Pattern[str] = re.compile(trigger)
+            except re.error:
+                continue
+            self._order[trigger] = len(self._order)
+            if not trigger:
+                # An empty trigger matches every message, kept out of the gate it would open.
+                self._standalone.append((trigger, pattern))
+            elif is_literal(trigger):
+                literals.append(trigger)
+            elif is_mergeable(trigger):
+                self._patterns.append((trigger, pattern))
+            else:
+                self._standalone.append((trigger, pattern))
+        self._automaton: Optional[_Automaton] = _Automaton(literals) if literals else None
+        self._combined: Optional[Pattern[str]] = None
+        if len(self._patterns) > 1:
+            try:
+                self._combined = re.compile(
+                    "|".join("(?:{})".format(trigger) for trigger, _ in self._patterns)
+                )
+            except re.error:
+                self._combined = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __bool__(self) -> bool:
+        return bool(self._order)
+
+    def __repr__(self) -> str:
+        return "<TriggerMatcher triggers={} regexes={}>".format(
+            len(self), len(self._patterns) + len(self._standalone)
+        )
+
+    def matches(self, content: str) -> List[str]:
+        found: Set[str] = self._automaton.search(content) if self._automaton else set()
+        if self._patterns and (self._combined is None or self._combined.search(content)):
+            found.update(trigger for trigger, pattern in self._patterns if pattern.search(content))
+        found.update(trigger for trigger, pattern in self._standalone if pattern.search(content))
+        return sorted(found, key=self._order.__getitem__)
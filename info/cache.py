@@ -44,6 +44,7 @@ if TYPE_CHECKING:
     from .core import Info
 
 DEFAULT: Final[str] = "❔"
+SPECIAL_BADGE_MEMO_SIZE: Final[int] = 1024
 
 SelectEmoji = Literal["roles", "home", "avatar", "banner", "gavatar", "perms"]
 StatusEmoji = Literal["online", "away", "dnd", "offline", "streaming"]
@@ -101,6 +102,10 @@ class CacheProtocol(Protocol):
 
     async def set_select_emoji(self, name: SelectEmoji, emoji: int) -> None: ...
 
+    def rebuild_emoji_table(self) -> None: ...
+
+    def invalidate_special_badges(self, user_id: Optional[int] = None) -> None: ...
+
     def get_member_device_status(self, member: discord.Member) -> Tuple[str, str, str]: ...
 
     def get_special_badges(self, user: discord.Member) -> List[str]: ...
@@ -120,6 +125,11 @@ class Cache(CacheProtocol):
             str,
             Dict[str, Union[Optional[int], Dict[str, Optional[int]], Dict[str, Dict[str, int]]]],
         ] = {"status": {}, "badge": {}, "special": {}, "settings": {}}
+        self.rendered: Dict[str, Dict[str, str]] = {}
+        # guild id -> role id -> rendered emoji, and user id -> rendered special badges.
+        self.special_roles: Dict[int, Dict[int, str]] = {}
+        self.special_memo: Dict[int, List[str]] = {}
+        self.rebuild_emoji_table()
         self.task: asyncio.Task[None] = asyncio.create_task(self.initialize(), name="info:cache")
 
     def close(self) -> None:
@@ -127,39 +137,69 @@ class Cache(CacheProtocol):
             self.task.cancel()
 
     def get_status_emoji(self, name: StatusEmoji) -> str:
-        if name not in StatusEmoji.__args__:
+        try:
+            return self.rendered["status"][name]
+        except KeyError:
             raise ValueError
-        emoji: Optional[discord.Emoji] = discord.utils.get(
-            self.bot.emojis, id=self.emojis["status"].get(name)
-        )
-        return str(emoji) if emoji else DEFAULT
 
     def get_device_status_emoji(self, name: DeviceEmoji) -> str:
-        if name not in DeviceEmoji.__args__:
+        try:
+            return self.rendered["device"][name]
+        except KeyError:
             raise ValueError
-        emoji: Optional[discord.Emoji] = discord.utils.get(
-            self.bot.emojis,
-            id=cast(Dict[str, Optional[int]], self.emojis["status"]["device"]).get(name),
-        )
-        return str(emoji) if emoji else DEFAULT
 
     def get_badge_emoji(self, name: BadgeEmoji) -> str:
-        if name not in BadgeEmoji.__args__:
+        try:
+            return self.rendered["badge"][name]
+        except KeyError:
             raise ValueError
-        emoji: Optional[discord.Emoji] = discord.utils.get(
-            self.bot.emojis, id=self.emojis["badge"].get(name)
-        )
-        return str(emoji) if emoji else DEFAULT
 
     def get_select_emoji(self, name: SelectEmoji) -> str:
-        if name not in SelectEmoji.__args__:
+        try:
+            return self.rendered["select"][name]
+        except KeyError:
             raise ValueError
-        emoji: Optional[discord.Emoji] = discord.utils.get(
-            self.bot.emojis,
-            id=cast(Dict[str, Optional[int]], self.emojis["settings"]["select"]).get(name),
-        )
+
+    def _render_emoji(self, emoji_id: Optional[int]) -> str:
+        emoji: Optional[discord.Emoji] = self.bot.get_emoji(emoji_id) if emoji_id else None
         return str(emoji) if emoji else DEFAULT
 
+    def rebuild_emoji_table(self) -> None:
+        """
+        Resolve every configured emoji to its rendered string once.
+
+        The getters are dictionary lookups into this table, it has to be rebuilt whenever the
+        settings change or the emojis the bot can see change.
+        """
+        status: Dict[str, Optional[int]] = cast(Dict[str, Optional[int]], self.emojis["status"])
+        device: Dict[str, Optional[int]] = cast(
+            Dict[str, Optional[int]], status.get("device") or {}
+        )
+        badge: Dict[str, Optional[int]] = cast(Dict[str, Optional[int]], self.emojis["badge"])
+        select: Dict[str, Optional[int]] = cast(
+            Dict[str, Optional[int]], self.emojis["settings"].get("select") or {}
+        )
+        self.rendered = {
+            "status": {
+                name: self._render_emoji(status.get(name)) for name in StatusEmoji.__args__
+            },
+            "device": {
+                name: self._render_emoji(device.get(name)) for name in DeviceEmoji.__args__
+            },
+            "badge": {name: self._render_emoji(badge.get(name)) for name in BadgeEmoji.__args__},
+            "select": {
+                name: self._render_emoji(select.get(name)) for name in SelectEmoji.__args__
+            },
+        }
+        self.special_roles = {
+            int(guild_id): {
+                int(role_id): self._render_emoji(emoji_id) for role_id, emoji_id in roles.items()
+            }
+            for guild_id, roles in cast(Dict[str, Dict[str, int]], self.emojis["special"]).items()
+            if roles
+        }
+        self.special_memo.clear()
+
     def get_downloader_info(self) -> bool:
         return cast(bool, self.emojis["settings"]["downloader"])
 
@@ -169,6 +209,7 @@ class Cache(CacheProtocol):
         async with self.config.status() as emojis:
             emojis[name] = emoji
         self.emojis["status"][name] = emoji
+        self.rebuild_emoji_table()
 
     async def set_device_emoji(self, name: DeviceEmoji, emoji: int) -> None:
         if name not in DeviceEmoji.__args__:
@@ -178,6 +219,7 @@ class Cache(CacheProtocol):
         if "device" not in self.emojis["status"]:
             self.emojis["status"] = {"device": {}}
         cast(Dict[str, int], self.emojis["status"]["device"])[name] = emoji
+        self.rebuild_emoji_table()
 
     async def set_badge_emoji(self, name: BadgeEmoji, emoji: int) -> None:
         if name not in BadgeEmoji.__args__:
@@ -185,6 +227,7 @@ class Cache(CacheProtocol):
         async with self.config.badge() as emojis:
             emojis[name] = emoji
         self.emojis["badge"][name] = emoji
+        self.rebuild_emoji_table()
 
     async def set_select_emoji(self, name: SelectEmoji, emoji: int) -> None:
         if name not in SelectEmoji.__args__:
@@ -194,6 +237,7 @@ class Cache(CacheProtocol):
         if "select" not in self.emojis["settings"]:
             self.emojis["settings"] = {"select": {}}
         cast(Dict[str, int], self.emojis["settings"]["select"])[name] = emoji
+        self.rebuild_emoji_table()
 
     def get_member_device_status(self, member: discord.Member) -> Tuple[str, str, str]:
         mobile: str = {
@@ -217,33 +261,39 @@ class Cache(CacheProtocol):
         return mobile, web, desktop
 
     def get_special_badges(self, user: discord.Member) -> List[str]:
+        if (memo := self.special_memo.get(user.id)) is not None:
+            return memo
         special: List[str] = []
-        for guild_id, roles in cast(Dict[str, Dict[str, int]], self.emojis["special"]).items():
-            if (guild := self.bot.get_guild(int(guild_id))) and (
-                member := guild.get_member(user.id)
-            ):
-                for r in reversed(member.roles):
-                    if str(r.id) in roles.keys():  # type: ignore
-                        special.append(
-                            "{} {}".format(
-                                self.bot.get_emoji(cast(Dict[str, int], roles)[str(r.id)]),
-                                r.name.title(),
-                            )
-                        )
+        for guild_id, roles in self.special_roles.items():
+            if (guild := self.bot.get_guild(guild_id)) and (member := guild.get_member(user.id)):
+                matched: List[discord.Role] = [
+                    role
+                    for role_id in member._roles
+                    if role_id in roles and (role := guild.get_role(role_id))
+                ]
+                matched.sort(reverse=True)
+                special.extend("{} {}".format(roles[r.id], r.name.title()) for r in matched)
+        if len(self.special_memo) >= SPECIAL_BADGE_MEMO_SIZE:
+            self.special_memo.pop(next(iter(self.special_memo)))
+        self.special_memo[user.id] = special
         return special
 
+    def is_special_guild(self, guild_id: int) -> bool:
+        return guild_id in self.special_roles
+
+    def invalidate_special_badges(self, user_id: Optional[int] = None) -> None:
+        if user_id is None:
+            self.special_memo.clear()
+        else:
+            self.special_memo.pop(user_id, None)
+
     async def set_special_badge(self, guild: int, role: int, emoji: int) -> None:
         async with self.config.special() as special:
-            if str(guild) not in special:
-                special: Dict[str, Dict[str, int]] = {str(guild): {}}
-            if str(role) not in special[str(guild)]:
-                special[str(guild)] = {str(role): None}
-            special[str(guild)][str(role)] = emoji
-        if str(guild) not in self.emojis["special"]:
-            self.emojis["special"] = {str(guild): {}}
-        if str(role) not in cast(Dict[str, Dict[str, int]], self.emojis["special"][str(guild)]):
-            self.emojis[str(guild)] = {str(role): None}
-        cast(Dict[str, int], self.emojis["special"][str(guild)])[str(role)] = emoji
+            special.setdefault(str(guild), {})[str(role)] = emoji
+        cast(Dict[str, Dict[str, int]], self.emojis["special"]).setdefault(str(guild), {})[
+            str(role)
+        ] = emoji
+        self.rebuild_emoji_table()
 
     async def set_downloader_info(self, toggle: bool) -> None:
         await cast(Group, self.config.settings).downloader.set(toggle)
@@ -254,6 +304,10 @@ class Cache(CacheProtocol):
         self.emojis["badge"] = await self.config.badge()
         self.emojis["special"] = await self.config.special()
         self.emojis["settings"] = await self.config.settings()
+        self.rebuild_emoji_table()
+        # Emojis can only be resolved once the guilds are cached.
+        await self.bot.wait_until_red_ready()
+        self.rebuild_emoji_table()
 
     async def get_user_badges(self, user: discord.Member) -> Tuple[str, int]:
         flags: List[str] = [f.name for f in user.public_flags.all()]
@@ -25,7 +25,7 @@ SOFTWARE.
 import datetime
 import logging
 from collections import abc
-from typing import Dict, Final, List, Optional, Tuple, Union, cast
+from typing import Dict, Final, List, Optional, Sequence, Tuple, Union, cast
 
 import discord
 from redbot.core import commands
@@ -156,6 +156,45 @@ class Info(commands.Cog, SettingsCommands, metaclass=CompositeMetaClass):
         if guild.chunked is False and self.bot.intents.members:
             await guild.chunk(cache=True)
 
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(
+        self, guild: discord.Guild, before: Sequence[discord.Emoji], after: Sequence[discord.Emoji]
+    ) -> None:
+        self.cache.rebuild_emoji_table()
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before._roles != after._roles and self.cache.is_special_guild(after.guild.id):
+            self.cache.invalidate_special_badges(after.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        if self.cache.is_special_guild(member.guild.id):
+            self.cache.invalidate_special_badges(member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        if self.cache.is_special_guild(member.guild.id):
+            self.cache.invalidate_special_badges(member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        if before.name != after.name and self.cache.is_special_guild(after.guild.id):
+            self.cache.invalidate_special_badges()
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if self.cache.is_special_guild(role.guild.id):
+            self.cache.invalidate_special_badges()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        self.cache.rebuild_emoji_table()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.cache.rebuild_emoji_table()
+
     async def cog_unload(self) -> None:
         global OLD_USERINFO_COMMAND
         if OLD_USERINFO_COMMAND is not discord.utils.MISSING:
@@ -28,7 +28,8 @@ from redbot.core.bot import Red
 from .core import MassUnban
 
 __red_end_user_data_statement__ = (
-    "This cog does not persistently store data or metadata about users."
+    "This cog stores the ID and display name of the user running a mass unban "
+    "until that mass unban finishes."
 )
 
 
@@ -31,13 +31,15 @@ import logging
 from typing import Dict, Final, List, Literal, Optional, Tuple
 
 import discord
-from redbot.core import commands
+from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils.antispam import AntiSpam
-from redbot.core.utils.chat_formatting import humanize_list
+from redbot.core.utils.chat_formatting import humanize_list, humanize_number
 from redbot.core.utils.predicates import MessagePredicate
 
+from .pipeline import MassUnbanEngine, UnbanJob, UnbanMatcher, preview
+
 log: logging.Logger = logging.getLogger("red.seina.massunban")
 
 RequestType = Literal["discord_deleted_user", "owner", "user", "user_strict"]
@@ -65,7 +67,16 @@ class MassUnban(commands.Cog):
         super().__init__()
         self.bot: Red = bot
 
+        self.config: Config = Config.get_conf(
+            self,
+            identifier=69_420_666,
+            force_registration=True,
+        )
+        self.config.register_guild(job={})
+
         self.spam: Dict[int, Dict[int, AntiSpam]] = {}
+        self.engine: MassUnbanEngine = MassUnbanEngine(self.bot, self.config)
+        self._resume_task: Optional[asyncio.Task[None]] = None
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         pre_processed = super().format_help_for_context(ctx)
@@ -77,6 +88,14 @@ class MassUnban(commands.Cog):
         ]
         return "\n".join(text)
 
+    async def cog_load(self) -> None:
+        self._resume_task = asyncio.create_task(self.engine.resume())
+
+    async def cog_unload(self) -> None:
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+        await self.engine.stop()
+
     @commands.guild_only()
     @commands.guildowner()
     @commands.command(name="massunban")
@@ -91,8 +110,13 @@ class MassUnban(commands.Cog):
         `action requested by aikaterna (id 154497072148643840). reason: bad person`
         Using `[p]massunban bad person` will unban this user as "bad person" is contained in the original ban reason.
         Using `[p]massunban aikaterna` will unban every user banned by aikaterna, if [botname] was used to ban them in the first place.
+        Using `[p]massunban mod:154497072148643840` does the same by the moderator's ID, and `[p]massunban regex:<pattern>` matches the ban reason against a regex. `mod:` followed by anything but an ID is looked for as plain text.
+        Unbanning everyone, by moderator ID or by regex asks for confirmation first.
         For users banned using the right-click ban option in Discord, the ban reason is only what the mod puts when it asks for a reason, so using the mod name to unban won't work.
 
+        Use `[p]massunbanjob preview` with the same arguments to count the matching bans without unbanning anyone.
+        The unban runs in the background, use `[p]massunbanjob status` to check on it and `[p]massunbanjob cancel` to stop it.
+
         Every unban will show up in your modlog if mod logging is on for unbans. Check `[p]modlogset cases` to verify if mod log creation on unbans is on.
         This can mean that your bot will be ratelimited on sending messages if you unban lots of users as it will create a modlog entry for each unban.
         """
@@ -105,49 +129,41 @@ class MassUnban(commands.Cog):
                 "You've used this command too many times recently, please try again later."
             )
             return
-        try:
-            banlist: List[discord.BanEntry] = [
-                entry async for entry in ctx.guild.bans(limit=2**15)
-            ]
-        except discord.errors.Forbidden:
+        if ctx.guild.id in self.engine.jobs:
+            await ctx.send(
+                _(
+                    "A mass unban is already running in this server, check on it with "
+                    "`{prefix}massunbanjob status` or stop it with `{prefix}massunbanjob cancel`."
+                ).format(prefix=ctx.clean_prefix)
+            )
+            return
+        if not ctx.guild.me.guild_permissions.ban_members:
             msg = _("I need the `Ban Members` permission to fetch the ban list for the guild.")
             await ctx.send(msg)
             return
-        except (discord.HTTPException, TypeError):
-            await ctx.send("Something went wrong getting the ban list.")
-            log.exception("Something went wrong while fetching the ban list!", exc_info=True)
-            return
-
-        bancount: int = len(banlist)
-        if bancount == 0:
-            await ctx.send(_("No users are banned from this server."))
+        try:
+            matcher: UnbanMatcher = UnbanMatcher.parse(ban_reason)
+        except commands.BadArgument as e:
+            await ctx.send(str(e))
             return
 
-        unban_count: int = 0
-        if not ban_reason:
-            warning_string = _(
-                "Are you sure you want to unban every banned person on this server?\n"
-                f"**Please read** `{ctx.prefix}help massunban` **as this action can cause a LOT of modlog messages!**\n"
-                "Type `Yes` to confirm, or `No` to cancel."
-            )
+        if matcher.kind != "text":
+            if matcher.kind == "all":
+                warning_string = _(
+                    "Are you sure you want to unban every banned person on this server?\n"
+                    f"**Please read** `{ctx.prefix}help massunban` **as this action can cause a LOT of modlog messages!**\n"
+                    "Type `Yes` to confirm, or `No` to cancel."
+                )
+            else:
+                warning_string = _(
+                    "Are you sure you want to unban every banned person matching `{query}`?\n"
+                    "Check how many that is with `{prefix}massunbanjob preview {query}` first.\n"
+                    "Type `Yes` to confirm, or `No` to cancel."
+                ).format(query=ban_reason, prefix=ctx.clean_prefix)
             await ctx.send(warning_string)
             pred = MessagePredicate.yes_or_no(ctx)
             try:
                 await self.bot.wait_for("message", check=pred, timeout=15)
-                if pred.result is True:
-                    async with ctx.typing():
-                        for ban_entry in banlist:
-                            await ctx.guild.unban(
-                                ban_entry.user,
-                                reason=_("Mass Unban requested by {name} ({id})").format(
-                                    name=str(ctx.author.display_name), id=ctx.author.id
-                                ),
-                            )
-                            await asyncio.sleep(0.5)
-                            unban_count += 1
-                else:
-                    await ctx.send(_("Alright, I'm not unbanning everyone."))
-                    return
             except asyncio.TimeoutError:
                 await ctx.send(
                     _(
@@ -155,20 +171,90 @@ class MassUnban(commands.Cog):
                     )
                 )
                 return
-        else:
-            async with ctx.typing():
-                for ban_entry in banlist:
-                    if not ban_entry.reason:
-                        continue
-                    if ban_reason.lower() in ban_entry.reason.lower():
-                        await ctx.guild.unban(
-                            ban_entry.user,
-                            reason=_("Mass Unban requested by {name} ({id})").format(
-                                name=str(ctx.author.display_name), id=ctx.author.id
-                            ),
-                        )
-                        await asyncio.sleep(0.5)
-                        unban_count += 1
+            if pred.result is not True:
+                await ctx.send(_("Alright, I'm not unbanning anyone."))
+                return
 
+        job: UnbanJob = UnbanJob(
+            ctx.guild.id,
+            ban_reason,
+            ctx.author.id,
+            str(ctx.author.display_name),
+            channel_id=ctx.channel.id,
+        )
+        # Another mass unban may have been started while waiting for the confirmation.
+        if not await self.engine.start(job):
+            await ctx.send(
+                _(
+                    "A mass unban is already running in this server, check on it with "
+                    "`{prefix}massunbanjob status` or stop it with `{prefix}massunbanjob cancel`."
+                ).format(prefix=ctx.clean_prefix)
+            )
+            return
+        message: discord.Message = await ctx.send(_("Starting the mass unban..."))
+        job.message_id = message.id
         self.spam[ctx.guild.id][ctx.author.id].stamp()
-        await ctx.send(_("Done. Unbanned {unban_count} users.").format(unban_count=unban_count))
+
+    @commands.guild_only()
+    @commands.guildowner()
+    @commands.group(name="massunbanjob")
+    async def _mass_unban_job(self, _ctx: commands.GuildContext):
+        """
+        Preview, check on and cancel mass unbans.
+        """
+
+    @_mass_unban_job.command(name="preview", aliases=["dryrun"])
+    async def _mass_unban_preview(
+        self, ctx: commands.GuildContext, *, ban_reason: Optional[str] = None
+    ):
+        """
+        Count the bans `[p]massunban` would lift with the same arguments, without unbanning anyone.
+        """
+        try:
+            matcher: UnbanMatcher = UnbanMatcher.parse(ban_reason)
+        except commands.BadArgument as e:
+            await ctx.send(str(e))
+            return
+        try:
+            async with ctx.typing():
+                scanned, matched, sample = await preview(ctx.guild, matcher)
+        except discord.Forbidden:
+            msg = _("I need the `Ban Members` permission to fetch the ban list for the guild.")
+            await ctx.send(msg)
+            return
+        except discord.HTTPException:
+            await ctx.send("Something went wrong getting the ban list.")
+            log.exception("Something went wrong while fetching the ban list!", exc_info=True)
+            return
+        if scanned == 0:
+            await ctx.send(_("No users are banned from this server."))
+            return
+        msg = _("{matched} of {scanned} banned users would be unbanned.").format(
+            matched=humanize_number(matched), scanned=humanize_number(scanned)
+        )
+        if sample:
+            msg += "\n" + _("For example: {users}").format(
+                users=humanize_list([f"`{user}` ({user.id})" for user in sample])
+            )
+        await ctx.send(msg)
+
+    @_mass_unban_job.command(name="status")
+    async def _mass_unban_status(self, ctx: commands.GuildContext):
+        """
+        Show the progress of the mass unban running in this server.
+        """
+        job: Optional[UnbanJob] = self.engine.jobs.get(ctx.guild.id)
+        if job is None:
+            await ctx.send(_("There is no mass unban running in this server."))
+            return
+        await ctx.send(job.progress())
+
+    @_mass_unban_job.command(name="cancel", aliases=["stop"])
+    async def _mass_unban_cancel(self, ctx: commands.GuildContext):
+        """
+        Cancel the mass unban running in this server.
+        """
+        if not self.engine.cancel(ctx.guild.id):
+            await ctx.send(_("There is no mass unban running in this server."))
+            return
+        await ctx.send(_("Cancelling the mass unban, the users already unbanned stay unbanned."))
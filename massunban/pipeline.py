@@ -0,0 +1,389 @@
+"""
+MIT License
+
+Copyright (c) 2021-2023 aikaterna
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Final,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+import discord
+from redbot.core import commands
+from redbot.core.bot import Red
+from redbot.core.config import Config
+from redbot.core.i18n import Translator
+from redbot.core.utils.chat_formatting import humanize_number
+
+log: logging.Logger = logging.getLogger("red.seina.massunban.pipeline")
+
+_ = Translator("MassUnban", __file__)
+
+BAN_PAGE_SIZE: Final[int] = 1000
+INITIAL_UNBAN_WORKERS: Final[int] = 2
+MAXIMUM_UNBAN_WORKERS: Final[int] = 8
+# An unban slower than this has waited on a rate limit inside discord.py.
+SLOW_UNBAN_THRESHOLD: Final[float] = 1.5
+PROGRESS_INTERVAL: Final[float] = 5.0
+PREVIEW_SAMPLE_SIZE: Final[int] = 10
+
+MODERATOR_ID_RE: Pattern[str] = re.compile(r"(?:<@!?)?([0-9]{15,21})>?$")
+
+
+class UnbanMatcher(NamedTuple):
+    """A ban reason filter, parsed once before any ban is fetched."""
+
+    kind: Literal["all", "text", "regex", "moderator"]
+    query: Optional[str]
+    pattern: Optional[Pattern[str]]
+
+    @classmethod
+    def parse(cls, query: Optional[str]) -> "UnbanMatcher":
+        if not query:
+            return cls("all", None, None)
+        prefix, _sep, value = query.partition(":")
+        prefix, value = prefix.strip().lower(), value.strip()
+        if _sep and prefix in ("regex", "re") and value:
+            try:
+                return cls("regex", query, re.compile(value, flags=re.I))
+            except re.error as e:
+                raise commands.BadArgument(
+                    _("`{pattern}` is not a valid regex: {error}").format(pattern=value, error=e)
+                )
+        if _sep and prefix in ("mod", "moderator") and value:
+            # Anything but an ID after the prefix is part of a plain reason, e.g. "mod: raid".
+            if (match := MODERATOR_ID_RE.match(value)) is not None:
+                # Red writes "action requested by <name> (id <id>). reason: ..." as the reason.
+                return cls("moderator", query, re.compile(rf"\(id {match.group(1)}\)"))
+        return cls("text", query.casefold(), None)
+
+    def __call__(self, reason: Optional[str]) -> bool:
+        if self.kind == "all":
+            return True
+        if not reason:
+            return False
+        if self.pattern is not None:
+            return self.pattern.search(reason) is not None
+        return self.query in reason.casefold()  # type: ignore
+
+
+class UnbanJob:
+    """A mass unban run, persisted in the guild config after every page of bans."""
+
+    __slots__ = (
+        "guild_id",
+        "query",
+        "author_id",
+        "author_name",
+        "channel_id",
+        "message_id",
+        "cursor",
+        "scanned",
+        "matched",
+        "unbanned",
+        "failed",
+        "cancelled",
+    )
+
+    def __init__(
+        self,
+        guild_id: int,
+        query: Optional[str],
+        author_id: int,
+        author_name: str,
+        *,
+        channel_id: Optional[int] = None,
+        message_id: Optional[int] = None,
+        cursor: Optional[int] = None,
+        scanned: int = 0,
+        matched: int = 0,
+        unbanned: int = 0,
+        failed: int = 0,
+    ) -> None:
+        self.guild_id: int = guild_id
+        self.query: Optional[str] = query
+        self.author_id: int = author_id
+        self.author_name: str = author_name
+        self.channel_id: Optional[int] = channel_id
+        self.message_id: Optional[int] = message_id
+        self.cursor: Optional[int] = cursor
+        self.scanned: int = scanned
+        self.matched: int = matched
+        self.unbanned: int = unbanned
+        self.failed: int = failed
+        self.cancelled: bool = False
+
+    @classmethod
+    def from_config(cls, guild_id: int, data: Dict[str, Any]) -> "UnbanJob":
+        return cls(
+            guild_id,
+            data["query"],
+            data["author_id"],
+            data["author_name"],
+            channel_id=data["channel"],
+            message_id=data["message"],
+            cursor=data["cursor"],
+            scanned=data["scanned"],
+            matched=data["matched"],
+            unbanned=data["unbanned"],
+            failed=data["failed"],
+        )
+
+    def to_config(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "author_id": self.author_id,
+            "author_name": self.author_name,
+            "channel": self.channel_id,
+            "message": self.message_id,
+            "cursor": self.cursor,
+            "scanned": self.scanned,
+            "matched": self.matched,
+            "unbanned": self.unbanned,
+            "failed": self.failed,
+        }
+
+    @property
+    def reason(self) -> str:
+        return _("Mass Unban requested by {name} ({id})").format(
+            name=self.author_name, id=self.author_id
+        )
+
+    def progress(self) -> str:
+        return _(
+            "Unbanning... scanned {scanned} bans, {matched} matched, "
+            "{unbanned} unbanned, {failed} failed."
+        ).format(
+            scanned=humanize_number(self.scanned),
+            matched=humanize_number(self.matched),
+            unbanned=humanize_number(self.unbanned),
+            failed=humanize_number(self.failed),
+        )
+
+
+async def ban_pages(
+    guild: discord.Guild, after: Optional[int] = None
+) -> AsyncIterator[List[discord.BanEntry]]:
+    """Yield the ban list in ascending user id order, one page at a time."""
+    while True:
+        page: List[discord.BanEntry] = [
+            entry
+            async for entry in guild.bans(
+                limit=BAN_PAGE_SIZE, after=discord.Object(id=after) if after else None
+            )
+        ]
+        if not page:
+            return
+        yield page
+        if len(page) < BAN_PAGE_SIZE:
+            return
+        after = page[-1].user.id
+
+
+async def preview(
+    guild: discord.Guild, matcher: UnbanMatcher
+) -> Tuple[int, int, List[discord.User]]:
+    scanned: int = 0
+    matched: int = 0
+    sample: List[discord.User] = []
+    async for page in ban_pages(guild):
+        scanned += len(page)
+        for entry in page:
+            if matcher(entry.reason):
+                matched += 1
+                if len(sample) < PREVIEW_SAMPLE_SIZE:
+                    sample.append(entry.user)
+    return scanned, matched, sample
+
+
+class MassUnbanEngine:
+    """
+    Runs at most one mass unban per guild.
+
+    Bans are streamed page by page and the matching users are unbanned in concurrent batches.
+    The batch width grows by one after every fast batch and halves as soon as an unban had to
+    wait on a rate limit. The cursor only moves once a page is done, so a job resumed after a
+    reload refetches what is left of that page and the users already unbanned are gone from it.
+    """
+
+    def __init__(self, bot: Red, config: Config) -> None:
+        self.bot: Red = bot
+        self.config: Config = config
+        self.jobs: Dict[int, UnbanJob] = {}
+        self._tasks: Dict[int, asyncio.Task[None]] = {}
+
+    async def resume(self) -> None:
+        await self.bot.wait_until_red_ready()
+        for guild_id, data in (await self.config.all_guilds()).items():
+            if data.get("job"):
+                if guild_id in self.jobs:
+                    continue
+                log.debug("Resuming the mass unban of guild %s.", guild_id)
+                self._spawn(UnbanJob.from_config(guild_id, data["job"]))
+
+    async def start(self, job: UnbanJob) -> bool:
+        """Start the job, or return False if the guild already has one."""
+        # Claimed before the first await, so concurrent invocations can't both get through.
+        if job.guild_id in self.jobs:
+            return False
+        self.jobs[job.guild_id] = job
+        try:
+            await self.config.guild_from_id(job.guild_id).job.set(job.to_config())
+        except Exception:
+            self.jobs.pop(job.guild_id, None)
+            raise
+        self._spawn(job)
+        return True
+
+    def cancel(self, guild_id: int) -> bool:
+        job: Optional[UnbanJob] = self.jobs.get(guild_id)
+        if job is None:
+            return False
+        job.cancelled = True
+        return True
+
+    async def stop(self) -> None:
+        # Jobs stay persisted as of their last finished page and resume on the next load.
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        self.jobs.clear()
+
+    def _spawn(self, job: UnbanJob) -> None:
+        self.jobs[job.guild_id] = job
+        self._tasks[job.guild_id] = asyncio.create_task(
+            self._run(job), name=f"massunban:{job.guild_id}"
+        )
+
+    async def _report(self, job: UnbanJob, content: str, *, final: bool = False) -> None:
+        guild: Optional[discord.Guild] = self.bot.get_guild(job.guild_id)
+        channel = guild.get_channel_or_thread(job.channel_id) if guild and job.channel_id else None
+        if not isinstance(channel, discord.abc.Messageable):
+            return
+        try:
+            if job.message_id is not None and not final:
+                await channel.get_partial_message(job.message_id).edit(content=content)
+                return
+            message: discord.Message = await channel.send(content)
+        except discord.HTTPException:
+            return
+        if not final:
+            job.message_id = message.id
+
+    @staticmethod
+    async def _unban(
+        guild: discord.Guild, user: discord.User, reason: str
+    ) -> Tuple[Optional[bool], float]:
+        started: float = time.monotonic()
+        try:
+            await guild.unban(user, reason=reason)
+        except discord.NotFound:
+            return None, time.monotonic() - started
+        except discord.Forbidden:
+            raise
+        except discord.HTTPException:
+            log.exception("Failed to unban %s in %s.", user, guild.id)
+            return False, time.monotonic() - started
+        return True, time.monotonic() - started
+
+    async def _run(self, job: UnbanJob) -> None:
+        try:
+            await self._process(job)
+        except Exception:
+            # Cancellation on unload is not caught here, so those jobs stay saved and resume.
+            log.exception("The mass unban of guild %s failed.", job.guild_id)
+            await self.config.guild_from_id(job.guild_id).job.clear()
+        finally:
+            self.jobs.pop(job.guild_id, None)
+            self._tasks.pop(job.guild_id, None)
+
+    async def _process(self, job: UnbanJob) -> None:
+        guild: Optional[discord.Guild] = self.bot.get_guild(job.guild_id)
+        if guild is None:
+            await self.config.guild_from_id(job.guild_id).job.clear()
+            return
+        matcher: UnbanMatcher = UnbanMatcher.parse(job.query)
+        reason: str = job.reason
+        width: int = INITIAL_UNBAN_WORKERS
+        last_progress: float = time.monotonic()
+        error: Optional[str] = None
+        try:
+            async for page in ban_pages(guild, job.cursor):
+                targets: List[discord.User] = [
+                    entry.user for entry in page if matcher(entry.reason)
+                ]
+                job.scanned += len(page)
+                job.matched += len(targets)
+                index: int = 0
+                while index < len(targets) and not job.cancelled:
+                    batch: List[discord.User] = targets[index : index + width]
+                    index += len(batch)
+                    results: List[Tuple[Optional[bool], float]] = await asyncio.gather(
+                        *(self._unban(guild, user, reason) for user in batch)
+                    )
+                    job.unbanned += sum(1 for done, _elapsed in results if done)
+                    job.failed += sum(1 for done, _elapsed in results if done is False)
+                    if max(elapsed for _done, elapsed in results) >= SLOW_UNBAN_THRESHOLD:
+                        width = max(1, width // 2)
+                    else:
+                        width = min(MAXIMUM_UNBAN_WORKERS, width + 1)
+                    if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                        last_progress = time.monotonic()
+                        await self._report(job, job.progress())
+                if job.cancelled:
+                    break
+                job.cursor = page[-1].user.id
+                await self.config.guild_from_id(job.guild_id).job.set(job.to_config())
+        except discord.Forbidden:
+            error = _("I need the `Ban Members` permission to unban users in this server.")
+        except discord.HTTPException:
+            log.exception("Something went wrong while fetching the ban list!", exc_info=True)
+            error = _("Something went wrong getting the ban list.")
+
+        await self.config.guild_from_id(job.guild_id).job.clear()
+        await self._report(job, job.progress())
+        if error is not None:
+            result: str = error + "\n"
+        elif job.cancelled:
+            result = _("Mass unban cancelled. ")
+        else:
+            result = ""
+        result += _("Done. Unbanned {unban_count} users.").format(
+            unban_count=humanize_number(job.unbanned)
+        )
+        await self._report(job, result, final=True)
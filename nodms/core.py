@@ -29,7 +29,7 @@ SOFTWARE.
 import asyncio
 import contextlib
 import logging
-from typing import Any, Dict, Final, List, Literal, Optional, Union, cast
+from typing import Any, Dict, Final, FrozenSet, List, Literal, Optional, Tuple, Union, cast
 
 import diot
 import discord
@@ -53,6 +53,8 @@ from ._tagscript import (
 
 log: logging.Logger = logging.getLogger("red.seina.nodms.core")
 
+RESPONSE_CACHE_SIZE: Final[int] = 1024
+
 
 class NoDMs(commands.Cog):
     """
@@ -97,6 +99,12 @@ class NoDMs(commands.Cog):
         self.config.register_global(**_default)
 
         self.cache: diot.Diot = diot.Diot(**_default)
+        self.user_whitelist: FrozenSet[int] = frozenset()
+        self.user_blacklist: FrozenSet[int] = frozenset()
+        self.command_whitelist: FrozenSet[str] = frozenset()
+        self.command_blacklist: FrozenSet[str] = frozenset()
+        # user id -> (type, command, color) -> rendered response kwargs.
+        self._responses: Dict[int, Dict[Tuple[str, Optional[str], str], Dict[str, Any]]] = {}
         self._cache_ready: asyncio.Event = asyncio.Event()
         self._task: asyncio.Task[None] = asyncio.create_task(self.initialize())
 
@@ -205,90 +213,86 @@ class NoDMs(commands.Cog):
                 ),
             )
         )
+        self._refresh_lists()
         self._cache_ready.set()
 
+    def _refresh_lists(self) -> None:
+        self.user_whitelist = frozenset(self.cache.users.whitelist)
+        self.user_blacklist = frozenset(self.cache.users.blacklist)
+        self.command_whitelist = frozenset(self.cache.commands.whitelist)
+        self.command_blacklist = frozenset(self.cache.commands.blacklist)
+
+    def _is_user_restricted(self, user_id: int) -> bool:
+        if self.user_whitelist:
+            return user_id not in self.user_whitelist
+        if self.user_blacklist:
+            return user_id in self.user_blacklist
+        return True
+
     async def wait_until_cache_ready(self) -> None:
         await self._cache_ready.wait()
 
-    # TODO: shorten this
+    async def _render_response(
+        self,
+        ctx: commands.Context,
+        type: Literal["message", "command"],
+        tagscript: str,
+        color: str,
+    ) -> Dict[str, Any]:
+        seed: Dict[str, tse.Adapter] = {
+            "user": UserAdapter(ctx.author),
+            "author": UserAdapter(ctx.author),
+            "dm": DMChannelAdapter(ctx.channel),
+            "channel": DMChannelAdapter(ctx.channel),
+            "bot": BotAdapter(self.bot),
+            "{}".format(cast(discord.ClientUser, self.bot.user).name): BotAdapter(self.bot),
+            "color": tse.StringAdapter(color),
+        }
+        if type.lower() == "command" and (command := ctx.command):
+            seed["command"] = CommandAdapter(command)
+        return await process_tagscript(tagscript, seed)
+
     async def _send_response(
         self, ctx: commands.Context, type: Literal["message", "command"]
     ) -> None:
-        kwargs: Dict[str, Any] = await process_tagscript(
-            (
-                self.cache.message.message
-                if type.lower() == "message"
-                else self.cache.message.command
-            ),
-            {
-                "user": UserAdapter(ctx.author),
-                "author": UserAdapter(ctx.author),
-                "dm": DMChannelAdapter(ctx.channel),
-                "channel": DMChannelAdapter(ctx.channel),
-                "bot": BotAdapter(self.bot),
-                "{}".format(cast(discord.ClientUser, self.bot.user).name): BotAdapter(self.bot),
-                "color": tse.StringAdapter(str(await ctx.embed_color())),
-            },
+        if type.lower() not in ("message", "command"):
+            raise ValueError("Invalid type provided. Available types: 'message' or 'command'.")
+        color: str = str(await ctx.embed_color())
+        key: Tuple[str, Optional[str], str] = (
+            type.lower(),
+            ctx.command.qualified_name if ctx.command else None,
+            color,
         )
-        if type.lower() == "command" and (command := ctx.command):
-            kwargs: Dict[str, Any] = await process_tagscript(
+        if ctx.author.id not in self._responses and len(self._responses) >= RESPONSE_CACHE_SIZE:
+            self._responses.pop(next(iter(self._responses)))
+        responses: Dict[Tuple[str, Optional[str], str], Dict[str, Any]] = (
+            self._responses.setdefault(ctx.author.id, {})
+        )
+        if (cached := responses.get(key)) is None:
+            cached = await self._render_response(
+                ctx,
+                type,
                 (
                     self.cache.message.message
                     if type.lower() == "message"
                     else self.cache.message.command
                 ),
-                {
-                    "user": UserAdapter(ctx.author),
-                    "author": UserAdapter(ctx.author),
-                    "dm": DMChannelAdapter(ctx.channel),
-                    "channel": DMChannelAdapter(ctx.channel),
-                    "bot": BotAdapter(self.bot),
-                    "{}".format(cast(discord.ClientUser, self.bot.user).name): BotAdapter(
-                        self.bot
-                    ),
-                    "color": tse.StringAdapter(str(await ctx.embed_color())),
-                    "command": CommandAdapter(command),
-                },
-            )
-        if not kwargs:
-            if type.lower() == "message":
-                await cast(Group, self.config.message).message.clear()
-                self.cache.message.update(message=message)
-            elif type.lower() == "command":
-                await cast(Group, self.config.message).command.clear()
-                self.cache.message.update(command=command_message)
-            else:
-                raise ValueError("Invalid type provided. Available types: 'message' or 'command'.")
-            kwargs = await process_tagscript(
-                message if type.lower() == "message" else command_message,
-                {
-                    "user": UserAdapter(ctx.author),
-                    "author": UserAdapter(ctx.author),
-                    "dm": DMChannelAdapter(ctx.channel),
-                    "channel": DMChannelAdapter(ctx.channel),
-                    "bot": BotAdapter(self.bot),
-                    "{}".format(cast(discord.ClientUser, self.bot.user).name): BotAdapter(
-                        self.bot
-                    ),
-                    "color": tse.StringAdapter(str(await ctx.embed_color())),
-                },
+                color,
             )
-            if type.lower() == "command" and (command := ctx.command):
-                kwargs = await process_tagscript(
-                    message if type.lower() == "message" else command_message,
-                    {
-                        "user": UserAdapter(ctx.author),
-                        "author": UserAdapter(ctx.author),
-                        "dm": DMChannelAdapter(ctx.channel),
-                        "channel": DMChannelAdapter(ctx.channel),
-                        "bot": BotAdapter(self.bot),
-                        "{}".format(cast(discord.ClientUser, self.bot.user).name): BotAdapter(
-                            self.bot
-                        ),
-                        "color": tse.StringAdapter(str(await ctx.embed_color())),
-                        "command": CommandAdapter(command),
-                    },
+            if not cached:
+                if type.lower() == "message":
+                    await cast(Group, self.config.message).message.clear()
+                    self.cache.message.update(message=message)
+                else:
+                    await cast(Group, self.config.message).command.clear()
+                    self.cache.message.update(command=command_message)
+                self._responses.clear()
+                responses = self._responses.setdefault(ctx.author.id, {})
+                cached = await self._render_response(
+                    ctx, type, message if type.lower() == "message" else command_message, color
                 )
+            responses[key] = cached
+        kwargs: Dict[str, Any] = dict(cached)
         kwargs["reference"] = ctx.message.to_reference(fail_if_not_exists=False)
         kwargs["allowed_mentions"] = discord.AllowedMentions(replied_user=False)
         try:
@@ -305,27 +309,17 @@ class NoDMs(commands.Cog):
             and not await cast(Red, ctx.bot).is_owner(ctx.author)
             and not isinstance(ctx.command, commands.commands._AlwaysAvailableMixin)
         ):
-            if user_wl := self.cache.users.whitelist:
-                if ctx.author.id not in user_wl:
-                    if self.cache.message.toggle:
-                        await self._send_response(ctx, "command")
-                    raise commands.CheckFailure()
-            elif user_bl := self.cache.users.blacklist:
-                if ctx.author.id in user_bl:
-                    if self.cache.message.toggle:
-                        await self._send_response(ctx, "command")
-                    raise commands.CheckFailure()
-            else:
+            if self._is_user_restricted(ctx.author.id):
                 if self.cache.message.toggle:
                     await self._send_response(ctx, "command")
                 raise commands.CheckFailure()
 
-            if command_wl := self.cache.commands.whitelist:
+            if command_wl := self.command_whitelist:
                 if ctx.command.qualified_name not in command_wl:
                     if self.cache.message.toggle:
                         await self._send_response(ctx, "command")
                     raise commands.CheckFailure()
-            elif command_bl := self.cache.commands.blacklist:
+            elif command_bl := self.command_blacklist:
                 if ctx.command.qualified_name in command_bl:
                     if self.cache.message.toggle:
                         await self._send_response(ctx, "command")
@@ -337,35 +331,29 @@ class NoDMs(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_without_command(self, message: discord.Message):
+        # Cheapest checks first, a context is only built for messages that will be blocked.
+        if not isinstance(message.channel, discord.DMChannel):
+            return
         await self.wait_until_cache_ready()
+        if not self.cache.toggle or self.cache.type.lower() not in ["all", "messages"]:
+            return
+        if message.author.id == cast(discord.ClientUser, self.bot.user).id:
+            return
+        if not self._is_user_restricted(message.author.id):
+            return
+        if await self.bot.is_owner(message.author):
+            return
         ctx: commands.Context = cast(commands.Context, await self.bot.get_context(message))
-        if message.author.id == ctx.me.id:
+        if ctx.command:
             return
-        if (
-            self.cache.toggle
-            and self.cache.type.lower() in ["all", "messages"]
-            and isinstance(message.channel, discord.DMChannel)
-            and not await cast(Red, ctx.bot).is_owner(message.author)
-        ):
-            if ctx.command:
-                return
-            elif whitelist := self.cache.users.whitelist:
-                if message.author.id not in whitelist:
-                    with contextlib.suppress(discord.HTTPException):
-                        await message.delete()
-                    if self.cache.message.toggle:
-                        await self._send_response(ctx, "message")
-            elif blacklist := self.cache.users.blacklist:
-                if message.author.id in blacklist:
-                    with contextlib.suppress(discord.HTTPException):
-                        await message.delete()
-                    if self.cache.message.toggle:
-                        await self._send_response(ctx, "message")
-            else:
-                with contextlib.suppress(discord.HTTPException):
-                    await message.delete()
-                if self.cache.message.toggle:
-                    await self._send_response(ctx, "message")
+        with contextlib.suppress(discord.HTTPException):
+            await message.delete()
+        if self.cache.message.toggle:
+            await self._send_response(ctx, "message")
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        self._responses.pop(after.id, None)
 
     @commands.is_owner()
     @commands.group(name="nodms")
@@ -484,6 +472,7 @@ class NoDMs(commands.Cog):
                 )
             await self.config.message.clear()
             self.cache.message.update(**dict(message=message, command=command_message))
+            self._responses.clear()
             await ctx.send(
                 (
                     "The nodms messages were reverted to default.\n\n"
@@ -498,6 +487,7 @@ class NoDMs(commands.Cog):
             if argument:
                 await cast(Group, self.config.message).message.set(argument)
                 self.cache.message.update(**dict(message=argument))
+                self._responses.clear()
                 await ctx.send(
                     "Successfully changed the message trigger.\n{}".format(
                         box(str(argument), lang="json")
@@ -506,6 +496,7 @@ class NoDMs(commands.Cog):
             else:
                 await cast(Group, self.config.message).message.clear()
                 self.cache.message.update(**dict(message=message))
+                self._responses.clear()
                 await ctx.send(
                     "The nodms message trigger was reverted to default.\n{}".format(
                         box(message, lang="json")
@@ -515,6 +506,7 @@ class NoDMs(commands.Cog):
             if argument:
                 await cast(Group, self.config.message).command.set(argument)
                 self.cache.message.update(**dict(command=argument))
+                self._responses.clear()
                 await ctx.send(
                     "Successfully changed the command trigger.\n{}".format(
                         box(str(argument), lang="json")
@@ -523,6 +515,7 @@ class NoDMs(commands.Cog):
             else:
                 await cast(Group, self.config.message).command.clear()
                 self.cache.message.update(**dict(command=command_message))
+                self._responses.clear()
                 await ctx.send(
                     "The nodms command trigger was reverted to default.\n{}".format(
                         box(message, lang="json")
@@ -561,6 +554,7 @@ class NoDMs(commands.Cog):
                     if user.id in wl:
                         wl.remove(user.id)
             self.cache.users.update(**dict(whitelist=wl))
+            self._refresh_lists()
 
         await ctx.send(
             "Successfully {} {} roles to the whitelist.".format(
@@ -593,6 +587,7 @@ class NoDMs(commands.Cog):
                     if command.qualified_name in wl:
                         wl.remove(command.qualified_name)
             self.cache.commands.update(**dict(whitelist=wl))
+            self._refresh_lists()
 
         await ctx.send(
             "Successfully {} {} commands to the whitelist.".format(
@@ -673,6 +668,7 @@ class NoDMs(commands.Cog):
                     if user.id in bl:
                         bl.remove(user.id)
             self.cache.users.update(**dict(blacklist=bl))
+            self._refresh_lists()
 
         await ctx.send(
             "Successfully {} {} roles to the blacklist.".format(
@@ -705,6 +701,7 @@ class NoDMs(commands.Cog):
                     if command.qualified_name in bl:
                         bl.remove(command.qualified_name)
             self.cache.commands.update(**dict(blacklist=bl))
+            self._refresh_lists()
 
         await ctx.send(
             "Successfully {} {} commands to the blacklist.".format(
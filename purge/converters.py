@@ -4,7 +4,9 @@ Mozilla Public License Version 2.0
 Copyright (c) 2023-present japandotorg
 """
 
-from typing import Annotated, Literal, Optional
+import datetime
+import re
+from typing import Annotated, Literal, Optional, Pattern
 
 import discord
 from redbot.core import commands
@@ -36,6 +38,14 @@ class RawMessageIdsConverter(commands.Converter[int]):
         )
 
 
+class RegexConverter(commands.Converter[Pattern[str]]):
+    async def convert(self, ctx: commands.GuildContext, argument: str) -> Pattern[str]:
+        try:
+            return re.compile(argument)
+        except re.error as e:
+            raise commands.BadArgument(f"`{argument}` is not a valid regex pattern: {e}")
+
+
 # https://github.com/Rapptz/RoboDanny/blob/rewrite/cogs/mod.py#L347
 class PurgeFlags(commands.FlagConverter):
     user: Optional[discord.User] = commands.flag(
@@ -68,6 +78,20 @@ class PurgeFlags(commands.FlagConverter):
     reactions: bool = commands.flag(
         description="Remove messages that have reactions", default=False
     )
+    regex: Optional[Pattern[str]] = commands.flag(
+        description="Remove messages that match this regex pattern",
+        converter=RegexConverter,
+        default=None,
+    )
+    links: bool = commands.flag(description="Remove messages that have links", default=False)
+    emojis: Optional[int] = commands.flag(
+        description="Remove messages that have at least this many custom emoji", default=None
+    )
+    age: Optional[datetime.timedelta] = commands.flag(
+        description="Remove messages that are newer than this, e.g. `30m` or `2h`",
+        converter=commands.TimedeltaConverter,
+        default=None,
+    )
     require: Literal["any", "all"] = commands.flag(
         description='Whether any or all of the flags should be met before deleting messages. Defaults to "all"',
         default="all",
@@ -5,6 +5,7 @@ Copyright (c) 2023-present japandotorg
 """
 
 import asyncio
+import datetime
 import logging
 import re
 from typing import Annotated, Any, Callable, Coroutine, Dict, Final, List, Optional, Union
@@ -21,8 +22,10 @@ from .converters import PurgeFlags, RawMessageIdsConverter, Snowflake
 from .utils import (
     CUSTOM_EMOJI_RE,
     LINKS_RE,
+    MAXIMUM_PURGE_LIMIT,
     _cleanup,
     _create_case,
+    compile_purge_filter,
     get_message_from_reference,
     get_messages_for_deletion,
     has_hybrid_permissions,
@@ -98,7 +101,7 @@ class Purge(commands.Cog):
     async def _purge(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -129,7 +132,7 @@ class Purge(commands.Cog):
     async def _embeds(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -154,7 +157,7 @@ class Purge(commands.Cog):
         self,
         ctx: commands.GuildContext,
         pattern: Optional[str],
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -172,12 +175,19 @@ class Purge(commands.Cog):
         - `[p]purge regex (?i)(h(?:appy) 10`
         """
 
-        def check(message: discord.Message) -> bool:
-            ret = (
-                bool(re.match(rf"{pattern}", message.content))
-                and message.created_at > arrow.utcnow().shift(days=-14).datetime
+        try:
+            compiled: re.Pattern[str] = re.compile(rf"{pattern}")
+        except re.error as e:
+            await ctx.send(
+                f"Invalid regex pattern: {e}",
+                reference=ctx.message.to_reference(fail_if_not_exists=False),
+                allowed_mentions=discord.AllowedMentions(replied_user=False),
             )
-            return ret
+            return
+        two_weeks_ago: datetime.datetime = arrow.utcnow().shift(days=-14).datetime
+
+        def check(message: discord.Message) -> bool:
+            return bool(compiled.match(message.content)) and message.created_at > two_weeks_ago
 
         await _cleanup(ctx, number, check, channel=channel)
 
@@ -187,7 +197,7 @@ class Purge(commands.Cog):
     async def _files(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -211,7 +221,7 @@ class Purge(commands.Cog):
     async def _images(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -236,7 +246,7 @@ class Purge(commands.Cog):
         self,
         ctx: commands.GuildContext,
         member: discord.Member,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -294,7 +304,7 @@ class Purge(commands.Cog):
     async def _bot(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000] = 100,
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT] = 100,
         prefix: Optional[str] = None,
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
@@ -327,7 +337,7 @@ class Purge(commands.Cog):
     async def _emoji(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -396,7 +406,7 @@ class Purge(commands.Cog):
     async def _self(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -420,7 +430,7 @@ class Purge(commands.Cog):
     async def _mine(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -444,7 +454,7 @@ class Purge(commands.Cog):
     async def _links(
         self,
         ctx: commands.GuildContext,
-        number: commands.Range[int, 1, 2000],
+        number: commands.Range[int, 1, MAXIMUM_PURGE_LIMIT],
         channel: Optional[
             Union[discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
         ] = None,
@@ -732,7 +742,7 @@ class Purge(commands.Cog):
     async def _custom(
         self,
         ctx: commands.GuildContext,
-        number: Optional[commands.Range[int, 1, 2000]] = None,  # type: ignore
+        number: Optional[commands.Range[int, 1, MAXIMUM_PURGE_LIMIT]] = None,  # type: ignore
         *,
         flags: PurgeFlags,
     ):
@@ -753,49 +763,17 @@ class Purge(commands.Cog):
         `files: yes` Remove messages that have attachments.
         `emoji: yes` Remove messages that have custom emoji.
         `reactions: yes` Remove messages that have reactions.
+        `regex:` Remove messages that match a regex pattern.
+        `links: yes` Remove messages that have links.
+        `emojis:` Remove messages that have at least this many custom emoji.
+        `age:` Remove messages newer than this, e.g. `30m` or `2h`.
         `require: any or all` Whether any or all flags should be met before deleting messages.
-        """
-        predicates: List[Callable[[discord.Message], Any]] = []
-
-        if flags.bot:
-            if flags.webhooks:
-                predicates.append(lambda m: m.author.bot)
-            else:
-                predicates.append(
-                    lambda m: (m.webhook_id is None or m.interaction is not None) and m.author.bot
-                )
-        elif flags.webhooks:
-            predicates.append(lambda m: m.webhook_id is not None)
-
-        if flags.embeds:
-            predicates.append(lambda m: len(m.embeds))
-
-        if flags.files:
-            predicates.append(lambda m: len(m.attachments))
-
-        if flags.reactions:
-            predicates.append(lambda m: len(m.reactions))
 
-        if flags.emoji:
-            predicates.append(lambda m: CUSTOM_EMOJI_RE.search(m.content))
-
-        if flags.user:
-            predicates.append(lambda m: m.author == flags.user)
-
-        if flags.contains:
-            predicates.append(lambda m: flags.contains in m.content)  # type: ignore
-
-        if flags.prefix:
-            predicates.append(lambda m: m.content.startswith(flags.prefix))  # type: ignore
-
-        if flags.suffix:
-            predicates.append(lambda m: m.content.endswith(flags.suffix))  # type: ignore
-
-        op = all if flags.require == "all" else any
-
-        def predicate(m: discord.Message) -> bool:
-            r = op(p(m) for p in predicates)
-            return r
+        All the flags are combined into a single filter, so the history is only walked once.
+        """
+        predicate: Callable[[discord.Message], bool] = compile_purge_filter(
+            flags, now=ctx.message.created_at
+        )
 
         if flags.after:
             if number is None:
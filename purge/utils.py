@@ -4,16 +4,33 @@ Mozilla Public License Version 2.0
 Copyright (c) 2023-present japandotorg
 """
 
+import asyncio
 import datetime
 import re
+import time
 from collections import Counter
-from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import discord
 from redbot.core import commands, modlog
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_number
 
+if TYPE_CHECKING:
+    from .converters import PurgeFlags
+
 T = TypeVar("T")
 
 __all__: Tuple[str, ...] = (
@@ -25,8 +42,16 @@ __all__: Tuple[str, ...] = (
     "get_messages_for_deletion",
     "CUSTOM_EMOJI_RE",
     "LINKS_RE",
+    "MAXIMUM_PURGE_LIMIT",
+    "compile_purge_filter",
 )
 
+MAXIMUM_PURGE_LIMIT: Final[int] = 10_000
+HISTORY_PAGE_SIZE: Final[int] = 100
+BULK_DELETE_LIMIT: Final[int] = 100
+MAXIMUM_PURGE_RETRIES: Final[int] = 3
+PROGRESS_INTERVAL: Final[float] = 5.0
+
 CUSTOM_EMOJI_RE: Pattern[str] = re.compile(r"<a?:[a-zA-Z0-9\_]+:([0-9]+)>")
 LINKS_RE: Pattern[str] = re.compile(
     r"((http|https)\:\/\/)?[a-zA-Z0-9\.\/\?\:@\-_=#]+\.([a-zA-Z]){2,6}([a-zA-Z0-9\.\&\/\?\:@\-_=#])*",
@@ -34,6 +59,111 @@ LINKS_RE: Pattern[str] = re.compile(
 )
 
 
+def _count_at_least(pattern: Pattern[str], content: str, minimum: int) -> bool:
+    count: int = 0
+    for _ in pattern.finditer(content):
+        count += 1
+        if count >= minimum:
+            return True
+    return False
+
+
+def compile_purge_filter(
+    flags: "PurgeFlags", *, now: datetime.datetime
+) -> Callable[[discord.Message], bool]:
+    """
+    Build a single predicate out of every criteria given in the flags.
+
+    Checks are ordered from cheapest to most expensive, attribute checks first, then
+    substring checks and finally regex scans, so `require: all` rejects and `require: any`
+    accepts a message as early as possible.
+    """
+    # (cost, check) pairs, lower cost runs first.
+    checks: List[Tuple[int, Callable[[discord.Message], Any]]] = []
+
+    if flags.age:
+        newest: int = discord.utils.time_snowflake(now - flags.age)
+        checks.append((0, lambda m: m.id >= newest))
+
+    if flags.user:
+        user_id: int = flags.user.id
+        checks.append((0, lambda m: m.author.id == user_id))
+
+    if flags.bot:
+        if flags.webhooks:
+            checks.append((0, lambda m: m.author.bot))
+        else:
+            checks.append(
+                (0, lambda m: (m.webhook_id is None or m.interaction is not None) and m.author.bot)
+            )
+    elif flags.webhooks:
+        checks.append((0, lambda m: m.webhook_id is not None))
+
+    if flags.embeds:
+        checks.append((0, lambda m: m.embeds))
+
+    if flags.files:
+        checks.append((0, lambda m: m.attachments))
+
+    if flags.reactions:
+        checks.append((0, lambda m: m.reactions))
+
+    if flags.prefix:
+        prefix: str = flags.prefix
+        checks.append((1, lambda m: m.content.startswith(prefix)))
+
+    if flags.suffix:
+        suffix: str = flags.suffix
+        checks.append((1, lambda m: m.content.endswith(suffix)))
+
+    if flags.contains:
+        contains: str = flags.contains
+        checks.append((2, lambda m: contains in m.content))
+
+    # Every custom emoji contains "<" and every link contains ".", a cheap
+    # substring test keeps most messages away from the regex engine.
+    if flags.emojis:
+        minimum: int = flags.emojis
+        checks.append(
+            (
+                3,
+                lambda m: "<" in m.content
+                and _count_at_least(CUSTOM_EMOJI_RE, m.content, minimum),
+            )
+        )
+    elif flags.emoji:
+        checks.append((3, lambda m: "<" in m.content and CUSTOM_EMOJI_RE.search(m.content)))
+
+    if flags.links:
+        checks.append((3, lambda m: "." in m.content and LINKS_RE.search(m.content)))
+
+    if flags.regex:
+        pattern: Pattern[str] = flags.regex
+        checks.append((4, lambda m: pattern.search(m.content)))
+
+    ordered: Tuple[Callable[[discord.Message], Any], ...] = tuple(
+        check for _, check in sorted(checks, key=lambda c: c[0])
+    )
+
+    if flags.require == "all":
+
+        def predicate(message: discord.Message) -> bool:
+            for check in ordered:
+                if not check(message):
+                    return False
+            return True
+
+    else:
+
+        def predicate(message: discord.Message) -> bool:
+            for check in ordered:
+                if check(message):
+                    return True
+            return False
+
+    return predicate
+
+
 async def _create_case(
     bot: Red,
     guild: discord.Guild,
@@ -60,6 +190,26 @@ async def _create_case(
     return case
 
 
+async def _delete_chunk(
+    channel: Union[
+        discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel
+    ],
+    messages: List[discord.Message],
+    *,
+    bulk: bool,
+    reason: str,
+) -> None:
+    if bulk:
+        await channel.delete_messages(messages, reason=reason)
+        return
+    # Messages older than two weeks can't be bulk deleted.
+    for message in messages:
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+
+
 async def _cleanup(
     ctx: commands.GuildContext,
     limit: Optional[int],
@@ -75,11 +225,9 @@ async def _cleanup(
         discord.Thread, discord.TextChannel, discord.VoiceChannel, discord.StageChannel
     ] = (channel if channel else ctx.channel)
 
-    limit = max(1, min(limit or 1, 2000))
+    limit = max(1, min(limit or 1, MAXIMUM_PURGE_LIMIT))
 
-    passed_before: Union[discord.Message, discord.Object] = (
-        ctx.message if before is None else discord.Object(id=before)
-    )
+    cursor: int = ctx.message.id if before is None else before
     two_weeks_before: datetime.datetime = ctx.message.created_at - datetime.timedelta(weeks=2)
     two_weeks_before_snowflake: int = discord.utils.time_snowflake(two_weeks_before)
 
@@ -96,22 +244,83 @@ async def _cleanup(
         ctx.channel.name,
     )
 
-    try:
-        deleted: Union[List[discord.Message], int] = await channel.purge(
-            limit=limit,
-            before=passed_before,
-            after=passed_after,
-            check=predicate,
-            reason=reason,
-        )
-    except discord.HTTPException as e:
-        await ctx.send(
-            f"Unable to {ctx.command.qualified_name}. Error: **{e}** (try a smaller search?)",
-            reference=ctx.message.to_reference(fail_if_not_exists=False),
-            allowed_mentions=discord.AllowedMentions(replied_user=False),
-        )
-        return
-    else:
+    # https://github.com/Rapptz/RoboDanny/blob/rewrite/cogs/mod.py#L1814
+    spammers: Union[Counter[str], List[Tuple[str, int]]] = Counter()
+    scanned: int = 0
+    deleted: int = 0
+    retries: int = 0
+    progress: Optional[discord.Message] = None
+    last_progress: float = time.monotonic()
+
+    async def flush(chunk: List[discord.Message], *, bulk: bool) -> None:
+        nonlocal deleted
+        await _delete_chunk(channel, chunk, bulk=bulk, reason=reason)
+        deleted += len(chunk)
+        spammers.update(m.author.display_name for m in chunk)
+
+    while scanned < limit:
+        page: List[discord.Message] = []
+        try:
+            async for message in channel.history(
+                limit=min(HISTORY_PAGE_SIZE, limit - scanned),
+                before=discord.Object(id=cursor),
+                after=passed_after,
+                oldest_first=False,
+            ):
+                page.append(message)
+            if not page:
+                break
+            matched: List[discord.Message] = [m for m in page if predicate(m)]
+            young: List[discord.Message] = [
+                m for m in matched if m.id > two_weeks_before_snowflake
+            ]
+            old: List[discord.Message] = [m for m in matched if m.id <= two_weeks_before_snowflake]
+            for index in range(0, len(young), BULK_DELETE_LIMIT):
+                await flush(young[index : index + BULK_DELETE_LIMIT], bulk=True)
+            if old:
+                await flush(old, bulk=False)
+        except discord.HTTPException as e:
+            # Resume from the last fully processed snowflake on transient failures, missing
+            # permissions or a deleted channel will not fix themselves.
+            retries += 1
+            if retries <= MAXIMUM_PURGE_RETRIES and not isinstance(
+                e, (discord.Forbidden, discord.NotFound)
+            ):
+                await asyncio.sleep(retries)
+                continue
+            await ctx.send(
+                f"Unable to {ctx.command.qualified_name}. Error: **{e}**\n"
+                f"Stopped after deleting {deleted} messages, at message `{cursor}`.",
+                reference=ctx.message.to_reference(fail_if_not_exists=False),
+                allowed_mentions=discord.AllowedMentions(replied_user=False),
+            )
+            break
+        retries = 0
+        scanned += len(page)
+        cursor = page[-1].id
+        if len(page) < HISTORY_PAGE_SIZE:
+            break
+        if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+            last_progress = time.monotonic()
+            content: str = (
+                f"Purging... scanned {humanize_number(scanned)}/{humanize_number(limit)} "
+                f"messages, deleted {humanize_number(deleted)}."
+            )
+            try:
+                if progress is None:
+                    progress = await ctx.send(content)
+                else:
+                    await progress.edit(content=content)
+            except discord.HTTPException:
+                pass
+
+    if progress is not None:
+        try:
+            await progress.delete()
+        except discord.HTTPException:
+            pass
+
+    if deleted:
         await _create_case(
             ctx.bot,
             ctx.guild,
@@ -121,11 +330,6 @@ async def _cleanup(
             moderator=ctx.author,
         )
 
-    # https://github.com/Rapptz/RoboDanny/blob/rewrite/cogs/mod.py#L1814
-    spammers: Union[Counter[str], List[Tuple[str, int]]] = Counter(
-        m.author.display_name for m in deleted
-    )
-    deleted: Union[List[discord.Message], int] = len(deleted)
     messages: List[str] = [
         f"{deleted} message{' was' if deleted == 1 else 's were'} removed.",
     ]
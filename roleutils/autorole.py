@@ -23,19 +23,20 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Final, List, Literal, NoReturn, Optional, Tuple, Union
+from typing import Any, Dict, Final, List, Literal, Optional, Union
 
 import discord
 from redbot.core import commands
 from redbot.core.modlog import Case, create_case
-from redbot.core.utils.antispam import AntiSpam
+from redbot.core.utils.chat_formatting import box
 from redbot.core.utils.mod import get_audit_reason
 
 from .abc import CompositeMetaClass, MixinMeta
 from .converters import FuzzyRole, StrictRole
+from .scheduler import AutoRoleScheduler, AutoRoleStats
+from .sticky import StickyIndex
 
 log: logging.Logger = logging.getLogger("red.seina.roleutils.autorole")
 
@@ -45,18 +46,18 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
 
     def __init__(self, *_args: Any) -> None:
         super().__init__(*_args)
-        self.queue: asyncio.Queue[discord.Member] = asyncio.Queue()
-        self.spam: Dict[int, AntiSpam] = {}
-
-        self._task: asyncio.Task[NoReturn] = asyncio.create_task(self._handler_task())
+        self.queue: AutoRoleScheduler = AutoRoleScheduler(self._handle_member_join)
+        self.queue.start()
+        self.sticky: StickyIndex = StickyIndex(self.config)
 
     async def initialize(self) -> None:
         log.debug("AutoRole Initialize")
+        self.sticky.load(await self.config.all_roles(), await self.config.all_members())
         await super().initialize()
 
     async def cog_unload(self) -> None:
-        if self._task:
-            self._task.cancel()
+        self.queue.stop()
+        await self.sticky.stop()
 
     # https://github.com/TrustyJAID/Trusty-cogs/blob/master/roletools/events.py#L138
     async def _check_for_guild_verification(
@@ -78,13 +79,11 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
             return 600 - int(allowed_server.total_seconds())
         return False
 
-    async def _wait_for_guild_verification(
-        self, member: discord.Member, guild: discord.Guild
-    ) -> None:
-        wait = await self._check_for_guild_verification(member, guild)
+    async def _queue_member_join(self, member: discord.Member) -> None:
+        wait = await self._check_for_guild_verification(member, member.guild)
         if wait:
             log.debug("Waiting %s seconds before allowing the user to have a role", wait)
-            await asyncio.sleep(int(wait))
+        self.queue.put(member, delay=max(int(wait), 0))
 
     async def _create_case(
         self,
@@ -140,7 +139,8 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
         guild: discord.Guild = member.guild
         if await self.bot.cog_disabled_in_guild(self, guild):
             return
-        to_reapply: List[int] = await self.config.member(member).sticky_roles()
+        await self.sticky.wait_until_ready()
+        to_reapply: List[int] = self.sticky.get(guild.id, member.id)
         if not to_reapply:
             return
         to_add: List[discord.Role] = []
@@ -155,16 +155,17 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
         guild: discord.Guild = member.guild
         if await self.bot.cog_disabled_in_guild(self, guild):
             return
-        to_reapply: List[int] = await self.config.member(member).sticky_roles()
+        await self.sticky.wait_until_ready()
+        to_reapply: List[int] = self.sticky.get(guild.id, member.id)
         reapply: bool = False
         for role in member.roles:
-            if not await self.config.role(role).sticky():
+            if not self.sticky.is_sticky(role.id):
                 continue
             if role.id not in to_reapply:
                 to_reapply.append(role.id)
                 reapply: bool = True
         if reapply:
-            await self.config.member(member).sticky_roles.set(to_reapply)
+            self.sticky.set(guild.id, member.id, to_reapply)
 
     async def _handle_member_join(self, member: discord.Member):
         role_ids: List[int] = []
@@ -192,23 +193,6 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
             return
         await self._create_case(member.guild, type="autorole", reason=reason, user=member)
 
-    async def _handler_task(self):
-        __intervals: List[Tuple[timedelta, int]] = [
-            (timedelta(seconds=10), 5),
-            (timedelta(minutes=10), 10),
-            (timedelta(hours=1), 20),
-            (timedelta(days=1), 40),
-        ]
-        while True:
-            member: discord.Member = await self.queue.get()
-            await self._wait_for_guild_verification(member, member.guild)
-            if member.guild.id not in self.spam:
-                self.spam[member.guild.id] = AntiSpam(__intervals)
-            if self.spam[member.guild.id].spammy:
-                await asyncio.sleep(69)
-            self.spam[member.guild.id].stamp()
-            await self._handle_member_join(member)
-
     @commands.guild_only()
     @commands.has_permissions(manage_roles=True)
     @commands.bot_has_permissions(manage_roles=True)
@@ -248,6 +232,25 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
                 )
         await ctx.send(f"Removed {role.name} ({role.id}) from the autoroles list.")
 
+    @_autorole.command(name="stats")
+    async def _autorole_stats(self, ctx: commands.GuildContext):
+        """Show the autorole queue depth and time-to-role latency for this server."""
+        stats: Optional[AutoRoleStats] = self.queue.stats.get(ctx.guild.id)
+        if stats is None:
+            await ctx.send("No autoroles have been queued in this server since the cog loaded.")
+            return
+        await ctx.send(
+            box(
+                f"Queued:          {stats.queued}\n"
+                f"Awaiting checks: {stats.delayed}\n"
+                f"Processed:       {stats.processed}\n"
+                f"Failed:          {stats.failed}\n"
+                f"Average latency: {stats.average_latency:.2f}s\n"
+                f"Maximum latency: {stats.max_latency:.2f}s",
+                lang="yaml",
+            )
+        )
+
     @_autorole.group(name="humans")
     async def _humans(self, _: commands.GuildContext):
         """Manage autoroles for humans."""
@@ -333,21 +336,24 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
         role: StrictRole,
     ):
         """"""
+        await self.sticky.wait_until_ready()
         if add_or_remove.lower() == "add":
-            if await self.config.role(role).sticky():
+            if self.sticky.is_sticky(role.id):
                 await ctx.send(
                     "{} is already a sticky role.".format(role.name),
                 )
                 return
             await self.config.role(role).sticky.set(True)
+            self.sticky.set_sticky(role.id, True)
             await ctx.send("Successfully configured {} as a sticky role.".format(role.name))
         elif add_or_remove.lower() == "remove":
-            if not await self.config.role(role).sticky():
+            if not self.sticky.is_sticky(role.id):
                 await ctx.send(
                     "{} is not a sticky role.".format(role.name),
                 )
                 return
             await self.config.role(role).sticky.set(False)
+            self.sticky.set_sticky(role.id, False)
             await ctx.send("Successfully removed {} from sticky roles.".format(role.name))
         else:
             await ctx.send_help(ctx.command)
@@ -361,11 +367,12 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
         role: StrictRole,
     ):
         """"""
+        await self.sticky.wait_until_ready()
         failed: List[str] = []
         for user in users:
-            async with self.config.member(user).sticky_roles() as settings:
-                if role.id not in settings:
-                    settings.append(role.id)
+            settings: List[int] = self.sticky.get(ctx.guild.id, user.id)
+            if role.id not in settings:
+                self.sticky.set(ctx.guild.id, user.id, settings + [role.id])
             try:
                 await self._give_sticky_role(
                     user, role, reason=get_audit_reason(ctx.author, "Sticky role applied.")
@@ -391,11 +398,13 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
         role: StrictRole,
     ):
         """"""
+        await self.sticky.wait_until_ready()
         failed: List[str] = []
         for user in users:
-            async with self.config.member(user).sticky_roles() as settings:
-                if role.id in settings:
-                    settings.remove(role.id)
+            settings: List[int] = self.sticky.get(ctx.guild.id, user.id)
+            if role.id in settings:
+                settings.remove(role.id)
+                self.sticky.set(ctx.guild.id, user.id, settings)
             try:
                 await self._remove_sticky_role(
                     user, role, reason=get_audit_reason(ctx.author, "Sticky role removed.")
@@ -417,12 +426,12 @@ class AutoRoles(MixinMeta, metaclass=CompositeMetaClass):
         await self._sticky_join(member)
         if member.pending:
             return
-        await self.queue.put(member)
+        await self._queue_member_join(member)
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         if before.pending and not after.pending:
-            await self.queue.put(after)
+            await self._queue_member_join(after)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
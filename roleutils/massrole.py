@@ -0,0 +1,351 @@
+"""
+MIT License
+
+Copyright (c) 2020-2023 PhenoM4n4n
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Final, Iterator, List, Optional, Set
+
+import discord
+from redbot.core.bot import Red
+from redbot.core.config import Config
+from redbot.core.utils.chat_formatting import humanize_number, humanize_timedelta
+
+from .utils import guild_roughly_chunked
+
+log: logging.Logger = logging.getLogger("red.seina.roleutils.massrole")
+
+# Member role edits share a per-guild rate-limit bucket, more workers than this only queue
+# up behind discord.py's bucket lock.
+MASSROLE_WORKERS: Final[int] = 5
+CURSOR_FLUSH_INTERVAL: Final[float] = 15.0
+PROGRESS_INTERVAL: Final[float] = 5.0
+
+
+class MassRoleJob:
+    """A massrole run over a fixed list of member ids, persisted in the guild config."""
+
+    __slots__ = (
+        "guild_id",
+        "role_id",
+        "adding",
+        "reason",
+        "members",
+        "cursor",
+        "completed",
+        "skipped",
+        "failed",
+        "channel_id",
+        "message_id",
+        "cancelled",
+        "ahead",
+        "_started",
+        "_processed_at_start",
+    )
+
+    def __init__(
+        self,
+        guild_id: int,
+        role_id: int,
+        adding: bool,
+        reason: str,
+        members: List[int],
+        *,
+        cursor: int = 0,
+        completed: int = 0,
+        skipped: int = 0,
+        failed: int = 0,
+        channel_id: Optional[int] = None,
+        message_id: Optional[int] = None,
+    ) -> None:
+        self.guild_id: int = guild_id
+        self.role_id: int = role_id
+        self.adding: bool = adding
+        self.reason: str = reason
+        self.members: List[int] = members
+        self.cursor: int = cursor
+        self.completed: int = completed
+        self.skipped: int = skipped
+        self.failed: int = failed
+        self.channel_id: Optional[int] = channel_id
+        self.message_id: Optional[int] = message_id
+        self.cancelled: bool = False
+        # Outcome of every finished member at or past the cursor, those are repeated on resume.
+        self.ahead: Dict[int, str] = {}
+        self._started: float = time.monotonic()
+        self._processed_at_start: int = self.processed
+
+    @classmethod
+    def from_config(cls, guild_id: int, data: Dict[str, Any]) -> "MassRoleJob":
+        return cls(
+            guild_id,
+            data["role"],
+            data["adding"],
+            data["reason"],
+            data["members"],
+            cursor=data["cursor"],
+            completed=data["completed"],
+            skipped=data["skipped"],
+            failed=data["failed"],
+            channel_id=data["channel"],
+            message_id=data["message"],
+        )
+
+    def to_config(self) -> Dict[str, Any]:
+        return {
+            "role": self.role_id,
+            "adding": self.adding,
+            "reason": self.reason,
+            "members": self.members,
+            **self.saved_counters(),
+            "channel": self.channel_id,
+            "message": self.message_id,
+        }
+
+    def record(self, index: int, outcome: str) -> None:
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        self.ahead[index] = outcome
+
+    def advance(self, cursor: int) -> None:
+        self.cursor = cursor
+        for index in [index for index in self.ahead if index < cursor]:
+            del self.ahead[index]
+
+    def saved_counters(self) -> Dict[str, int]:
+        """The cursor and the counters of the members before it, as they are persisted."""
+        counters: Dict[str, int] = {
+            "cursor": self.cursor,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+        for outcome in self.ahead.values():
+            counters[outcome] -= 1
+        return counters
+
+    @property
+    def total(self) -> int:
+        return len(self.members)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.skipped + self.failed
+
+    @property
+    def rate(self) -> float:
+        elapsed: float = time.monotonic() - self._started
+        return (self.processed - self._processed_at_start) / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        rate: float = self.rate
+        return (self.total - self.cursor) / rate if rate > 0 else None
+
+    def progress(self, role: Optional[discord.Role] = None) -> str:
+        verb: str = "Adding" if self.adding else "Removing"
+        word: str = "to" if self.adding else "from"
+        name: str = role.name if role else str(self.role_id)
+        eta: Optional[float] = self.eta()
+        text: str = (
+            f"{verb} **{name}** {word} **{humanize_number(self.total)}** members: "
+            f"{humanize_number(self.cursor)}/{humanize_number(self.total)} processed, "
+            f"{humanize_number(self.completed)} done, {humanize_number(self.skipped)} skipped, "
+            f"{humanize_number(self.failed)} failed."
+        )
+        if eta is not None and self.cursor < self.total:
+            text += f"\nETA: {humanize_timedelta(seconds=max(int(eta), 1))}."
+        return text
+
+
+class MassRoleEngine:
+    """
+    Runs at most one massrole job per guild.
+
+    Every job fans out over `MASSROLE_WORKERS` workers. The lowest member index still in flight
+    is persisted as the job cursor, so a job picked up again after a reload only repeats the
+    few edits that were in flight, and those are skipped since the member already has the role.
+    """
+
+    def __init__(self, bot: Red, config: Config) -> None:
+        self.bot: Red = bot
+        self.config: Config = config
+        self.jobs: Dict[int, MassRoleJob] = {}
+        self._tasks: Dict[int, asyncio.Task[None]] = {}
+
+    async def resume(self) -> None:
+        await self.bot.wait_until_red_ready()
+        for guild_id, data in (await self.config.all_guilds()).items():
+            if data.get("massrole"):
+                log.debug("Resuming the massrole job of guild %s.", guild_id)
+                self._spawn(MassRoleJob.from_config(guild_id, data["massrole"]))
+
+    async def start(self, job: MassRoleJob) -> bool:
+        """Start the job, or return False if the guild already has one."""
+        # Claimed before the first await, so concurrent invocations can't both get through.
+        if job.guild_id in self.jobs:
+            return False
+        self.jobs[job.guild_id] = job
+        try:
+            await self.config.guild_from_id(job.guild_id).massrole.set(job.to_config())
+        except Exception:
+            self.jobs.pop(job.guild_id, None)
+            raise
+        self._spawn(job)
+        return True
+
+    def cancel(self, guild_id: int) -> bool:
+        job: Optional[MassRoleJob] = self.jobs.get(guild_id)
+        if job is None:
+            return False
+        job.cancelled = True
+        return True
+
+    async def stop(self) -> None:
+        jobs: List[MassRoleJob] = list(self.jobs.values())
+        tasks: List[asyncio.Task[None]] = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Keep the jobs persisted with their latest cursor so they resume on the next load.
+        for job in jobs:
+            try:
+                await self._flush(job)
+            except Exception:
+                log.exception("Failed to save the massrole cursor of guild %s.", job.guild_id)
+        self._tasks.clear()
+        self.jobs.clear()
+
+    def _spawn(self, job: MassRoleJob) -> None:
+        self.jobs[job.guild_id] = job
+        self._tasks[job.guild_id] = asyncio.create_task(
+            self._run(job), name=f"roleutils:massrole-{job.guild_id}"
+        )
+
+    async def _flush(self, job: MassRoleJob) -> None:
+        # The job is stored as one unregistered dict, raw access skips rewriting its member list.
+        group = self.config.guild_from_id(job.guild_id).massrole
+        for key, value in job.saved_counters().items():
+            await group.set_raw(key, value=value)
+        await group.set_raw("message", value=job.message_id)
+
+    async def _report(self, job: MassRoleJob, content: str, *, final: bool = False) -> None:
+        guild: Optional[discord.Guild] = self.bot.get_guild(job.guild_id)
+        channel = guild.get_channel_or_thread(job.channel_id) if guild and job.channel_id else None
+        if not isinstance(channel, discord.abc.Messageable):
+            return
+        try:
+            if job.message_id is not None and not final:
+                await channel.get_partial_message(job.message_id).edit(content=content)
+                return
+            message: discord.Message = await channel.send(content)
+        except discord.HTTPException:
+            return
+        if not final:
+            job.message_id = message.id
+
+    async def _run(self, job: MassRoleJob) -> None:
+        try:
+            role: Optional[discord.Role] = await self._process(job)
+        finally:
+            self.jobs.pop(job.guild_id, None)
+            self._tasks.pop(job.guild_id, None)
+        if role is None:
+            return
+        await self._report(job, job.progress(role))
+        verb: str = "add" if job.adding else "remove"
+        word: str = "to" if job.adding else "from"
+        if job.cancelled:
+            result: str = (
+                f"Cancelled {verb}ing **{role.name}** after "
+                f"{humanize_number(job.cursor)}/{humanize_number(job.total)} members."
+            )
+        else:
+            result = (
+                f"{verb.title()[:5]}ed **{role.name}** {word} "
+                f"**{humanize_number(job.completed)}** members."
+            )
+        if job.skipped:
+            result += (
+                f"\nSkipped {verb[:5]}ing roles for **{humanize_number(job.skipped)}** members."
+            )
+        if job.failed:
+            result += (
+                f"\nFailed {verb[:5]}ing roles for **{humanize_number(job.failed)}** members."
+            )
+        await self._report(job, result, final=True)
+
+    async def _process(self, job: MassRoleJob) -> Optional[discord.Role]:
+        guild: Optional[discord.Guild] = self.bot.get_guild(job.guild_id)
+        role: Optional[discord.Role] = guild.get_role(job.role_id) if guild else None
+        if guild is None or role is None:
+            await self.config.guild_from_id(job.guild_id).massrole.clear()
+            return None
+        if guild_roughly_chunked(guild) is False and self.bot.intents.members:
+            await guild.chunk()
+
+        indices: Iterator[int] = iter(range(job.cursor, job.total))
+        in_flight: Set[int] = set()
+        frontier: List[int] = [job.cursor]
+
+        async def worker() -> None:
+            for index in indices:
+                if job.cancelled:
+                    return
+                in_flight.add(index)
+                frontier[0] = index + 1
+                member: Optional[discord.Member] = guild.get_member(job.members[index])
+                try:
+                    if member is None or (role in member.roles) is job.adding:
+                        job.record(index, "skipped")
+                    elif job.adding:
+                        await member.add_roles(role, reason=job.reason)
+                        job.record(index, "completed")
+                    else:
+                        await member.remove_roles(role, reason=job.reason)
+                        job.record(index, "completed")
+                except discord.HTTPException:
+                    job.record(index, "failed")
+                    log.exception("Failed to edit the roles of %s.", member)
+                # Left in flight when cancelled mid-edit, so the saved cursor still covers it.
+                in_flight.discard(index)
+
+        async def reporter() -> None:
+            last_flush: float = time.monotonic()
+            while True:
+                await asyncio.sleep(PROGRESS_INTERVAL)
+                job.advance(min(in_flight, default=frontier[0]))
+                await self._report(job, job.progress(role))
+                if time.monotonic() - last_flush >= CURSOR_FLUSH_INTERVAL:
+                    last_flush = time.monotonic()
+                    await self._flush(job)
+
+        progress: asyncio.Task[None] = asyncio.create_task(reporter())
+        try:
+            await asyncio.gather(*(worker() for _ in range(MASSROLE_WORKERS)))
+        finally:
+            progress.cancel()
+            job.advance(min(in_flight, default=frontier[0]))
+
+        await self.config.guild_from_id(job.guild_id).massrole.clear()
+        return role
@@ -25,7 +25,7 @@ SOFTWARE.
 
 import asyncio
 import logging
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import discord
 from redbot.core import commands
@@ -67,7 +67,8 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
     def __init__(self, *_args: Any) -> None:
         super().__init__(*_args)
         self.method: str = "build"
-        self.cache["reactroles"] = {"message_cache": set()}
+        # message id -> {emoji key -> role id}, mirrors every GuildMessage react_to_roleid.
+        self.cache["reactroles"] = {"message_cache": set(), "binds": {}}
 
     async def initialize(self) -> None:
         log.debug("ReactRole Initialize")
@@ -76,12 +77,12 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
 
     async def _update_cache(self) -> None:
         all_guildmessage = await self.config.custom("GuildMessage").all()
-        self.cache["reactroles"]["message_cache"].update(
-            int(msg_id)
-            for guild_data in all_guildmessage.values()
-            for msg_id, msg_data in guild_data.items()
-            if msg_data["reactroles"]["react_to_roleid"]
-        )
+        self.cache["reactroles"]["message_cache"].clear()
+        self.cache["reactroles"]["binds"].clear()
+        for guild_data in all_guildmessage.values():
+            for msg_id, msg_data in guild_data.items():
+                if msg_data["reactroles"]["react_to_roleid"]:
+                    self._edit_cache(int(msg_id), binds=msg_data["reactroles"]["react_to_roleid"])
 
     def _check_payload_to_cache(
         self,
@@ -96,11 +97,19 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
         self,
         message_id: Optional[int] = None,
         remove: bool = False,
+        *,
+        binds: Optional[Dict[str, int]] = None,
     ) -> None:
-        if remove:
-            self.cache["reactroles"]["message_cache"].remove(message_id)
+        if remove or binds == {}:
+            self.cache["reactroles"]["message_cache"].discard(message_id)
+            self.cache["reactroles"]["binds"].pop(message_id, None)
         else:
             self.cache["reactroles"]["message_cache"].add(message_id)
+            if binds is not None:
+                self.cache["reactroles"]["binds"][message_id] = dict(binds)
+
+    def _get_bind(self, message_id: int, emoji_id: str) -> Optional[int]:
+        return self.cache["reactroles"]["binds"].get(message_id, {}).get(emoji_id)
 
     async def bulk_delete_set_roles(
         self,
@@ -111,9 +120,8 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
         async with self.config.custom("GuildMessage", guild.id, message.id).reactroles() as r:
             for emoji_id in emoji_ids:
                 del r["react_to_roleid"][self.emoji_id(emoji_id)]
-            if not r["react_to_roleid"]:
-                # None for channel, don't assume the whole channel can stop being tracked
-                self._edit_cache(message.id, True)
+            # None for channel, don't assume the whole channel can stop being tracked
+            self._edit_cache(message.id, binds=r["react_to_roleid"])
 
     def emoji_id(self, emoji: Union[discord.Emoji, str]) -> str:
         return emoji if isinstance(emoji, str) else str(emoji.id)
@@ -178,12 +186,13 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
             r["react_to_roleid"][self.emoji_id(emoji)] = role.id
             r["channel"] = message.channel.id
             r["rules"] = rules
+            binds = dict(r["react_to_roleid"])
         if str(emoji) not in [str(emoji) for emoji in message.reactions]:
             await message.add_reaction(emoji)
         await ctx.send(f"`{role}` has been binded to {emoji} on {message.jump_url}")
 
         # Add this message and channel to tracked cache
-        self._edit_cache(message.id)
+        self._edit_cache(message.id, binds=binds)
         async with self.config.guild(ctx.guild).reactroles.channels() as ch:
             if message.channel.id not in ch:
                 ch.append(message.channel.id)
@@ -258,7 +267,7 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
         await ctx.tick()
 
         # Add this message and channel to tracked cache
-        self._edit_cache(message.id)
+        self._edit_cache(message.id, binds=binds)
         async with self.config.guild(ctx.guild).reactroles.channels() as ch:
             if message.channel.id not in ch:
                 ch.append(message.channel.id)
@@ -304,6 +313,7 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
                 del r["react_to_roleid"][emoji if isinstance(emoji, str) else str(emoji.id)]
             except KeyError:
                 return await ctx.send("That wasn't a valid emoji for that message.")
+            self._edit_cache(message.id, binds=r["react_to_roleid"])
         await ctx.send(f"That emoji role bind was deleted.")
 
     @reactrole.command(name="list")
@@ -424,13 +434,10 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
         if not guild.me.guild_permissions.manage_roles:
             return
 
-        reacts = await self.config.custom(
-            "GuildMessage", guild.id, payload.message_id
-        ).reactroles.all()
         emoji_id = (
             str(payload.emoji) if payload.emoji.is_unicode_emoji() else str(payload.emoji.id)
         )
-        role_id = reacts["react_to_roleid"].get(emoji_id)
+        role_id = self._get_bind(payload.message_id, emoji_id)
         if not role_id:
             log.debug("No matched role id")
             return
@@ -438,6 +445,7 @@ class ReactRoles(MixinMeta, metaclass=CompositeMetaClass):
         if not role:
             log.debug("Role was deleted")
             await self.bulk_delete_set_roles(guild, discord.Object(payload.message_id), [emoji_id])
+            return
         if not my_role_heirarchy(guild, role):
             log.debug("Role outranks me")
             return
@@ -26,7 +26,7 @@ SOFTWARE.
 import logging
 from collections import defaultdict
 from colorsys import rgb_to_hsv
-from typing import Dict, Generator, List, Optional, Sequence, Tuple
+from typing import Generator, List, Optional, Sequence, Tuple
 
 import discord
 from redbot.core import commands
@@ -38,6 +38,7 @@ from TagScriptEngine import Interpreter, LooseVariableGetterBlock, MemberAdapter
 
 from .abc import CompositeMetaClass, MixinMeta
 from .converters import FuzzyRole, RoleArgumentConverter, StrictRole, TargeterArgs, TouchableMember
+from .massrole import MassRoleEngine, MassRoleJob
 from .utils import (
     can_run_command,
     guild_roughly_chunked,
@@ -70,10 +71,18 @@ class Roles(MixinMeta, metaclass=CompositeMetaClass):
     def __init__(self) -> None:
         self.interpreter: Interpreter = Interpreter([LooseVariableGetterBlock()])
         super().__init__()
+        self.massroles: MassRoleEngine = MassRoleEngine(self.bot, self.config)
 
     async def initialize(self) -> None:
         log.debug("Roles Initialize")
         await super().initialize()
+        await self.massroles.resume()
+
+    async def cog_unload(self) -> None:
+        try:
+            await self.massroles.stop()
+        finally:
+            await super().cog_unload()
 
     @commands.guild_only()
     @commands.group(invoke_without_command=True)
@@ -556,23 +565,26 @@ class Roles(MixinMeta, metaclass=CompositeMetaClass):
         if not member_list:
             await ctx.send(fail_message)
             return
+        job = MassRoleJob(
+            ctx.guild.id,
+            role.id,
+            adding,
+            get_audit_reason(ctx.author),
+            [member.id for member in member_list],
+            channel_id=ctx.channel.id,
+        )
+        if not await self.massroles.start(job):
+            await ctx.send(
+                "A massrole job is already running in this server, "
+                f"check on it with `{ctx.clean_prefix}role job` or cancel it first."
+            )
+            return
         verb = "add" if adding else "remove"
         word = "to" if adding else "from"
-        await ctx.send(
+        message = await ctx.send(
             f"Beginning to {verb} **{role.name}** {word} **{len(member_list)}** members."
         )
-        async with ctx.typing():
-            result = await self.massrole(member_list, [role], get_audit_reason(ctx.author), adding)
-            result_text = f"{verb.title()[:5]}ed **{role.name}** {word} **{len(result['completed'])}** members."
-            if result["skipped"]:
-                result_text += (
-                    f"\nSkipped {verb[:5]}ing roles for **{len(result['skipped'])}** members."
-                )
-            if result["failed"]:
-                result_text += (
-                    f"\nFailed {verb[:5]}ing roles for **{len(result['failed'])}** members."
-                )
-        await ctx.send(result_text)
+        job.message_id = message.id
 
     def get_member_list(
         self, members: List[discord.Member], role: discord.Role, adding: bool = True
@@ -583,42 +595,21 @@ class Roles(MixinMeta, metaclass=CompositeMetaClass):
             members = [member for member in members if role in member.roles]
         return members
 
-    async def massrole(
-        self,
-        members: List[discord.Member],
-        roles: List[discord.Role],
-        reason: str,
-        adding: bool = True,
-    ) -> Dict[str, List[discord.Member]]:
-        completed: List[discord.Member] = []
-        skipped: List[discord.Member] = []
-        failed: List[discord.Member] = []
-        for member in members:
-            if adding:
-                to_add = [role for role in roles if role not in member.roles]
-                if to_add:
-                    try:
-                        await member.add_roles(*to_add, reason=reason)
-                    except Exception as e:
-                        failed.append(member)
-                        log.exception(f"Failed to add roles to {member}", exc_info=e)
-                    else:
-                        completed.append(member)
-                else:
-                    skipped.append(member)
-            else:
-                to_remove = [role for role in roles if role in member.roles]
-                if to_remove:
-                    try:
-                        await member.remove_roles(*to_remove, reason=reason)
-                    except Exception as e:
-                        failed.append(member)
-                        log.exception(f"Failed to remove roles from {member}", exc_info=e)
-                    else:
-                        completed.append(member)
-                else:
-                    skipped.append(member)
-        return {"completed": completed, "skipped": skipped, "failed": failed}
+    @commands.has_guild_permissions(manage_roles=True)
+    @role.group(name="job", invoke_without_command=True)
+    async def role_job(self, ctx: commands.Context):
+        """Show the progress of the massrole job running in this server."""
+        job: Optional[MassRoleJob] = self.massroles.jobs.get(ctx.guild.id)
+        if job is None:
+            return await ctx.send("There is no massrole job running in this server.")
+        await ctx.send(job.progress(ctx.guild.get_role(job.role_id)))
+
+    @role_job.command(name="cancel", aliases=["stop"])
+    async def role_job_cancel(self, ctx: commands.Context):
+        """Cancel the massrole job running in this server."""
+        if not self.massroles.cancel(ctx.guild.id):
+            return await ctx.send("There is no massrole job running in this server.")
+        await ctx.send("Cancelling the massrole job, the members already edited keep their roles.")
 
     @staticmethod
     def format_members(members: List[discord.Member]) -> str:
@@ -80,6 +80,7 @@ class RoleUtils(
             str, Dict[str, Union[List[int], bool, Dict[str, Union[List[int], bool]]]]
         ] = {
             "reactroles": {"channels": [], "enabled": True},
+            "massrole": {},
             "autoroles": {
                 "toggle": False,
                 "roles": [],
@@ -0,0 +1,193 @@
+"""
+MIT License
+
+Copyright (c) 2020-2023 PhenoM4n4n
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict, deque
+from datetime import timedelta
+from typing import Awaitable, Callable, DefaultDict, Deque, Dict, Final, List, Optional, Set, Tuple
+
+import discord
+from redbot.core.utils.antispam import AntiSpam
+
+log: logging.Logger = logging.getLogger("red.seina.roleutils.scheduler")
+
+MAXIMUM_AUTOROLE_WORKERS: Final[int] = 4
+ANTISPAM_COOLDOWN: Final[float] = 69.0
+ANTISPAM_INTERVALS: Final[List[Tuple[timedelta, int]]] = [
+    (timedelta(seconds=10), 5),
+    (timedelta(minutes=10), 10),
+    (timedelta(hours=1), 20),
+    (timedelta(days=1), 40),
+]
+
+AutoRoleHandler = Callable[[discord.Member], Awaitable[None]]
+
+
+class AutoRoleStats:
+    __slots__ = ("queued", "delayed", "processed", "failed", "total_latency", "max_latency")
+
+    def __init__(self) -> None:
+        self.queued: int = 0
+        self.delayed: int = 0
+        self.processed: int = 0
+        self.failed: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self.queued + self.delayed
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.0
+
+    def record(self, latency: float) -> None:
+        self.processed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
+class AutoRoleScheduler:
+    """
+    Per-guild autorole queues served by a bounded pool of workers.
+
+    A guild is owned by at most one worker at a time so its members keep their join order,
+    and a worker hands the guild back after every member so busy guilds take turns.
+    Verification waits and antispam cooldowns are due times on a heap, nothing sleeps inline.
+    """
+
+    def __init__(
+        self, handler: AutoRoleHandler, *, workers: int = MAXIMUM_AUTOROLE_WORKERS
+    ) -> None:
+        self._handler: AutoRoleHandler = handler
+        self._workers: int = workers
+        self._pending: DefaultDict[int, Deque[Tuple[float, discord.Member]]] = defaultdict(deque)
+        # (due, sequence, guild id, (enqueued, member) or None to lift an antispam cooldown)
+        self._delayed: List[Tuple[float, int, int, Optional[Tuple[float, discord.Member]]]] = []
+        self._sequence: "itertools.count[int]" = itertools.count()
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        # Guilds waiting in `_ready`, owned by a worker or cooling down.
+        self._scheduled: Set[int] = set()
+        self._resumed: Set[int] = set()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._tasks: List[asyncio.Task[None]] = []
+        self.spam: Dict[int, AntiSpam] = {}
+        self.stats: DefaultDict[int, AutoRoleStats] = defaultdict(AutoRoleStats)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._run(), name="roleutils:autorole-timer"))
+        for index in range(self._workers):
+            self._tasks.append(
+                asyncio.create_task(self._work(), name=f"roleutils:autorole-worker-{index}")
+            )
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def put(self, member: discord.Member, delay: float = 0.0) -> None:
+        now: float = time.monotonic()
+        if delay > 0:
+            self._push(now + delay, member.guild.id, (now, member))
+            self.stats[member.guild.id].delayed += 1
+        else:
+            self._enqueue(member.guild.id, (now, member))
+
+    def _push(
+        self,
+        due: float,
+        guild_id: int,
+        entry: Optional[Tuple[float, discord.Member]],
+    ) -> None:
+        heapq.heappush(self._delayed, (due, next(self._sequence), guild_id, entry))
+        self._wakeup.set()
+
+    def _enqueue(self, guild_id: int, entry: Tuple[float, discord.Member]) -> None:
+        self._pending[guild_id].append(entry)
+        self.stats[guild_id].queued += 1
+        if guild_id not in self._scheduled:
+            self._scheduled.add(guild_id)
+            self._ready.put_nowait(guild_id)
+
+    async def _run(self) -> None:
+        while True:
+            now: float = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, guild_id, entry = heapq.heappop(self._delayed)
+                if entry is None:
+                    self._resumed.add(guild_id)
+                    self._ready.put_nowait(guild_id)
+                else:
+                    self.stats[guild_id].delayed -= 1
+                    self._enqueue(guild_id, entry)
+            timeout: Optional[float] = max(0, self._delayed[0][0] - now) if self._delayed else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            guild_id: int = await self._ready.get()
+            pending: Deque[Tuple[float, discord.Member]] = self._pending[guild_id]
+            if not pending:
+                del self._pending[guild_id]
+                self._scheduled.discard(guild_id)
+                self._resumed.discard(guild_id)
+                continue
+            spam: AntiSpam = self.spam.setdefault(guild_id, AntiSpam(ANTISPAM_INTERVALS))
+            if guild_id in self._resumed:
+                self._resumed.discard(guild_id)
+            elif spam.spammy:
+                log.debug(
+                    "Autoroles in %s are cooling down for %s seconds.", guild_id, ANTISPAM_COOLDOWN
+                )
+                self._push(time.monotonic() + ANTISPAM_COOLDOWN, guild_id, None)
+                continue
+            spam.stamp()
+            enqueued, member = pending.popleft()
+            stats: AutoRoleStats = self.stats[guild_id]
+            stats.queued -= 1
+            try:
+                await self._handler(member)
+            except Exception:
+                stats.failed += 1
+                log.exception("Failed to handle the autoroles of %s in %s.", member, guild_id)
+            else:
+                stats.record(time.monotonic() - enqueued)
+            if pending:
+                self._ready.put_nowait(guild_id)
+            else:
+                self._scheduled.discard(guild_id)
+                del self._pending[guild_id]
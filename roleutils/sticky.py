@@ -0,0 +1,158 @@
+"""
+MIT License
+
+Copyright (c) 2020-2023 PhenoM4n4n
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, Dict, Final, Iterable, List, Optional, Set, Tuple
+
+from redbot.core.config import Config, Group
+
+log: logging.Logger = logging.getLogger("red.seina.roleutils.sticky")
+
+STICKY_FLUSH_INTERVAL: Final[float] = 5.0
+
+
+class StickyIndex:
+    """
+    In-memory mirror of the sticky role settings.
+
+    Sticky role ids and every member's stored sticky roles are loaded once, reads never touch
+    config and member writes are coalesced into one config write per guild every
+    `STICKY_FLUSH_INTERVAL` seconds, so a mass kick costs a handful of writes.
+    """
+
+    __slots__ = (
+        "config",
+        "roles",
+        "ready",
+        "_members",
+        "_pending",
+        "_task",
+        "queued",
+        "flushes",
+    )
+
+    def __init__(self, config: Config) -> None:
+        self.config: Config = config
+        # Role ids are snowflakes, so one set covers every guild.
+        self.roles: Set[int] = set()
+        self.ready: asyncio.Event = asyncio.Event()
+        self._members: Dict[int, Dict[int, List[int]]] = {}
+        self._pending: Dict[int, Set[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.queued: int = 0
+        self.flushes: int = 0
+
+    def load(
+        self,
+        all_roles: Dict[int, Dict[str, Any]],
+        all_members: Dict[int, Dict[int, Dict[str, Any]]],
+    ) -> None:
+        self.roles = {role_id for role_id, data in all_roles.items() if data.get("sticky")}
+        for guild_id, members in all_members.items():
+            stored: Dict[int, List[int]] = self._members.setdefault(guild_id, {})
+            # Changes made before the load are newer than config, they are kept as they are.
+            pending: Set[int] = self._pending.get(guild_id, set())
+            for member_id, data in members.items():
+                if member_id not in pending and data.get("sticky_roles"):
+                    stored[member_id] = list(data["sticky_roles"])
+        self.ready.set()
+
+    async def wait_until_ready(self) -> None:
+        await self.ready.wait()
+
+    def is_sticky(self, role_id: int) -> bool:
+        return role_id in self.roles
+
+    def set_sticky(self, role_id: int, sticky: bool) -> None:
+        if sticky:
+            self.roles.add(role_id)
+        else:
+            self.roles.discard(role_id)
+
+    def get(self, guild_id: int, member_id: int) -> List[int]:
+        return list(self._members.get(guild_id, {}).get(member_id, []))
+
+    def set(self, guild_id: int, member_id: int, role_ids: Iterable[int]) -> None:
+        role_ids = list(role_ids)
+        members: Dict[int, List[int]] = self._members.setdefault(guild_id, {})
+        if role_ids:
+            members[member_id] = role_ids
+        else:
+            members.pop(member_id, None)
+        self._pending.setdefault(guild_id, set()).add(member_id)
+        self.queued += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(STICKY_FLUSH_INTERVAL)
+        await self.flush()
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        items: List[Tuple[int, Set[int]]] = list(pending.items())
+        for position, (guild_id, member_ids) in enumerate(items):
+            stored: Dict[int, List[int]] = self._members.get(guild_id, {})
+            try:
+                async with self._member_group(guild_id)() as members:
+                    for member_id in member_ids:
+                        if role_ids := stored.get(member_id):
+                            members.setdefault(str(member_id), {})["sticky_roles"] = role_ids
+                        elif (data := members.get(str(member_id))) is not None:
+                            data.pop("sticky_roles", None)
+                            if not data:
+                                del members[str(member_id)]
+            except asyncio.CancelledError:
+                # Put back what this flush had not written yet, so the final flush covers it.
+                for guild_id, member_ids in items[position:]:
+                    self._pending.setdefault(guild_id, set()).update(member_ids)
+                raise
+            except Exception:
+                log.exception(
+                    "Failed to save the sticky roles of %s members of guild %s.",
+                    len(member_ids),
+                    guild_id,
+                )
+                self._pending.setdefault(guild_id, set()).update(member_ids)
+                continue
+        self.flushes += 1
+
+    def _member_group(self, guild_id: int) -> Group:
+        """
+        The group holding every member of a guild, so a flush is one write per guild.
+
+        Config has no public accessor for it, this is the only place relying on the private one.
+        """
+        return self.config._get_base_group(Config.MEMBER, str(guild_id))
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+        await self.flush()
@@ -24,8 +24,18 @@ SOFTWARE.
 """
 
 import re
-from collections import defaultdict
-from typing import Any, Dict, Final, List, Literal, Match, Tuple
+from typing import (
+    Any,
+    Dict,
+    Final,
+    FrozenSet,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
 
 import discord
 from redbot.core import Config, commands
@@ -35,6 +45,59 @@ from redbot.core.utils.chat_formatting import humanize_list
 RequestType = Literal["discord_deleted_user", "owner", "user", "user_strict"]
 
 
+def _compile_status(words: Any) -> Optional[Pattern[str]]:
+    if not words:
+        return None
+    return re.compile("|".join(rf"(\s|^){re.escape(word)}(\s|$)" for word in words), flags=re.I)
+
+
+class CompiledRule(NamedTuple):
+    """A StatusRole with its status words compiled once, rebuilt only when the rule is edited."""
+
+    name: str
+    role: int
+    status: Any
+    emoji: Any
+    pattern: Optional[Pattern[str]]
+
+    @classmethod
+    def from_config(cls, name: str, data: Dict[str, Any]) -> "CompiledRule":
+        return cls(
+            name=name,
+            role=data["role"],
+            status=data["status"],
+            emoji=data["emoji"],
+            pattern=_compile_status(data["status"]),
+        )
+
+    def matches(self, user_status: discord.CustomActivity, guild_emojis: FrozenSet[int]) -> bool:
+        status: Optional[str] = user_status.name
+        emoji: Optional[discord.PartialEmoji] = user_status.emoji
+        if (not self.status and not self.emoji) or (not status and not emoji):
+            return False
+        if self.status:
+            if not status or not self.pattern or not self.pattern.search(status):
+                return False
+        if self.emoji:
+            if not emoji:
+                return False
+            if self.emoji is True:
+                return emoji.is_custom_emoji() and emoji.id in guild_emojis
+            if emoji.is_custom_emoji():
+                return self.emoji[1] == emoji.id
+            return emoji.is_unicode_emoji() and self.emoji[0] == emoji.name
+        return True
+
+
+class GuildRules(NamedTuple):
+    """Everything the presence listener needs for a guild, so it never touches config."""
+
+    channel: Optional[int]
+    blacklist: FrozenSet[int]
+    emojis: FrozenSet[int]
+    rules: Tuple[CompiledRule, ...]
+
+
 class StatusRole(commands.Cog):
     """
     Roles for Certain Custom Statuses.
@@ -59,7 +122,7 @@ class StatusRole(commands.Cog):
             "channel": None,
             "blacklist": [],
         }
-        self.blacklist: defaultdict[Any, List[str]] = defaultdict(lambda: [])
+        self.rules: Dict[int, GuildRules] = {}
         self.config.register_guild(**default_guild)
         self.bot.loop.create_task(self.initialize(self.bot))
 
@@ -79,25 +142,62 @@ class StatusRole(commands.Cog):
             await self._update_cache(guild)
 
     async def _update_cache(self, guild: discord.Guild):
-        self.blacklist[guild] = await self.config.guild(guild).blacklist()
+        data: Dict[str, Any] = await self.config.guild(guild).all()
+        self.rules[guild.id] = GuildRules(
+            channel=data["channel"],
+            blacklist=frozenset(data["blacklist"]),
+            emojis=frozenset(emoji.id for emoji in guild.emojis),
+            rules=tuple(
+                CompiledRule.from_config(name, sr)
+                for name, sr in data["roles"].items()
+                if sr["toggle"]
+            ),
+        )
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(
+        self, guild: discord.Guild, before: List[discord.Emoji], after: List[discord.Emoji]
+    ) -> None:
+        if (rules := self.rules.get(guild.id)) is not None:
+            self.rules[guild.id] = rules._replace(emojis=frozenset(emoji.id for emoji in after))
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        await self._update_cache(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.rules.pop(guild.id, None)
 
     @commands.Cog.listener("on_presence_update")
     async def _presence_update_listener(
         self, before: discord.Member, after: discord.Member
     ) -> None:
+        if before.bot:  # Member is a bot
+            return
+        rules: Optional[GuildRules] = self.rules.get(after.guild.id)
         if (
-            before.bot  # Member is a bot
-            or after.id in self.blacklist[after.guild]  # Member is blacklisted
-            or await self.bot.cog_disabled_in_guild(self, before.guild)
-            or not after.guild.me.guild_permissions.manage_roles  # Cog disabled in guild
-            or before.activity == after.activity  # Cannot manage roles  # Activity did not change
+            not rules
+            or not rules.rules  # No enabled StatusRoles
+            or after.id in rules.blacklist  # Member is blacklisted
+            or before.activity == after.activity  # Activity did not change
+        ):
+            return
+        before_status = self._custom_activity(before.activities)
+        after_status = self._custom_activity(after.activities)
+        if before_status == after_status:  # Custom status did not change
+            return
+        if (
+            await self.bot.cog_disabled_in_guild(self, before.guild)  # Cog disabled in guild
+            or not after.guild.me.guild_permissions.manage_roles  # Cannot manage roles
         ):
             return
 
         can_embed = False
-        log_channel = await self.config.guild(before.guild).channel()
+        log_channel: discord.TextChannel | None = (
+            before.guild.get_channel(rules.channel) if rules.channel else None  # type: ignore
+        )
         if log_channel:
-            log_channel: discord.TextChannel | None = before.guild.get_channel(log_channel)
             perms = log_channel.permissions_for(after.guild.me)
             if not perms.send_messages:
                 log_channel = None
@@ -105,81 +205,68 @@ class StatusRole(commands.Cog):
                 if perms.embed_links:
                     can_embed = True
 
-        async with self.config.guild(before.guild).roles() as status_roles:
-            for name, sr in status_roles.items():
-                if not sr["toggle"]:
-                    continue
-
-                role = before.guild.get_role(sr["role"])
-                before_status = await self._custom_activity(before.activities)
-                after_status = await self._custom_activity(after.activities)
-
-                # Role hierarchy check
-                if not role or role >= after.guild.me.top_role:
-                    continue
-
-                # Now have custom status (did not have before)
-                if not before_status and after_status:
-                    if await self._status_matches(
-                        sr["status"], sr["emoji"], after_status, after.guild
-                    ):
-                        await self._maybe_add_role(after, role, name)
-                        if log_channel:
-                            await self._send_log(
-                                log_channel,
-                                True,
-                                after,
-                                role,
-                                after_status.name,
-                                after_status.emoji.name if after_status.emoji else "None",
-                                can_embed,
-                            )
-
-                # Had custom status (does not anymore)
-                elif before_status and not after_status:
-                    if await self._status_matches(
-                        sr["status"], sr["emoji"], before_status, after.guild
-                    ):
-                        await self._maybe_remove_role(after, role, name)
-                        if log_channel:
-                            await self._send_log(
-                                log_channel, False, after, role, "None", "None", can_embed
-                            )
-
-                # Custom status changed
-                elif before_status and after_status and before_status != after_status:
-                    before_match = await self._status_matches(
-                        sr["status"], sr["emoji"], before_status, after.guild
-                    )
-                    after_match = await self._status_matches(
-                        sr["status"], sr["emoji"], after_status, after.guild
-                    )
-
-                    if not before_match and after_match:
-                        await self._maybe_add_role(after, role, name)
-                        if log_channel:
-                            await self._send_log(
-                                log_channel,
-                                True,
-                                after,
-                                role,
-                                after_status.name,
-                                after_status.emoji.name if after_status.emoji else "None",
-                                can_embed,
-                            )
-
-                    elif before_match and not after_match:
-                        await self._maybe_remove_role(after, role, name)
-                        if log_channel:
-                            await self._send_log(
-                                log_channel,
-                                False,
-                                after,
-                                role,
-                                after_status.name,
-                                after_status.emoji.name if after_status.emoji else "None",
-                                can_embed,
-                            )
+        for sr in rules.rules:
+            name = sr.name
+            role = before.guild.get_role(sr.role)
+
+            # Role hierarchy check
+            if not role or role >= after.guild.me.top_role:
+                continue
+
+            # Now have custom status (did not have before)
+            if not before_status and after_status:
+                if sr.matches(after_status, rules.emojis):
+                    await self._maybe_add_role(after, role, name)
+                    if log_channel:
+                        await self._send_log(
+                            log_channel,
+                            True,
+                            after,
+                            role,
+                            after_status.name,
+                            after_status.emoji.name if after_status.emoji else "None",
+                            can_embed,
+                        )
+
+            # Had custom status (does not anymore)
+            elif before_status and not after_status:
+                if sr.matches(before_status, rules.emojis):
+                    await self._maybe_remove_role(after, role, name)
+                    if log_channel:
+                        await self._send_log(
+                            log_channel, False, after, role, "None", "None", can_embed
+                        )
+
+            # Custom status changed
+            elif before_status and after_status:
+                before_match = sr.matches(before_status, rules.emojis)
+                after_match = sr.matches(after_status, rules.emojis)
+
+                if not before_match and after_match:
+                    await self._maybe_add_role(after, role, name)
+                    if log_channel:
+                        await self._send_log(
+                            log_channel,
+                            True,
+                            after,
+                            role,
+                            after_status.name,
+                            after_status.emoji.name if after_status.emoji else "None",
+                            can_embed,
+                        )
+
+                elif before_match and not after_match:
+                    await self._maybe_remove_role(after, role, name)
+                    if log_channel:
+                        await self._send_log(
+                            log_channel,
+                            False,
+                            after,
+                            role,
+                            after_status.name,
+                            after_status.emoji.name if after_status.emoji else "None",
+                            can_embed,
+                        )
 
     @staticmethod
     async def _maybe_add_role(member: discord.Member, role: discord.Role, name: str) -> None:
@@ -194,7 +281,7 @@ class StatusRole(commands.Cog):
             )
 
     @staticmethod
-    async def _custom_activity(
+    def _custom_activity(
         activities: Tuple[discord.activity.ActivityTypes, ...],
     ) -> discord.CustomActivity | None:
         for act in activities:
@@ -202,50 +289,6 @@ class StatusRole(commands.Cog):
                 return act
         return None
 
-    @staticmethod
-    async def _status_matches(
-        st: Any,
-        em: Any,
-        user_status: discord.CustomActivity,
-        guild: discord.Guild,
-    ):
-        status = user_status.name
-        emoji = user_status.emoji
-
-        if (not st and not em) or (not status and not emoji):
-            return False
-
-        async def _st_match(r: Any, s: str | None) -> Match[str] | bool | None:
-            if not r:
-                return True
-            else:
-                if not s:
-                    return False
-                try:
-                    pattern = "|".join(rf"(\s|^){re.escape(word)}(\s|$)" for word in r)
-                    return re.search(pattern, s, flags=re.I)
-                except re.error:
-                    return False
-
-        async def _em_match(r: Any, e: discord.PartialEmoji | None) -> bool | None:
-            if not r:
-                return True
-            else:
-                if not e:
-                    return False
-                else:
-                    if r is True:
-                        if e.is_custom_emoji() and e.id in [
-                            emoji.id for emoji in guild.emojis
-                        ]:  # Emoji in guild
-                            return True
-                    elif e.is_custom_emoji() and r[1] == e.id:  # Custom emoji matches
-                        return True
-                    elif e.is_unicode_emoji() and r[0] == e.name:  # Default emoji matches
-                        return True
-
-        return await _st_match(st, status) and (await _em_match(em, emoji))
-
     @staticmethod
     async def _send_log(
         channel: discord.TextChannel,
@@ -288,6 +331,7 @@ class StatusRole(commands.Cog):
     async def _log_channel(self, ctx: commands.Context, channel: discord.TextChannel = None):
         """Set the StatusRole log channel (leave blank to disable logs)."""
         await self.config.guild(ctx.guild).channel.set(channel.id if channel else None)
+        await self._update_cache(ctx.guild)
         return await ctx.tick()
 
     @_status_role.command(name="add")
@@ -309,6 +353,7 @@ class StatusRole(commands.Cog):
                 "status": statuses_to_match,
                 "toggle": True,
             }
+        await self._update_cache(ctx.guild)
         return await ctx.send(
             f"`{role.name}` will now be assigned to users with any emoji and status matching any of the following words: {humanize_list([f'`{s}`' for s in statuses_to_match])}."
         )
@@ -324,6 +369,7 @@ class StatusRole(commands.Cog):
             if pair_name not in roles.keys():
                 return await ctx.send("There is no StatusRole with this name!")
             roles[pair_name]["role"] = role.id
+        await self._update_cache(ctx.guild)
         return await ctx.tick()
 
     @_edit.command(name="emoji")
@@ -350,6 +396,7 @@ class StatusRole(commands.Cog):
                 roles[pair_name]["emoji"] = (emoji, None)
             else:
                 roles[pair_name]["emoji"] = None
+        await self._update_cache(ctx.guild)
         return await ctx.tick()
 
     @_edit.command(name="status")
@@ -359,6 +406,7 @@ class StatusRole(commands.Cog):
             if pair_name not in roles.keys():
                 return await ctx.send("There is no StatusRole with this name!")
             roles[pair_name]["status"] = statuses_to_match
+        await self._update_cache(ctx.guild)
         return await ctx.tick()
 
     @_edit.command(name="toggle")
@@ -368,6 +416,7 @@ class StatusRole(commands.Cog):
             if pair_name not in roles.keys():
                 return await ctx.send("There is no StatusRole with this name!")
             roles[pair_name]["toggle"] = true_or_false
+        await self._update_cache(ctx.guild)
         return await ctx.tick()
 
     @_status_role.command(name="remove", aliases=["delete"])
@@ -380,6 +429,7 @@ class StatusRole(commands.Cog):
             if pair_name not in roles.keys():
                 return await ctx.send("There is no StatusRole with this name!")
             del roles[pair_name]
+        await self._update_cache(ctx.guild)
         return await ctx.tick()
 
     @commands.bot_has_permissions(manage_roles=True)
@@ -405,12 +455,18 @@ class StatusRole(commands.Cog):
                         await ctx.send(f"Skipping `{sr}` as there no StatusRole with that name.")
                         statusroles.remove(sr)
 
+                compiled: Dict[str, CompiledRule] = {
+                    sr: CompiledRule.from_config(sr, roles[sr])
+                    for sr in statusroles
+                    if sr in roles
+                }
+                guild_emojis: FrozenSet[int] = frozenset(emoji.id for emoji in ctx.guild.emojis)
                 members = ctx.guild.members
                 await ctx.send(
                     f"Updating `{len(statusroles)}` StatusRoles for all `{len(members)}` members in the server, this may take a while..."
                 )
                 for m in members:
-                    m_status = await self._custom_activity(m.activities)
+                    m_status = self._custom_activity(m.activities)
                     if m_status:
                         for sr in statusroles:
                             if not roles[sr]["toggle"]:
@@ -425,9 +481,7 @@ class StatusRole(commands.Cog):
                             if not r or r >= ctx.guild.me.top_role:
                                 continue
 
-                            if await self._status_matches(
-                                roles[sr]["status"], roles[sr]["emoji"], m_status, ctx.guild
-                            ):
+                            if compiled[sr].matches(m_status, guild_emojis):
                                 await self._maybe_add_role(m, r, sr)
                                 if log_channel:
                                     await self._send_log(
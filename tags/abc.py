@@ -25,7 +25,7 @@ SOFTWARE.
 
 import asyncio
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from typing import Any, Coroutine, Dict, List, Optional, Union
 
 import discord
@@ -34,7 +34,10 @@ from aiohttp import ClientSession
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 
+from .cache import ScriptCache
+from .counters import UsageCounter
 from .objects import Tag
+from .search import TagIndex
 
 
 class MixinMeta(ABC):
@@ -49,11 +52,18 @@ class MixinMeta(ABC):
     bot: Red
     session: ClientSession
     engine: Union[tse.AsyncInterpreter, tse.Interpreter]
+    invoketag: commands.Command
 
     def __init__(self, *_args: Any) -> None:
         super().__init__(*_args)
         self.guild_tag_cache: defaultdict[int, Dict[str, Tag]]
         self.global_tag_cache: Dict[str, Tag]
+        self.guild_tag_index: defaultdict[int, TagIndex]
+        self.global_tag_index: TagIndex
+        self.loaded_guilds: OrderedDict[int, None]
+        self.lazy_loading: Optional[bool]
+        self.usage_counter: UsageCounter
+        self.script_cache: ScriptCache
         self.dot_parameter: Optional[bool]
         self.async_enabled: Optional[bool]
 
@@ -94,6 +104,15 @@ class MixinMeta(ABC):
     @abstractmethod
     async def initialize(self) -> None: ...
 
+    @abstractmethod
+    async def cache_all_guilds(self) -> None: ...
+
+    @abstractmethod
+    async def load_guild_tags(self, guild: Optional[discord.Guild]) -> None: ...
+
+    @abstractmethod
+    def evict_idle_guilds(self, budget: int = ...) -> None: ...
+
     @abstractmethod
     async def cache_guild(self, guild_id: int, guild_data: Dict[str, Dict[str, Any]]) -> None: ...
 
@@ -143,9 +162,10 @@ class MixinMeta(ABC):
     async def message_eligible_as_tag(self, message: discord.Message) -> bool: ...
 
     @abstractmethod
-    async def invoke_tag_message(
-        self, message: discord.Message, prefix: str, tag_command: str
-    ) -> None: ...
+    async def check_tag_invocation(self, ctx: commands.Context) -> None: ...
+
+    @abstractmethod
+    async def invoke_tag_context(self, ctx: commands.Context, tag: Tag) -> None: ...
 
     @abstractmethod
     async def send_tag_response(
@@ -0,0 +1,112 @@
+"""
+MIT License
+
+Copyright (c) 2020-2023 PhenoM4n4n
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
+
+import TagScriptEngine as tse
+
+log: logging.Logger = logging.getLogger("red.seina.tags.cache")
+
+MAX_CACHED_SCRIPTS: Final[int] = 1024
+
+Coordinates = Tuple[Tuple[int, int], ...]
+
+
+class ScriptCache:
+    """
+    LRU cache of parsed TagScript node trees.
+
+    Entries are keyed on the tagscript content together with the interpreter generation,
+    which is bumped whenever the interpreter or its block set is rebuilt.
+    Only the node coordinates are stored since `tse.Node` objects are mutated while solving.
+    """
+
+    __slots__: Tuple[str, ...] = ("maxsize", "generation", "hits", "misses", "_scripts")
+
+    def __init__(self, maxsize: int = MAX_CACHED_SCRIPTS) -> None:
+        self.maxsize: int = maxsize
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._scripts: OrderedDict[Tuple[int, str], Coordinates] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scripts)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ScriptCache size={len(self)} maxsize={self.maxsize} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+    def get_nodes(self, tagscript: str) -> List[tse.Node]:
+        key = (self.generation, tagscript)
+        try:
+            coordinates = self._scripts[key]
+        except KeyError:
+            self.misses += 1
+            coordinates = tuple(node.coordinates for node in tse.build_node_tree(tagscript))
+            self._scripts[key] = coordinates
+            if len(self._scripts) > self.maxsize:
+                self._scripts.popitem(last=False)
+        else:
+            self.hits += 1
+            self._scripts.move_to_end(key)
+        return [tse.Node(coords) for coords in coordinates]
+
+    def invalidate(self, tagscript: str) -> None:
+        self._scripts.pop((self.generation, tagscript), None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._scripts.clear()
+        log.debug("Cleared parsed tagscript cache (generation %s).", self.generation)
+
+    async def process(
+        self,
+        engine: Union[tse.AsyncInterpreter, tse.Interpreter],
+        message: str,
+        seed_variables: Optional[Dict[str, tse.Adapter]] = None,
+        *,
+        charlimit: Optional[int] = None,
+        dot_parameter: bool = False,
+        **kwargs: Any,
+    ) -> tse.Response:
+        """Mirrors `Interpreter.process` but reuses the cached node tree for `message`."""
+        response = tse.Response(variables=seed_variables, extra_kwargs=kwargs)
+        nodes = self.get_nodes(message)
+        try:
+            output = engine._solve(
+                message, nodes, response, charlimit=charlimit, dot_parameter=dot_parameter
+            )
+            if isinstance(engine, tse.AsyncInterpreter):
+                output = await output
+        except tse.TagScriptError:
+            raise
+        except Exception as error:
+            raise tse.ProcessError(error, response, engine) from error
+        return engine._return_response(response, output)
@@ -42,7 +42,8 @@ class TagSearcher:
     def __init__(self, **search_kwargs: Any) -> None:
         self.search_kwargs = search_kwargs
 
-    def get_tag(self, ctx: commands.Context, argument: str):
+    async def get_tag(self, ctx: commands.Context, argument: str):
+        await ctx.cog.load_guild_tags(ctx.guild)
         return ctx.cog.get_tag(ctx.guild, argument, **self.search_kwargs)
 
 
@@ -57,7 +58,7 @@ class TagName(TagSearcher, commands.Converter[str]):
             raise commands.BadArgument(f"`{argument}` is already a registered command.")
 
         if not self.allow_named_tags:
-            tag = self.get_tag(ctx, argument)
+            tag = await self.get_tag(ctx, argument)
             if tag:
                 raise commands.BadArgument(f"`{argument}` is already a registered tag or alias.")
 
@@ -69,7 +70,7 @@ class TagConverter(TagSearcher, commands.Converter[Tag]):
         if not ctx.guild and not await ctx.bot.is_owner(ctx.author):
             raise commands.BadArgument("Tags can only be used in guilds.")
 
-        tag = self.get_tag(ctx, argument)
+        tag = await self.get_tag(ctx, argument)
         if tag:
             return tag
         else:
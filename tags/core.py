@@ -26,8 +26,8 @@ SOFTWARE.
 import asyncio
 import contextlib
 import logging
-import re
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
 from operator import itemgetter
 from typing import Any, Coroutine, Dict, Final, List, Optional, Union
 
@@ -42,15 +42,19 @@ from redbot.core.utils.chat_formatting import humanize_list
 from TagScriptEngine import __version__ as tse_version
 
 from .abc import CompositeMetaClass
+from .cache import ScriptCache
+from .counters import UsageCounter
 from .dashboard import DashboardMixin
 from .errors import MissingTagPermissions, TagCharacterLimitReached
 from .mixins import Commands, OwnerCommands, Processor
 from .objects import Tag
+from .search import TagIndex
 from .utils import RequesterType
 
 log: logging.Logger = logging.getLogger("red.seina.tags")
 
 TAGSCRIPT_LIMIT: Final[int] = 10_000
+LAZY_CACHE_BUDGET: Final[int] = 25_000
 
 
 class Tags(
@@ -87,12 +91,21 @@ class Tags(
             "async_enabled": False,
             "dot_parameter": False,
             "max_tags_limit": 250,
+            "lazy_loading": False,
+            "startup_timings": {},
         }
         self.config.register_guild(**default_guild)
         self.config.register_global(**default_global)
 
         self.guild_tag_cache: defaultdict[int, Dict[str, Tag]] = defaultdict(dict)
         self.global_tag_cache: Dict[str, Tag] = {}
+        self.guild_tag_index: defaultdict[int, TagIndex] = defaultdict(TagIndex)
+        self.global_tag_index: TagIndex = TagIndex()
+        self.loaded_guilds: OrderedDict[int, None] = OrderedDict()
+        self.guild_load_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.lazy_loading: Optional[bool] = None
+        self.usage_counter: UsageCounter = UsageCounter(self)
+        self.script_cache: ScriptCache = ScriptCache()
         self.initialize_task: Optional[asyncio.Task] = None
         self.dot_parameter: Optional[bool] = None
         self.async_enabled: Optional[bool] = None
@@ -130,6 +143,7 @@ class Tags(
         self.bot.remove_dev_env_value("tags")
         if self.initialize_task:
             self.initialize_task.cancel()
+        await self.usage_counter.stop()
         await self.session.close()
 
     async def red_delete_data_for_user(self, *, requester: RequesterType, user_id: int) -> None:
@@ -157,9 +171,14 @@ class Tags(
         task.add_done_callback(self.task_done_callback)
         return task
 
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        await self.load_guild_tags(ctx.guild)
+
     async def initialize(self) -> None:
+        start = time.perf_counter()
         data = await self.config.all()
         await self.initialize_interpreter(data)
+        self.lazy_loading = data["lazy_loading"]
 
         global_tags = data["tags"]
         async for global_tag_name, global_tag_data in AsyncIter(global_tags.items(), steps=50):
@@ -168,13 +187,58 @@ class Tags(
             if "created_at" not in global_tag_data:
                 await tag.update_config()
 
+        if not self.lazy_loading:
+            await self.cache_all_guilds()
+
+        self.usage_counter.start()
+        mode = "lazy" if self.lazy_loading else "eager"
+        elapsed = time.perf_counter() - start
+        await self.config.startup_timings.set_raw(mode, value=elapsed)
+        log.debug("Built tag cache (%s loading) in %.3fs.", mode, elapsed)
+
+    async def cache_all_guilds(self) -> None:
         guilds_data = await self.config.all_guilds()
         async for guild_id, guild_data in AsyncIter(guilds_data.items(), steps=100):
+            if guild_id in self.loaded_guilds:
+                continue
             await self.cache_guild(guild_id, guild_data)
+        self.loaded_guilds.clear()
 
-        log.debug("Built tag cache.")
+    async def load_guild_tags(self, guild: Optional[discord.Guild]) -> None:
+        """Build the tag cache of `guild` on first use when lazy loading is enabled."""
+        if guild is None or not self.lazy_loading:
+            return
+        if guild.id in self.loaded_guilds:
+            self.loaded_guilds.move_to_end(guild.id)
+            return
+        async with self.guild_load_locks[guild.id]:
+            if guild.id in self.loaded_guilds:
+                return
+            tags = await self.config.guild(guild).tags()
+            await self.cache_guild(guild.id, {"tags": tags})
+            self.loaded_guilds[guild.id] = None
+        self.guild_load_locks.pop(guild.id, None)
+        self.evict_idle_guilds()
+
+    def evict_idle_guilds(self, budget: int = LAZY_CACHE_BUDGET) -> None:
+        cached = sum(
+            len(self.guild_tag_cache.get(guild_id, ())) for guild_id in self.loaded_guilds
+        )
+        for guild_id in list(self.loaded_guilds)[:-1]:
+            if cached <= budget:
+                break
+            if self.usage_counter.has_pending(guild_id):
+                continue
+            del self.loaded_guilds[guild_id]
+            cached -= len(self.guild_tag_cache.pop(guild_id, ()))
+            self.guild_tag_index.pop(guild_id, None)
+            log.debug("Evicted idle guild %s from the tag cache.", guild_id)
 
     async def cache_guild(self, guild_id: int, guild_data: Dict[str, Dict[str, Any]]) -> None:
+        # Tags still held by commands after their guild was evicted write into a fresh cache
+        # entry, drop it so the guild is rebuilt from config without stale duplicates.
+        self.guild_tag_cache.pop(guild_id, None)
+        self.guild_tag_index.pop(guild_id, None)
         async for tag_name, tag_data in AsyncIter(guild_data["tags"].items(), steps=50):
             tag = Tag.from_dict(self, tag_name, tag_data, guild_id=guild_id)
             tag.add_to_cache()
@@ -182,9 +246,9 @@ class Tags(
                 await tag.update_config()
 
     def search_tag(self, tag_name: str, guild: Optional[discord.Guild] = None) -> List[Tag]:
-        tags = self.get_unique_tags(guild)
+        index = self.guild_tag_index[guild.id] if guild else self.global_tag_index
         matches = []
-        for tag in tags:
+        for tag in index.candidates(tag_name):
             name_score = fuzz.ratio(tag_name.lower(), tag.name.lower())
 
             if alias_search := process.extractOne(tag_name, tag.aliases, scorer=fuzz.QRatio):
@@ -195,7 +259,7 @@ class Tags(
             if tag_name.lower() in tag.tagscript.lower():
                 script_score = 100
             elif script_search := process.extractOne(
-                tag_name, re.findall(r"\w+", tag.tagscript), scorer=fuzz.QRatio
+                tag_name, index.words(tag), scorer=fuzz.QRatio
             ):
                 script_score = script_search[1]
             else:
@@ -0,0 +1,174 @@
+"""
+MIT License
+
+Copyright (c) 2020-2023 PhenoM4n4n
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, DefaultDict, Dict, Final, Optional, Tuple, Union
+
+from redbot.core import Config
+from redbot.core.config import Group
+
+if TYPE_CHECKING:
+    from .core import Tags
+    from .objects import Tag
+
+log: logging.Logger = logging.getLogger("red.seina.tags.counters")
+
+FLUSH_INTERVAL: Final[float] = 60.0
+
+
+class UsageCounter:
+    """
+    Write-behind buffer for tag use counters.
+
+    Invocations only bump the in-memory `Tag.uses` and record a pending delta here,
+    a background task then persists every touched tag of a guild in a single config write.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "cog",
+        "interval",
+        "flushes",
+        "flushed",
+        "last_flush_latency",
+        "total_flush_latency",
+        "_pending",
+        "_lock",
+        "_task",
+    )
+
+    def __init__(self, cog: "Tags", *, interval: float = FLUSH_INTERVAL) -> None:
+        self.cog: "Tags" = cog
+        self.interval: float = interval
+        self.flushes: int = 0
+        self.flushed: int = 0
+        self.last_flush_latency: float = 0.0
+        self.total_flush_latency: float = 0.0
+        self._pending: DefaultDict[Optional[int], Dict[str, int]] = defaultdict(dict)
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsageCounter pending={self.pending} flushes={self.flushes} "
+            f"last_flush_latency={self.last_flush_latency:.4f}>"
+        )
+
+    @property
+    def pending(self) -> int:
+        return sum(sum(deltas.values()) for deltas in self._pending.values())
+
+    @property
+    def average_flush_latency(self) -> float:
+        return self.total_flush_latency / self.flushes if self.flushes else 0.0
+
+    def _config_path(self, guild_id: Optional[int]) -> Union[Group, Config]:
+        return self.cog.config.guild_from_id(guild_id) if guild_id else self.cog.config
+
+    def _cache_path(self, guild_id: Optional[int]) -> Dict[str, "Tag"]:
+        return (
+            self.cog.guild_tag_cache.get(guild_id, {}) if guild_id else self.cog.global_tag_cache
+        )
+
+    def record(self, tag: "Tag") -> None:
+        if not tag._real_tag:
+            return
+        deltas = self._pending[tag.guild_id]
+        deltas[tag.name] = deltas.get(tag.name, 0) + 1
+
+    def has_pending(self, guild_id: Optional[int]) -> bool:
+        return guild_id in self._pending
+
+    def discard(self, tag: "Tag") -> None:
+        deltas = self._pending.get(tag.guild_id)
+        if deltas is None:
+            return
+        deltas.pop(tag.name, None)
+        if not deltas:
+            del self._pending[tag.guild_id]
+
+    def _requeue(self, guild_id: Optional[int], deltas: Dict[str, int]) -> None:
+        requeue = self._pending[guild_id]
+        for name, delta in deltas.items():
+            requeue[name] = requeue.get(name, 0) + delta
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self.cog.create_task(self._flush_loop(), name="red.seina.tags.counters")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            # A flush interrupted by the cancellation puts its deltas back before the task ends.
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, defaultdict(dict)
+            start = time.perf_counter()
+            written = 0
+            items = list(pending.items())
+            for position, (guild_id, deltas) in enumerate(items):
+                cache = self._cache_path(guild_id)
+                try:
+                    async with self._config_path(guild_id).tags() as tags:
+                        for name, delta in deltas.items():
+                            if (data := tags.get(name)) is None:
+                                continue
+                            tag = cache.get(name)
+                            if tag is not None and tag.name == name:
+                                data["uses"] = tag.uses
+                            else:
+                                data["uses"] = data.get("uses", 0) + delta
+                            written += 1
+                except asyncio.CancelledError:
+                    for guild_id, deltas in items[position:]:
+                        self._requeue(guild_id, deltas)
+                    raise
+                except Exception as error:
+                    log.exception(
+                        "Failed to flush tag usage counters for %s.", guild_id, exc_info=error
+                    )
+                    self._requeue(guild_id, deltas)
+            latency = time.perf_counter() - start
+            self.flushes += 1
+            self.flushed += written
+            self.last_flush_latency = latency
+            self.total_flush_latency += latency
+            log.debug("Flushed %s tag use counters in %.4fs.", written, latency)
+            return written
@@ -75,6 +75,7 @@ class DashboardMixin(MixinMeta):
                 ]
 
         if guild is not None:
+            await self.load_guild_tags(guild)
             existing_tags: Dict[str, Tag] = self.guild_tag_cache[guild.id].copy()
         else:
             existing_tags: Dict[str, Tag] = self.global_tag_cache.copy()
@@ -27,8 +27,11 @@ import ast
 import inspect
 import logging
 import re
+import statistics
 import textwrap
+import time
 import traceback
+from copy import copy
 from types import CodeType
 from typing import Dict, Iterator, List, Literal, Optional, Pattern
 
@@ -40,6 +43,7 @@ from redbot.core.utils.chat_formatting import pagify
 
 from ..abc import MixinMeta
 from ..blocks import ContextVariableBlock, ConverterBlock
+from ..converters import TagConverter
 from ..errors import BlockCompileError
 from ..objects import Tag
 from ..utils import menu
@@ -129,6 +133,12 @@ class OwnerCommands(MixinMeta):
             f"**Custom Blocks**: `{len(data['blocks'])}`",
             f"**Global Limit**: `{data['max_tags_limit']}`",
             f"**Guild Limit**: `{guild_data['max_tags_limit']} (ID: {ctx.guild.id})`",
+            f"**Lazy Loading**: `{data['lazy_loading']}`",
+            f"**Pending Uses**: `{self.usage_counter.pending}`",
+            f"**Parsed Script Cache**: `{len(self.script_cache)}` "
+            f"(hits `{self.script_cache.hits}`, misses `{self.script_cache.misses}`)",
+            f"**Usage Flush Latency**: `{self.usage_counter.last_flush_latency * 1000:.2f}ms`"
+            f" (avg `{self.usage_counter.average_flush_latency * 1000:.2f}ms`)",
         ]
         embed = discord.Embed(
             title="Tags Settings",
@@ -248,6 +258,112 @@ class OwnerCommands(MixinMeta):
             "Blocks will be parsed like this: `{declaration%s:payload}`." % parameter
         )
 
+    @tagsettings.command("lazy")
+    async def tagsettings_lazy(self, ctx: commands.Context, true_or_false: bool = None):
+        """
+        Toggle lazy loading of guild tags.
+
+        When enabled, a guild's tags are only loaded on its first tag lookup and idle guilds are evicted from memory.
+        Otherwise every guild's tags are loaded when the cog starts.
+        """
+        target_state = true_or_false if true_or_false is not None else not self.lazy_loading
+        await self.config.lazy_loading.set(target_state)
+        if target_state and not self.lazy_loading:
+            self.loaded_guilds.update((guild_id, None) for guild_id in self.guild_tag_cache)
+        elif not target_state and self.lazy_loading:
+            await self.cache_all_guilds()
+        self.lazy_loading = target_state
+        enabled = "enabled" if target_state else "disabled"
+        await ctx.send(f"Lazy loading of guild tags has been {enabled}.")
+
+    @tagsettings.command("startup")
+    async def tagsettings_startup(self, ctx: commands.Context):
+        """
+        Compare the last recorded cache build times for eager and lazy loading.
+        """
+        timings = await self.config.startup_timings()
+        description = [
+            (
+                f"**{mode.title()}**: `{timings[mode]:.3f}s`"
+                if mode in timings
+                else f"**{mode.title()}**: `not recorded`"
+            )
+            for mode in ("eager", "lazy")
+        ]
+        if "eager" in timings and "lazy" in timings and timings["lazy"]:
+            description.append(f"**Speedup**: `{timings['eager'] / timings['lazy']:.1f}x`")
+        description.append(
+            f"**Cached Guilds**: `{len(self.guild_tag_cache)}`"
+            f" | **Cached Tags**: `{sum(len(tags) for tags in self.guild_tag_cache.values())}`"
+        )
+        embed = discord.Embed(
+            title="Tags Startup Timings",
+            color=await ctx.embed_color(),
+            description="\n".join(description),
+        )
+        await ctx.send(embed=embed)
+
+    @commands.guild_only()
+    @tagsettings.command("benchmark")
+    async def tagsettings_benchmark(
+        self, ctx: commands.Context, tag_name: str, iterations: commands.Range[int, 1, 1000] = 200
+    ):
+        """
+        Time the per-hit dispatch latency of the direct tag path against the old re-parse path.
+
+        Both paths are timed from the failed command lookup up to the point where the tag would be processed, so no tag is actually run.
+        The old path rewrote the message to `invoketag False <tag>`, built a second context and parsed `invoketag`'s arguments.
+        """
+        tag = self.get_tag(ctx.guild, tag_name, check_global=True)
+        if tag is None:
+            await ctx.send(f"No tag named `{tag_name}` was found.")
+            return
+        command: commands.Command = self.invoketag
+        message: discord.Message = copy(ctx.message)
+        message.content = f"{ctx.prefix}{tag_name}"
+        legacy: List[float] = []
+        direct: List[float] = []
+        async with ctx.typing():
+            for _ in range(iterations):
+                tag_ctx: commands.Context = await self.bot.get_context(message)
+
+                started = time.perf_counter()
+                self.get_tag(tag_ctx.guild, tag_ctx.invoked_with, check_global=True)
+                await self.message_eligible_as_tag(tag_ctx.message)
+                new_message = copy(tag_ctx.message)
+                new_message.content = f"{tag_ctx.prefix}invoketag False {tag_name}"
+                new_ctx: commands.Context = await self.bot.get_context(new_message)
+                await self.check_tag_invocation(new_ctx)
+                await command._parse_arguments(new_ctx)
+                await TagConverter(check_global=True).convert(new_ctx, tag_name)
+                legacy.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                self.get_tag(tag_ctx.guild, tag_ctx.invoked_with, check_global=True)
+                await self.message_eligible_as_tag(tag_ctx.message)
+                tag_ctx.command = command
+                await self.check_tag_invocation(tag_ctx)
+                tag_ctx.view.read_rest()
+                direct.append(time.perf_counter() - started)
+
+        legacy_median = statistics.median(legacy) * 1_000_000
+        direct_median = statistics.median(direct) * 1_000_000
+        description = [
+            f"**Iterations**: `{iterations}`",
+            f"**Re-parse Path**: `{legacy_median:.1f}µs` median"
+            f" (mean `{statistics.fmean(legacy) * 1_000_000:.1f}µs`)",
+            f"**Direct Path**: `{direct_median:.1f}µs` median"
+            f" (mean `{statistics.fmean(direct) * 1_000_000:.1f}µs`)",
+        ]
+        if direct_median:
+            description.append(f"**Speedup**: `{legacy_median / direct_median:.1f}x`")
+        embed = discord.Embed(
+            title="Tag Dispatch Benchmark",
+            color=await ctx.embed_color(),
+            description="\n".join(description),
+        )
+        await ctx.send(embed=embed)
+
     @tagsettings.group("limit")
     async def tagsettings_limit(self, ctx: commands.Context):
         """
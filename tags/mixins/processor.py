@@ -103,6 +103,7 @@ class Processor(MixinMeta):
         )
         for block in await self.compile_blocks(data):
             self.engine.blocks.append(block())
+        self.script_cache.clear()
 
     @commands.Cog.listener()
     async def on_command_error(
@@ -111,11 +112,10 @@ class Processor(MixinMeta):
         if not isinstance(error, commands.CommandNotFound):
             return
         message: discord.Message = ctx.message
+        await self.load_guild_tags(ctx.guild)
         tag = self.get_tag(ctx.guild, ctx.invoked_with, check_global=True)
         if tag and await self.message_eligible_as_tag(message):
-            prefix = ctx.prefix
-            tag_command = message.content[len(prefix) :]
-            await self.invoke_tag_message(message, prefix, tag_command)
+            await self.invoke_tag_context(ctx, tag)
 
     async def message_eligible_as_tag(self, message: discord.Message) -> bool:
         if message.guild:
@@ -125,13 +125,53 @@ class Processor(MixinMeta):
         else:
             return await self.bot.allowed_by_whitelist_blacklist(message.author)
 
-    async def invoke_tag_message(
-        self, message: discord.Message, prefix: str, tag_command: str
-    ) -> None:
-        new_message = copy(message)
-        new_message.content = f"{prefix}invoketag False {tag_command}"
-        ctx = await self.bot.get_context(new_message)
-        await self.bot.invoke(ctx)
+    async def check_tag_invocation(self, ctx: commands.Context) -> None:
+        """
+        Run the checks `Command.prepare` would run for `invoketag` before a tag is processed.
+        """
+        command: commands.Command = self.invoketag
+        if not await self.bot.can_run(ctx, call_once=True):
+            raise commands.CheckFailure("The global check once functions failed.")
+        if not command.is_enabled(ctx.guild):
+            raise commands.DisabledCommand(f"{command.name} command is disabled")
+        if not await command.can_run(ctx, change_permission_state=True):
+            raise commands.CheckFailure(
+                f"The check functions for command {command.qualified_name} failed."
+            )
+
+    async def invoke_tag_context(self, ctx: commands.Context, tag: Tag) -> None:
+        """
+        Run `tag` from the context that failed command lookup.
+
+        This goes through the same checks, cooldowns, hooks and events as `bot.invoke` would
+        for `invoketag`, without rewriting the message and parsing it a second time.
+        """
+        command: commands.Command = self.invoketag
+        args = ctx.view.read_rest().strip()
+        ctx.command = command
+        self.bot.dispatch("command", ctx)
+        try:
+            await self.check_tag_invocation(ctx)
+            command._prepare_cooldowns(ctx)
+            await command.call_before_hooks(ctx)
+            try:
+                if not ctx.guild and not await self.bot.is_owner(ctx.author):
+                    await ctx.send("Tags can only be used in guilds.")
+                else:
+                    seed = {"args": tse.StringAdapter(args)}
+                    await self.process_tag(ctx, tag, seed_variables=seed)
+            except commands.CommandError:
+                ctx.command_failed = True
+                raise
+            except Exception as error:
+                ctx.command_failed = True
+                raise commands.CommandInvokeError(error) from error
+            finally:
+                await command.call_after_hooks(ctx)
+        except commands.CommandError as error:
+            await command.dispatch_error(ctx, error)
+        else:
+            self.bot.dispatch("command_completion", ctx)
 
     @staticmethod
     def get_seed_from_context(ctx: commands.Context) -> Dict[str, tse.Adapter]:
@@ -163,7 +203,7 @@ class Processor(MixinMeta):
         seed_variables.update(seed)
 
         output = await tag.run(seed_variables, **kwargs)
-        await tag.update_config()
+        self.usage_counter.record(tag)
         dispatch_prefix = "tag" if tag.guild_id else "g-tag"
         self.bot.dispatch("commandstats_action_v2", f"{dispatch_prefix}:{tag}", ctx.guild)
         to_gather = []
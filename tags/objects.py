@@ -37,6 +37,7 @@ from .errors import TagAliasError
 
 if TYPE_CHECKING:
     from .core import Tags
+    from .search import TagIndex
 
 hn = humanize_number
 ALIAS_LIMIT: Final[int] = 10
@@ -108,6 +109,12 @@ class Tag:
             self.cog.guild_tag_cache[self.guild_id] if self.guild_id else self.cog.global_tag_cache
         )
 
+    @property
+    def index(self) -> "TagIndex":
+        return (
+            self.cog.guild_tag_index[self.guild_id] if self.guild_id else self.cog.global_tag_index
+        )
+
     @property
     def config_path(self) -> Union[Group, Config]:
         return self.config.guild_from_id(self.guild_id) if self.guild_id else self.config
@@ -136,19 +143,20 @@ class Tag:
         self.uses += 1
         seed_variables["uses"] = tse.IntAdapter(self.uses)
         cog: "Tags" = self.cog
-        output = cog.engine.process(
+        return await cog.script_cache.process(
+            cog.engine,
             self.tagscript,
             seed_variables,
             dot_parameter=cog.dot_parameter,
             cooldown_key=self.cooldown_key,
             **kwargs,
         )
-        return await output if cog.async_enabled else output
 
     async def update_config(self) -> None:
         if self._real_tag:
             async with self.config_path.tags() as t:
                 t[self.name] = self.to_dict()
+            self.cog.usage_counter.discard(self)
 
     async def initialize(self) -> str:
         self.add_to_cache()
@@ -160,8 +168,10 @@ class Tag:
         path[self.name] = self
         for alias in self.aliases:
             path[alias] = self
+        self.index.add(self)
 
     def remove_from_cache(self) -> None:
+        self.cog.usage_counter.discard(self)
         path = self.cache_path
         del path[self.name]
         for alias in self.aliases:
@@ -169,6 +179,7 @@ class Tag:
                 del path[alias]
             except KeyError:
                 pass
+        self.index.remove(self)
         try:
             del tse.CooldownBlock.COOLDOWNS[self.cooldown_key]
         except KeyError:
@@ -223,6 +234,7 @@ class Tag:
 
         self._aliases.append(alias)
         self.cache_path[alias] = self
+        self.index.update(self)
         await self.update_config()
         return f"`{alias}` has been added as an alias to {self.name_prefix.lower()} `{self}`."
 
@@ -232,18 +244,23 @@ class Tag:
 
         self._aliases.remove(alias)
         del self.cache_path[alias]
+        self.index.update(self)
         await self.update_config()
         return f"Alias `{alias}` removed from {self.name_prefix.lower()} `{self}`."
 
     async def edit_tagscript(self, tagscript: str) -> str:
         old_tagscript = len(self.tagscript)
+        self.cog.script_cache.invalidate(self.tagscript)
         self.tagscript = tagscript
+        self.index.update(self)
         await self.update_config()
         return f"Edited `{self}`'s tagscript from **{hn(old_tagscript)}** to **{hn(len(self.tagscript))}** characters."
 
     async def append_tagscript(self, tagscript: str) -> str:
         old_tagscript = len(self.tagscript)
+        self.cog.script_cache.invalidate(self.tagscript)
         self.tagscript += f"\n{tagscript}"
+        self.index.update(self)
         await self.update_config()
         return f"Edited `{self}`'s tagscript from **{hn(old_tagscript)}** to **{hn(len(self.tagscript))}** characters."
 
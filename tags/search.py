@@ -0,0 +1,113 @@
+"""
+MIT License
+
+Copyright (c) 2020-2023 PhenoM4n4n
+Copyright (c) 2023-present japandotorg
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, DefaultDict, Dict, Final, FrozenSet, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from .objects import Tag
+
+WORD_RE: Final["re.Pattern[str]"] = re.compile(r"\w+")
+
+# Minimum share of the query's trigrams a tag needs before it is scored with rapidfuzz.
+MIN_TRIGRAM_OVERLAP: Final[float] = 0.3
+
+
+def trigrams(text: str) -> Set[str]:
+    text = text.lower()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TagIndex:
+    """
+    Inverted trigram index over the names, aliases and tagscripts of one tag scope.
+
+    The index is maintained incrementally as tags are cached, aliased or edited and is
+    only used to narrow the candidate set, the final scoring is still done by rapidfuzz.
+    """
+
+    __slots__: Tuple[str, ...] = ("_postings", "_grams", "_words")
+
+    def __init__(self) -> None:
+        self._postings: DefaultDict[str, Set["Tag"]] = defaultdict(set)
+        self._grams: Dict["Tag", FrozenSet[str]] = {}
+        self._words: Dict["Tag", Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def __contains__(self, tag: "Tag") -> bool:
+        return tag in self._grams
+
+    def __repr__(self) -> str:
+        return f"<TagIndex tags={len(self)} trigrams={len(self._postings)}>"
+
+    def add(self, tag: "Tag") -> None:
+        if tag in self._grams:
+            self.remove(tag)
+        grams = trigrams(tag.name) | trigrams(tag.tagscript)
+        for alias in tag.aliases:
+            grams |= trigrams(alias)
+        for gram in grams:
+            self._postings[gram].add(tag)
+        self._grams[tag] = frozenset(grams)
+        self._words[tag] = tuple(dict.fromkeys(WORD_RE.findall(tag.tagscript)))
+
+    def remove(self, tag: "Tag") -> None:
+        grams = self._grams.pop(tag, None)
+        self._words.pop(tag, None)
+        if grams is None:
+            return
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(tag)
+            if not posting:
+                del self._postings[gram]
+
+    def update(self, tag: "Tag") -> None:
+        self.add(tag)
+
+    def words(self, tag: "Tag") -> Tuple[str, ...]:
+        try:
+            return self._words[tag]
+        except KeyError:
+            return tuple(dict.fromkeys(WORD_RE.findall(tag.tagscript)))
+
+    def candidates(self, query: str) -> List["Tag"]:
+        grams = trigrams(query)
+        if not grams:
+            return sorted(self._grams, key=lambda t: t.name)
+        counts: Counter["Tag"] = Counter()
+        for gram in grams:
+            if posting := self._postings.get(gram):
+                counts.update(posting)
+        required = max(1, math.ceil(len(grams) * MIN_TRIGRAM_OVERLAP))
+        return sorted(
+            (tag for tag, count in counts.items() if count >= required), key=lambda t: t.name
+        )